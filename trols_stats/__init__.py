@@ -4,6 +4,14 @@ import sys
 import logging
 
 from .scraper import Scraper
+from .fastparser import FastParser
+from .atomicwriter import AtomicWriter
+from .parsecache import ParseCache
+from .packcache import PackCache
+from .cachelayout import CacheLayout
+from .corpusgenerator import CorpusGenerator
+from .interner import Interner
+from .footprint import Footprint
 from .stats import Stats
 from .config import Config
 from .statistics import Statistics
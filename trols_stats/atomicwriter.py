@@ -0,0 +1,161 @@
+""":class:`trols_stats.AtomicWriter`
+
+"""
+import os
+import tempfile
+import threading
+import logging
+
+__all__ = ['AtomicWriter']
+
+# The process umask.  Read once, as reading it means setting it.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+class AtomicWriter(object):
+    """Thread safe atomic file writes.
+
+    The content is written once to a temporary file in the target
+    directory and then renamed over the target with :func:`os.replace`.
+    Readers see either the old file or the new one, never a partial
+    write, and the rename never crosses file systems.  The file keeps
+    the mode of the target it replaces.  A new file takes the default
+    mode of the umask.
+
+    A rename protects against a crashed process but not against a
+    power loss.  Set :attr:`fsync` to also flush the writes to disk.
+    The content of each file is always flushed before the rename, so
+    the target name never holds a torn file.  ``1`` also flushes the
+    directory after each rename.  A larger value holds the renamed
+    files back and flushes their directories together once
+    :attr:`fsync` writes are pending, or on :meth:`sync`.  A batch
+    flushes each directory once, which makes the flush much cheaper
+    during a large crawl.  A power loss may then revert the renames of
+    the last batch to the old files, or drop the new files.  Either way
+    the files are then not in the cache and will be fetched again.
+
+    .. attribute:: fsync
+        number of writes whose directories are flushed to disk
+        together.  ``0`` never flushes
+
+    .. attribute:: pending
+        number of writes waiting for a directory flush to disk
+
+    """
+    @property
+    def fsync(self):
+        return self.__fsync
+
+    @property
+    def pending(self):
+        return len(self.__pending)
+
+    def __init__(self, fsync=0):
+        self.__fsync = fsync
+        self.__pending = []
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.sync()
+
+    def write(self, path, data):
+        """Atomically replace the *path* file with *data*.  The
+        directory of *path* must exist.
+
+        **Args:**
+            *path*: target file path
+
+            *data*: file content.  :class:`str` content is written as
+            UTF-8 text.  Any other iterable of :class:`bytes` chunks is
+            streamed to the file.  For example, a generator of records
+
+        """
+        directory = os.path.dirname(path) or os.curdir
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        prefix = '.{}.'.format(os.path.basename(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix)
+        try:
+            with os.fdopen(fd, 'wb') as _fh:
+                if isinstance(data, bytes):
+                    _fh.write(data)
+                else:
+                    for chunk in data:
+                        _fh.write(chunk)
+                if self.fsync:
+                    _fh.flush()
+                    os.fsync(_fh.fileno())
+            os.chmod(tmp_path, AtomicWriter.mode(path))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        if self.fsync == 1:
+            AtomicWriter.__fsync_dir(directory)
+        elif self.fsync > 1:
+            with self.__lock:
+                self.__pending.append(directory)
+                due = len(self.__pending) >= self.fsync
+
+            if due:
+                self.sync()
+
+    def sync(self):
+        """Flush the directories of the pending writes to disk.
+
+        **Returns:**
+            the number of writes flushed
+
+        """
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = []
+
+        directories = sorted(set(pending))
+        for directory in directories:
+            AtomicWriter.__fsync_dir(directory)
+
+        if pending:
+            logging.debug('Flushed %d writes in %d directories to disk',
+                          len(pending), len(directories))
+
+        return len(pending)
+
+    @staticmethod
+    def mode(path):
+        """File mode of the write to *path*.
+
+        **Returns:**
+            the permission bits of an existing *path*.  Otherwise, the
+            default file mode of the umask
+
+        """
+        try:
+            return os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            return 0o666 & ~UMASK
+
+    @staticmethod
+    def __fsync_dir(directory):
+        """Flush the *directory* entries to disk so that a rename is
+        durable.  Not supported on all platforms.
+
+        """
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
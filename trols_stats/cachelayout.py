@@ -0,0 +1,315 @@
+""":class:`trols_stats.CacheLayout`
+
+Sharded directory layout of the raw TROLS match popup HTML cache.
+
+"""
+import os
+import json
+import threading
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+
+__all__ = ['CacheLayout']
+
+LAYOUT_FILE = 'layout.json'
+
+# Leading match ID characters that make up the section code.  For
+# example, match AA039054 is in section AA039.
+SECTION_LENGTH = 5
+
+
+class CacheLayout(object):
+    """Match popup cache sharded as
+    ``<league>/<competition>/<section>/<competition>--<match_id>.html``.
+    For example::
+
+        nejta/nejta_saturday_am_autumn_2015/AA039/nejta_saturday_am_autumn_2015--AA039054.html
+
+    The file name is the same as that of the flat layout, so the
+    competition can still be taken from the name.  A manifest at
+    :attr:`path` lists the sections of each competition.  One
+    competition can be loaded without listing the others.  HTML files
+    in the flat layout at the top of :attr:`cache_dir` are still read.
+
+    .. attribute:: cache_dir
+        directory that holds the match popup cache
+
+    .. attribute:: path
+        layout manifest file path
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, LAYOUT_FILE)
+
+    def __init__(self, cache_dir):
+        self.__cache_dir = cache_dir
+        self.__competitions = {}
+        self.__dirty = False
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+    def load(self):
+        """Read the layout manifest.  A missing manifest is rebuilt
+        from the sharded directories.  So is a stale manifest that
+        does not list the section directories on disk.  For example,
+        after a crawl that was stopped before :meth:`save` or sections
+        that were copied in by hand.
+
+        """
+        if not os.path.exists(self.path):
+            self.rebuild()
+            return
+
+        with open(self.path) as _fh:
+            competitions = json.load(_fh)
+
+        with self.__lock:
+            self.__competitions = competitions
+            self.__dirty = False
+
+        if competitions != self.__walk():
+            logging.warning('Cache layout manifest "%s" is stale', self.path)
+            self.rebuild()
+
+    def save(self):
+        """Write the layout manifest if it has changed.  The manifest is
+        replaced atomically.
+
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            content = json.dumps(self.__competitions, indent=1, sort_keys=True)
+            self.__dirty = False
+
+        create_dir(self.cache_dir)
+        AtomicWriter().write(self.path, content)
+
+        logging.info('Cache layout manifest written to "%s"', self.path)
+
+    def rebuild(self):
+        """Rebuild the layout manifest from a walk of the sharded
+        directories.
+
+        """
+        competitions = self.__walk()
+
+        with self.__lock:
+            self.__dirty = competitions != self.__competitions
+            self.__competitions = competitions
+
+        logging.info('Cache layout "%s" rebuilt: %d competitions',
+                     self.cache_dir, len(competitions))
+
+    def prune(self):
+        """Remove the shard directories that no longer hold any files
+        and rebuild the layout manifest.  For example, once the match
+        popups are moved into a :class:`trols_stats.PackCache`.
+
+        """
+        for league in CacheLayout.__subdirs(self.cache_dir):
+            league_dir = os.path.join(self.cache_dir, league)
+            for comp_token in CacheLayout.__subdirs(league_dir):
+                if comp_token.split('_')[0] != league:
+                    continue
+                comp_dir = os.path.join(league_dir, comp_token)
+                for section in CacheLayout.__subdirs(comp_dir):
+                    section_dir = os.path.join(comp_dir, section)
+                    if not os.listdir(section_dir):
+                        os.rmdir(section_dir)
+                if not os.listdir(comp_dir):
+                    os.rmdir(comp_dir)
+
+        self.rebuild()
+
+    def __walk(self):
+        """Walk the sharded directories.  Only the directories are
+        listed, not the HTML files.
+
+        **Returns:**
+            dictionary of competition tokens and their sorted list of
+            section codes
+
+        """
+        competitions = {}
+        for league in CacheLayout.__subdirs(self.cache_dir):
+            league_dir = os.path.join(self.cache_dir, league)
+            for comp_token in CacheLayout.__subdirs(league_dir):
+                if comp_token.split('_')[0] != league:
+                    continue
+                comp_dir = os.path.join(league_dir, comp_token)
+                sections = CacheLayout.__subdirs(comp_dir)
+                if sections:
+                    competitions[comp_token] = sections
+
+        return competitions
+
+    @staticmethod
+    def __subdirs(directory):
+        if not os.path.isdir(directory):
+            return []
+
+        return sorted(x.name for x in os.scandir(directory) if x.is_dir())
+
+    def competitions(self):
+        """Sorted list of the competition tokens in the sharded layout.
+
+        """
+        with self.__lock:
+            return sorted(self.__competitions)
+
+    def sections(self, comp_token):
+        """Sorted list of the *comp_token* section codes.
+
+        """
+        with self.__lock:
+            return list(self.__competitions.get(comp_token, []))
+
+    @staticmethod
+    def file_name(comp_token, match_id):
+        """Cache file name of the *comp_token* *match_id* match popup.
+
+        """
+        return '{}--{}.html'.format(comp_token, match_id)
+
+    @staticmethod
+    def shard(comp_token, match_id):
+        """Relative directory of the *comp_token* *match_id* match popup.
+
+        **Returns:**
+            the ``<league>/<competition>/<section>`` path
+
+        """
+        league = comp_token.split('_')[0]
+
+        return os.path.join(league, comp_token, match_id[:SECTION_LENGTH])
+
+    def target_file(self, comp_token, match_id):
+        """Sharded cache file path of the *comp_token* *match_id* match
+        popup.
+
+        """
+        return os.path.join(self.cache_dir,
+                            CacheLayout.shard(comp_token, match_id),
+                            CacheLayout.file_name(comp_token, match_id))
+
+    def locate(self, comp_token, match_id):
+        """Cache file path of the *comp_token* *match_id* match popup.
+        An existing file in the flat layout is used in place of the
+        sharded path.
+
+        **Returns:**
+            the file path.  The file may not exist
+
+        """
+        target_file = self.target_file(comp_token, match_id)
+        if not os.path.exists(target_file):
+            flat_file = os.path.join(self.cache_dir,
+                                     CacheLayout.file_name(comp_token,
+                                                           match_id))
+            if os.path.exists(flat_file):
+                target_file = flat_file
+
+        return target_file
+
+    def add(self, comp_token, match_id):
+        """Register the *match_id* section of *comp_token* in the layout
+        manifest.  Call once the match popup is written, so that the
+        manifest never lists a section without its files.
+
+        """
+        section = match_id[:SECTION_LENGTH]
+        with self.__lock:
+            sections = self.__competitions.setdefault(comp_token, [])
+            if section not in sections:
+                sections.append(section)
+                sections.sort()
+                self.__dirty = True
+
+    def html_files(self, competitions=None):
+        """HTML files of the sharded and the flat layouts.
+
+        **Kwargs:**
+            *competitions*: limit the files to these competition tokens.
+            Only their section directories are listed
+
+        **Returns:**
+            list of HTML file paths sorted by file name.  A sharded file
+            takes the place of a flat layout file of the same name
+
+        """
+        if competitions is not None:
+            competitions = set(competitions)
+            prefixes = tuple('{}--'.format(x) for x in competitions)
+
+        html_files = {}
+        if os.path.isdir(self.cache_dir):
+            for entry in os.scandir(self.cache_dir):
+                if (entry.name.endswith('.html')
+                        and entry.is_file()
+                        and (competitions is None
+                             or entry.name.startswith(prefixes))):
+                    html_files[entry.name] = entry.path
+
+        for comp_token in self.competitions():
+            if competitions is not None and comp_token not in competitions:
+                continue
+
+            comp_dir = os.path.join(self.cache_dir,
+                                    comp_token.split('_')[0],
+                                    comp_token)
+            for section in self.sections(comp_token):
+                section_dir = os.path.join(comp_dir, section)
+                if not os.path.isdir(section_dir):
+                    continue
+                html_files.update((x.name, x.path)
+                                  for x in os.scandir(section_dir)
+                                  if x.name.endswith('.html'))
+
+        return [html_files[x] for x in sorted(html_files)]
+
+    def migrate(self):
+        """Move the flat layout HTML files into the sharded layout.
+
+        **Returns:**
+            the number of files moved
+
+        """
+        count = 0
+        for entry in sorted(os.scandir(self.cache_dir), key=lambda x: x.name):
+            if not entry.name.endswith('.html') or not entry.is_file():
+                continue
+
+            comp_token, _, match_id = entry.name[:-len('.html')].rpartition('--')
+            if not comp_token or not match_id:
+                logging.warning('Skipped cache file "%s": unknown name',
+                                entry.path)
+                continue
+
+            target_file = self.target_file(comp_token, match_id)
+            if os.path.exists(target_file):
+                # The sharded copy is the one that is kept up to date.
+                os.remove(entry.path)
+            else:
+                create_dir(os.path.dirname(target_file))
+                os.replace(entry.path, target_file)
+            self.add(comp_token, match_id)
+            count += 1
+
+        logging.info('Moved %d HTML files into the sharded layout of "%s"',
+                     count, self.cache_dir)
+
+        return count
@@ -10,6 +10,12 @@ class Config(configa.Config):
         self.__drop_box = {}
         self.__cache = None
         self.__shelve = None
+        self.__parse_cache = None
+        self.__cache_fsync = 0
+        self.__pool_size = 4
+        self.__idle_timeout = 30.0
+        self.__rate_limit = 8.0
+        self.__max_retries = 3
 
         configa.Config.__init__(self, config_file)
 
@@ -45,6 +51,54 @@ class Config(configa.Config):
     def set_shelve(self, value):
         pass
 
+    @property
+    def parse_cache(self):
+        return self.__parse_cache
+
+    @set_scalar
+    def set_parse_cache(self, value):
+        pass
+
+    @property
+    def cache_fsync(self):
+        return self.__cache_fsync
+
+    @set_scalar
+    def set_cache_fsync(self, value):
+        pass
+
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    @set_scalar
+    def set_pool_size(self, value):
+        pass
+
+    @property
+    def idle_timeout(self):
+        return self.__idle_timeout
+
+    @set_scalar
+    def set_idle_timeout(self, value):
+        pass
+
+    @property
+    def rate_limit(self):
+        return self.__rate_limit
+
+    @set_scalar
+    def set_rate_limit(self, value):
+        pass
+
+    @property
+    def max_retries(self):
+        return self.__max_retries
+
+    @set_scalar
+    def set_max_retries(self, value):
+        pass
+
     def parse_config(self):
         """Read config items from the configuration file.
         """
@@ -58,7 +112,36 @@ class Config(configa.Config):
             {
                 'section': 'directories',
                 'option': 'shelve',
-            }
+            },
+            {
+                'section': 'directories',
+                'option': 'parse_cache',
+            },
+            {
+                'section': 'directories',
+                'option': 'cache_fsync',
+                'cast_type': 'int',
+            },
+            {
+                'section': 'http',
+                'option': 'pool_size',
+                'cast_type': 'int',
+            },
+            {
+                'section': 'http',
+                'option': 'idle_timeout',
+                'cast_type': 'float',
+            },
+            {
+                'section': 'http',
+                'option': 'rate_limit',
+                'cast_type': 'float',
+            },
+            {
+                'section': 'http',
+                'option': 'max_retries',
+                'cast_type': 'int',
+            },
         ]
 
         for kwarg in kwargs:
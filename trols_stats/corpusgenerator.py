@@ -0,0 +1,446 @@
+""":class:`trols_stats.CorpusGenerator`
+
+Synthetic TROLS match popup HTML for scale testing.
+
+"""
+import os
+import random
+import datetime
+import itertools
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+
+__all__ = ['CorpusGenerator']
+
+# Competitions of each league as competition option value and day
+# token tuples.
+LEAGUES = {
+    'nejta': [('AA', 'saturday_am')],
+    'dvta': [('TN', 'tuesday_night'), ('HN', 'thursday_night')],
+}
+
+TITLES = {
+    'nejta': 'North Eastern Junior Tennis',
+    'dvta': 'Diamond Valley Tennis',
+}
+
+# Rubbers of a match as home player codes (the away player codes are
+# the same) and the games that win a set.
+FORMATS = {
+    'nejta': (('1+4', '2+3', '1', '2', '3', '4', '1+2', '3+4'), 6),
+    'dvta': (('1+2', '3+4', '1+3', '2+4', '1+4', '2+3'), 8),
+}
+
+# First round date of each season as (month, day).
+SEASONS = (('autumn', (2, 1)), ('spring', (7, 20)))
+
+CLUBS = [
+    'Watsonia', 'St Marys', 'Eltham', 'Plenty', 'Kinglake Ranges',
+    'Montmorency', 'Greensborough', 'Rosanna', 'Bundoora', 'Diamond Creek',
+    'Lower Plenty', 'Macleod', 'Briar Hill', 'Yarrambat', 'Hurstbridge',
+    'Research', 'Viewbank', 'Heidelberg',
+]
+
+COLORS = ['red', 'blue', 'gold', 'green', 'white', 'black']
+
+FIRST_NAMES = {
+    'girls': [
+        'Madeline', 'Tara', 'Alexis', 'Grace', 'Lauren', 'Mia', 'Lucinda',
+        'Brooke', 'Bridget', 'Abbey', 'Kate', 'Isabella', 'Chloe', 'Emily',
+        'Olivia', 'Ruby', 'Zoe', 'Sophie', 'Ella', 'Hannah',
+    ],
+    'boys': [
+        'Lachlan', 'Thomas', 'Jack', 'Oliver', 'Noah', 'William', 'Lucas',
+        'Ethan', 'James', 'Cooper', 'Riley', 'Harry', 'Samuel', 'Max',
+        'Liam', 'Henry', 'Archie', 'Charlie', 'Oscar', 'Leo',
+    ],
+}
+
+LAST_NAMES = [
+    'Doyle', 'Watson', 'McIntosh', 'Heaver', 'Amsing', 'Bovalino', 'Ford',
+    'Moore', 'Heczey', 'Rumble', 'Ensor', 'Markovski', 'Gee', 'Mueller',
+    'Ulmer', 'Napolitano', 'Anderson', 'Hale', 'Owens', 'Bullock', 'Smith',
+    'Nguyen', 'Kelly', 'Walsh', 'Brennan', 'Papadopoulos', 'Russo', 'Tran',
+    'Fraser', 'Campbell',
+]
+
+PAGE = ('<!DOCTYPE html PUBLIC "-//W3C//DTD HTML 4.01//EN" '
+        '"http://www.w3.org/TR/html4/strict.dtd">\n'
+        '<html><head><title>{title}</title>\n'
+        '<link rel="stylesheet" type="text/css" href="/styles/style.css">\n'
+        '</head>\n'
+        '<body link="#006600" vlink="#006600" alink="#006600" '
+        'bgcolor="#FFFFFF" text="#000000">\n'
+        '<table width="500" border="0" align="center" cellpadding="0" '
+        'cellspacing="0" class="xs"><tr align="center"><td class="mb">'
+        '{preamble}</td><td><a class="noPrint" onclick="window.print();">'
+        '<img src="/images/icon-link-print.gif"/></a></td></tr></table>'
+        '<table width="95%" border="0" cellpadding="1" cellspacing="0" '
+        'class="xs"><tr align="center"><td colspan="2"><b>{home_team}</b>'
+        '</td><td width="160">&nbsp;</td><td colspan=2><b>{away_team}</b>'
+        '</td></tr><tr valign="top"><td><table align="center" '
+        'cellpadding="3">{home_players}</table></td><td colspan=3>'
+        '<table width="150" align="center">{rubbers}'
+        '<tr style="font-weight:bold" align="center">'
+        '<td class="separate">{home_sets}</td>'
+        '<td class="separate">{home_games}-{away_games}</td>'
+        '<td class="separate">{away_sets}</td></tr></table></td><td>'
+        '<table align="center"  cellpadding="3">{away_players}</table>'
+        '</td></tr></table></body></html>')
+
+PLAYER = '<tr><td>&nbsp;</td><td>{}.  {}</td></tr>'
+
+RUBBER = ('<tr valign="top" align="center"><td>{0}</td>'
+          '<td style="font-weight:bold;">{1}-{2}</td><td>{0}</td></tr>')
+
+
+class CorpusGenerator(object):
+    """Synthetic TROLS match popups in the structure of the cached
+    fixtures.
+
+    Each league runs :attr:`seasons` seasons of its competitions.  Each
+    competition has :attr:`sections` sections of :attr:`teams` teams
+    that play a round robin of :attr:`rounds` rounds, then optionally
+    two semi finals and a grand final.  Each team has a roster of
+    :attr:`players` players and fields four of them in each match.
+
+    The output is deterministic for a given :attr:`seed`.  Each
+    competition draws from its own random stream, so a competition is
+    the same whichever competitions are generated with it.
+
+    .. attribute:: leagues
+        list of league names.  Known leagues are ``nejta`` and ``dvta``
+
+    .. attribute:: seasons
+        number of seasons of each league.  Autumn and spring alternate
+
+    .. attribute:: first_year
+        year of the first season
+
+    .. attribute:: sections
+        number of sections of each competition
+
+    .. attribute:: teams
+        number of teams of each section
+
+    .. attribute:: players
+        roster size of each team.  At least four
+
+    .. attribute:: rounds
+        number of home and away rounds.  Defaults to one round against
+        each team
+
+    .. attribute:: finals
+        add semi finals and a grand final to each section
+
+    .. attribute:: seed
+        random seed
+
+    """
+    @property
+    def leagues(self):
+        return self.__leagues
+
+    @property
+    def seasons(self):
+        return self.__seasons
+
+    @property
+    def first_year(self):
+        return self.__first_year
+
+    @property
+    def sections(self):
+        return self.__sections
+
+    @property
+    def teams(self):
+        return self.__teams
+
+    @property
+    def players(self):
+        return self.__players
+
+    @property
+    def rounds(self):
+        return self.__rounds
+
+    @property
+    def finals(self):
+        return self.__finals
+
+    @property
+    def seed(self):
+        return self.__seed
+
+    def __init__(self,
+                 leagues=None,
+                 seasons=1,
+                 first_year=2015,
+                 sections=4,
+                 teams=6,
+                 players=6,
+                 rounds=None,
+                 finals=True,
+                 seed=0):
+        if leagues is None:
+            leagues = sorted(LEAGUES)
+        unknown = sorted(set(leagues) - set(LEAGUES))
+        if unknown:
+            raise ValueError('Unknown leagues: {}'.format(', '.join(unknown)))
+        names = len(LAST_NAMES) * min(len(x) for x in FIRST_NAMES.values())
+        if teams * players > names:
+            raise ValueError('Sections are limited to {} players'.format(names))
+
+        self.__leagues = list(leagues)
+        self.__seasons = seasons
+        self.__first_year = first_year
+        self.__sections = sections
+        self.__teams = max(2, teams)
+        self.__players = max(4, players)
+        if rounds is None:
+            rounds = self.__teams - 1 + self.__teams % 2
+        self.__rounds = rounds
+        self.__finals = finals and self.__teams >= 4
+        self.__seed = seed
+
+    def competitions(self):
+        """Competitions of the corpus.
+
+        **Returns:**
+            generator of ``(comp_token, league, option_value,
+            first_round)`` tuples.  For example::
+
+                ('nejta_saturday_am_autumn_2015', 'nejta', 'AA',
+                 datetime.date(2015, 2, 1))
+
+        """
+        for number in range(self.seasons):
+            year = self.first_year + number // len(SEASONS)
+            season, (month, day) = SEASONS[number % len(SEASONS)]
+            for league in self.leagues:
+                for option_value, day_token in LEAGUES[league]:
+                    comp_token = '{}_{}_{}_{}'.format(league,
+                                                      day_token,
+                                                      season,
+                                                      year)
+                    yield (comp_token,
+                           league,
+                           option_value,
+                           datetime.date(year, month, day))
+
+    def generate(self):
+        """Match popups of the corpus.
+
+        **Returns:**
+            generator of ``(comp_token, match_id, html)`` tuples
+
+        """
+        for comp_token, league, option_value, first_round in self.competitions():
+            matches = self.matches(comp_token, league, option_value, first_round)
+            for match_id, html in matches:
+                yield comp_token, match_id, html
+
+    def matches(self, comp_token, league, option_value, first_round):
+        """Match popups of the one competition.
+
+        **Returns:**
+            generator of ``(match_id, html)`` tuples
+
+        """
+        rand = random.Random('{}-{}'.format(self.seed, comp_token))
+        day = comp_token.split('_')[1][:3].title()
+
+        for number in range(1, self.sections + 1):
+            code = '{}{:03d}'.format(option_value, number)
+            if league == 'nejta':
+                # Boys sections first, then the girls sections.
+                half = (self.sections + 1) // 2
+                competition_type = 'boys'
+                section_no = number
+                if number > half:
+                    competition_type = 'girls'
+                    section_no = number - half
+                section = '{} {}'.format(competition_type.upper(), section_no)
+            else:
+                competition_type = 'girls'
+                section = '{} Sect {}'.format(day, number)
+
+            teams = self.__section_teams(rand, competition_type)
+            fixtures = CorpusGenerator.round_robin(len(teams), self.rounds)
+
+            match_number = 0
+            for round_no, pairs in enumerate(fixtures, 1):
+                date = first_round + datetime.timedelta(weeks=round_no - 1)
+                preamble = '{}&nbsp;&nbsp;Rd.{}&nbsp;on&nbsp;{}'.format(
+                    section, round_no, CorpusGenerator.format_date(date))
+                for home, away in pairs:
+                    match_number += 1
+                    match_id = '{}{:03d}'.format(code, match_number)
+                    html, _ = self.__match(rand, league, preamble,
+                                           teams[home], teams[away])
+                    yield match_id, html
+
+            if not self.finals:
+                continue
+
+            ladder = list(range(len(teams)))
+            rand.shuffle(ladder)
+            grand_final = []
+            for home, away in ((ladder[0], ladder[3]), (ladder[1], ladder[2])):
+                match_number += 1
+                match_id = '{}{:03d}'.format(code, match_number)
+                preamble = '{}&nbsp;on&nbsp;Semi Final'.format(section)
+                html, home_won = self.__match(rand, league, preamble,
+                                              teams[home], teams[away])
+                grand_final.append(home if home_won else away)
+                yield match_id, html
+
+            match_number += 1
+            match_id = '{}{:03d}'.format(code, match_number)
+            preamble = '{}&nbsp;on&nbsp;Grand Final'.format(section)
+            html, _ = self.__match(rand, league, preamble,
+                                   teams[grand_final[0]],
+                                   teams[grand_final[1]])
+            yield match_id, html
+
+    def write(self, directory, layout=None):
+        """Write the match popups to *directory* in the flat cache
+        layout.
+
+        **Kwargs:**
+            *layout*: :class:`trols_stats.CacheLayout` of *directory*.
+            Writes the sharded layout instead
+
+        **Returns:**
+            the number of match popups written
+
+        """
+        create_dir(directory)
+        writer = AtomicWriter()
+
+        count = 0
+        for comp_token, match_id, html in self.generate():
+            if layout is not None:
+                target_file = layout.target_file(comp_token, match_id)
+                create_dir(os.path.dirname(target_file))
+            else:
+                file_name = '{}--{}.html'.format(comp_token, match_id)
+                target_file = os.path.join(directory, file_name)
+            writer.write(target_file, html)
+            if layout is not None:
+                layout.add(comp_token, match_id)
+            count += 1
+
+        logging.info('Synthetic corpus "%s": %d match popups written',
+                     directory, count)
+
+        return count
+
+    @staticmethod
+    def round_robin(teams, rounds):
+        """Circle method round robin of *teams* teams over *rounds*
+        rounds.  The draw repeats with home and away swapped once every
+        team has met.  An odd team count gives one team a bye each
+        round.
+
+        **Returns:**
+            list of each round's list of ``(home, away)`` team index
+            tuples
+
+        """
+        order = list(range(teams + teams % 2))
+        cycle = len(order) - 1
+
+        fixtures = []
+        for round_no in range(rounds):
+            pairs = []
+            for index in range(len(order) // 2):
+                home, away = order[index], order[-1 - index]
+                if (round_no // cycle) % 2:
+                    home, away = away, home
+                if home < teams and away < teams:
+                    pairs.append((home, away))
+            fixtures.append(pairs)
+            order = [order[0], order[-1]] + order[1:-1]
+
+        return fixtures
+
+    @staticmethod
+    def format_date(date):
+        """TROLS match date.  For example, ``28th Feb 15``.
+
+        """
+        if 11 <= date.day <= 13:
+            suffix = 'th'
+        else:
+            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(date.day % 10, 'th')
+
+        return '{}{} {}'.format(date.day, suffix, date.strftime('%b %y'))
+
+    def __section_teams(self, rand, competition_type):
+        """Teams of a section as ``(team_html, roster)`` tuples.
+
+        """
+        clubs = rand.sample(CLUBS, min(self.teams, len(CLUBS)))
+        names = list(itertools.product(FIRST_NAMES[competition_type],
+                                       LAST_NAMES))
+        names = rand.sample(names, self.teams * self.players)
+
+        teams = []
+        for index in range(self.teams):
+            club = clubs[index % len(clubs)]
+            if index >= len(clubs) or rand.random() < 0.3:
+                color = COLORS[(index // len(clubs)) % len(COLORS)]
+                club = '{}&nbsp;<span style="color:{}">{}</span>'.format(
+                    club, color, color.title())
+            start = index * self.players
+            roster = ['{} {}'.format(*x)
+                      for x in names[start:start + self.players]]
+            teams.append((club, roster))
+
+        return teams
+
+    def __match(self, rand, league, preamble, home, away):
+        """Render a match between the *home* and *away* teams.
+
+        **Returns:**
+            tuple of the match popup HTML and a boolean ``True`` if the
+            home team won
+
+        """
+        rubbers, target = FORMATS[league]
+
+        sets = [0, 0]
+        games = [0, 0]
+        rows = []
+        for codes in rubbers:
+            loser = rand.randint(0, target - 1)
+            score = (target, loser) if rand.random() < 0.5 else (loser, target)
+            sets[score[1] > score[0]] += 1
+            games[0] += score[0]
+            games[1] += score[1]
+            rows.append(RUBBER.format(codes, *score))
+
+        home_players = ''.join(PLAYER.format(x, y) for x, y
+                               in enumerate(rand.sample(home[1], 4), 1))
+        away_players = ''.join(PLAYER.format(x, y) for x, y
+                               in enumerate(rand.sample(away[1], 4), 1))
+
+        html = PAGE.format(title=TITLES[league],
+                           preamble=preamble,
+                           home_team=home[0],
+                           away_team=away[0],
+                           home_players=home_players,
+                           away_players=away_players,
+                           rubbers=''.join(rows),
+                           home_sets=sets[0],
+                           away_sets=sets[1],
+                           home_games=games[0],
+                           away_games=games[1])
+
+        home_won = (sets[0], games[0]) >= (sets[1], games[1])
+
+        return html, home_won
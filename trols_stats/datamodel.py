@@ -2,10 +2,89 @@
 
 """
 import os
+import itertools
 import logging
+import concurrent.futures
 
 import trols_stats.interface
-from filer.files import get_directory_files
+import trols_stats.model.aggregates
+
+# Number of shards per worker in a parallel build.  More shards than
+# workers evens out the load across the pool.
+SHARDS_PER_WORKER = 4
+
+
+def _load_files(html_files, fast=False, cache=None, pack=None):
+    """Scrape *html_files* and group the games by player token.
+
+    **Args:**
+        *html_files*: list of HTML file paths
+
+    **Kwargs:**
+        *fast*: scrape with the :class:`trols_stats.FastParser`
+
+        *cache*: open :class:`trols_stats.ParseCache`
+
+        *pack*: open :class:`trols_stats.PackCache`.  An HTML file that
+        does not exist is read from the pack record of its name
+
+    **Returns:**
+        dictionary of player tokens and their list of
+        :class:`trols_stats.model.aggregates.Game` objects in
+        *html_files* order
+
+    """
+    loader = trols_stats.interface.Loader()
+
+    for html_file in html_files:
+        if (pack is not None
+                and not os.path.exists(html_file)
+                and os.path.basename(html_file) in pack):
+            html = pack.get(os.path.basename(html_file))
+        else:
+            with open(html_file, 'rb') as _fh:
+                html = _fh.read()
+
+        if cache is None:
+            loader.build_game_map(html, os.path.basename(html_file), fast=fast)
+        else:
+            match = cache.parse(html, fast=fast)
+            loader.load_match(match, os.path.basename(html_file))
+
+    loader.interner.log_report()
+
+    return trols_stats.model.aggregates.Game.group_by_token(loader.games)
+
+
+def _construct_shard(html_files, fast=False, parse_cache=None, pack_dir=None):
+    """Process pool task that builds the partial player token map of
+    a shard of *html_files*.  The parse cache and the pack are opened
+    read only so that the workers can share them.
+
+    **Returns:**
+        tuple of the partial player token map and the list of parse
+        cache records scraped by this worker
+
+    """
+    pack = None
+    if pack_dir is not None:
+        pack = trols_stats.PackCache(pack_dir, readonly=True)
+        pack.open()
+
+    try:
+        if parse_cache is None:
+            return _load_files(html_files, fast=fast, pack=pack), []
+
+        with trols_stats.ParseCache(parse_cache, readonly=True) as cache:
+            player_id_games = _load_files(html_files,
+                                          fast=fast,
+                                          cache=cache,
+                                          pack=pack)
+    finally:
+        if pack is not None:
+            pack.close()
+
+    return player_id_games, cache.new_records
 
 
 class DataModel(object):
@@ -22,7 +101,12 @@ class DataModel(object):
     def __call__(self):
         return self.__content
 
-    def construct(self, raw_data_directory=os.curdir):
+    def construct(self,
+                  raw_data_directory=os.curdir,
+                  fast=False,
+                  parse_cache=None,
+                  workers=None,
+                  competitions=None):
         """Source raw HTML files from *raw_data_directory* and
         build the data store.
 
@@ -30,20 +114,59 @@ class DataModel(object):
             *raw_data_directory*: location of source HTML files.  Defaults
             to the current directory if not provided
 
+            *fast*: scrape with the :class:`trols_stats.FastParser`
+
+            *parse_cache*: directory of the :class:`trols_stats.ParseCache`.
+            Only HTML files that are not in the cache are scraped.  If
+            not provided, every HTML file is scraped
+
+            *workers*: number of worker processes.  The HTML files are
+            split into contiguous shards that are scraped in parallel.
+            The merged result is identical to the serial build
+
+            *competitions*: list of competition tokens to build.  For
+            example, ``nejta_saturday_am_autumn_2015``.  Only their
+            :class:`trols_stats.CacheLayout` shards are listed.  If not
+            provided, every competition is built
+
+        A :class:`trols_stats.PackCache` in *raw_data_directory* is read
+        along with the HTML files.  An HTML file takes the place of the
+        pack record of the same name, as new fetches are written to
+        HTML files and not to the pack.
+
         """
-        loader = trols_stats.interface.Loader()
+        layout = trols_stats.CacheLayout(raw_data_directory)
+        layout.load()
+        html_files = layout.html_files(competitions)
 
-        for html_file in get_directory_files(raw_data_directory,
-                                             file_filter=r'.*.html$'):
-            with open(html_file) as _fh:
-                loader.build_game_map(_fh.read(),
-                                      os.path.basename(html_file))
+        pack_dir = None
+        with trols_stats.PackCache(raw_data_directory, readonly=True) as pack:
+            if len(pack):
+                pack_dir = raw_data_directory
+                loose = {os.path.basename(x) for x in html_files}
+                packed = set(pack.keys()) - loose
+                if competitions is not None:
+                    prefixes = tuple('{}--'.format(x) for x in competitions)
+                    packed = {x for x in packed if x.startswith(prefixes)}
+                html_files = sorted(html_files
+                                    + [os.path.join(raw_data_directory, x)
+                                       for x in packed],
+                                    key=os.path.basename)
 
-        player_id_games = {}
-        for game in loader.games:
-            token = game.player_id().get('token')
-            player_id_games.setdefault(token, [])
-            player_id_games[token].append(game)
+            if workers is not None and workers > 1:
+                player_id_games = self.__construct_parallel(html_files,
+                                                            workers,
+                                                            fast,
+                                                            parse_cache,
+                                                            pack_dir)
+            elif parse_cache is None:
+                player_id_games = _load_files(html_files, fast=fast, pack=pack)
+            else:
+                with trols_stats.ParseCache(parse_cache) as cache:
+                    player_id_games = _load_files(html_files,
+                                                  fast=fast,
+                                                  cache=cache,
+                                                  pack=pack)
 
         token_count = len(player_id_games.keys())
 
@@ -53,3 +176,57 @@ class DataModel(object):
                      token_count, self.__session.shelve_db)
 
         return token_count
+
+    @staticmethod
+    def __construct_parallel(html_files,
+                             workers,
+                             fast,
+                             parse_cache,
+                             pack_dir=None):
+        """Scrape *html_files* across a pool of *workers* processes.
+
+        Shards are contiguous runs of *html_files*.  Merging the partial
+        player token maps in shard order preserves both the token order
+        and the game order of the serial build.
+
+        Each shard returns its own copies of the players and fixtures
+        that it shares with other shards.  They are merged into one
+        :class:`trols_stats.Interner` so that the store holds one object
+        of each.
+
+        """
+        if parse_cache is not None:
+            # Create or invalidate the cache before the workers read it.
+            with trols_stats.ParseCache(parse_cache):
+                pass
+
+        shard_count = min(len(html_files), workers * SHARDS_PER_WORKER) or 1
+        shard_size = max(1, -(-len(html_files) // shard_count))
+        shards = [html_files[i:i + shard_size]
+                  for i in range(0, len(html_files), shard_size)]
+        logging.info('Scraping %d HTML files in %d shards across %d workers',
+                     len(html_files), len(shards), workers)
+
+        player_id_games = {}
+        new_records = []
+        interner = trols_stats.Interner()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_construct_shard,
+                               shards,
+                               itertools.repeat(fast),
+                               itertools.repeat(parse_cache),
+                               itertools.repeat(pack_dir))
+            for partial_games, records in results:
+                interner.games(itertools.chain(*partial_games.values()))
+                for token, games in partial_games.items():
+                    player_id_games.setdefault(token, [])
+                    player_id_games[token].extend(games)
+                new_records.extend(records)
+
+        interner.log_report()
+
+        if new_records:
+            with trols_stats.ParseCache(parse_cache) as cache:
+                cache.update(new_records)
+
+        return player_id_games
@@ -0,0 +1,246 @@
+"""class:`trols_stats.FastParser`.
+
+Regular expression fast path for TROLS match popup HTML.
+
+The match popup pages are small and very regular.  Rather than building
+a :mod:`lxml.html` document tree, :class:`FastParser` pulls each of the
+:mod:`trols_stats.xpaths` match extractions straight out of the raw HTML
+with a single pattern scan.  Each scan is paired with a structural check
+that counts the competing markup.  Any page outside of the expected
+layout is rejected so that the caller can fall back to the :mod:`lxml`
+path.
+
+"""
+import re
+import html as html_lib
+import logging
+
+import trols_stats
+
+__all__ = ['FastParser']
+
+# The match popup markup is lower case.  Upper case tags, and markup
+# that splits text nodes or hides content from the scans, are left to
+# lxml.
+UNSUPPORTED = ('<!--', '<![CDATA[', '<script', '<style')
+UPPER_CASE_TAG_RE = re.compile(r'</?[A-Z]')
+
+# Text nodes that start with a player number.
+PLAYER_TEXT_RE = re.compile(r'>\d\.')
+
+PREAMBLE_RE = re.compile(
+    r'''<td\b[^>]*\bclass\s*=\s*["']?[^"'>]*mb[^>]*>([^<]*)<'''
+)
+
+TEAM_RE = re.compile(
+    r'<td\b[^>]*>\s*<b>([^<]*)(?:<span\b[^>]*>([^<]*)</span>)?\s*</b>\s*</td>'
+)
+
+PLAYER_RE = re.compile(r'<td\b[^>]*>(\d\.[^<]*)</td>')
+
+# Player codes and game scores in the score table cells.
+DIGITS_RE = re.compile(r'\d+')
+
+SCORE_CELL = r'\s*<td\b[^>]*>([^<]*)</td>'
+SCORE_ROW_RE = re.compile(
+    r'''<tr\b[^>]*\bvalign\s*=\s*["']?top[^>]*>'''
+    + SCORE_CELL * 3
+    + r'\s*</tr>'
+)
+
+
+def unescape(text):
+    """Resolve character references in *text* only when present.
+
+    """
+    if '&' in text:
+        text = text.replace('&nbsp;', u'\xa0')
+        if '&' in text:
+            text = html_lib.unescape(text)
+
+    return text
+
+
+class FastParser(object):
+    @staticmethod
+    def parse_match(html):
+        """Extract the teams, players, preamble and scores from a TROLS
+        match popup page without building a document tree.
+
+        **Args:**
+            *html*: string representation or raw bytes of the HTML page
+            to process.  *html* is typically a TROLS detailed match
+            results page.
+
+        **Returns:**
+            the same dictionary structure as
+            :meth:`trols_stats.Scraper.parse_match` or ``None`` if the
+            page structure is not recognised
+
+        """
+        tokens = FastParser.tokenise(trols_stats.Scraper.decode_html(html))
+        if tokens is None:
+            return None
+
+        teams = tokens.get('teams')
+
+        colored_teams = {}
+        for key, team, away in (('home_team', teams[0][0], False),
+                                ('away_team', teams[1][0], True)):
+            colors = [y for x, y in teams if y is not None and team in x]
+            team = trols_stats.Scraper.color_code_team(team, colors, away=away)
+            colored_teams[key] = team.replace(u'\xa0', u' ')
+
+        return {
+            'teams': colored_teams,
+            'players': trols_stats.Scraper.number_players(tokens.get('players')),
+            'preamble': trols_stats.Scraper.parse_preamble(tokens.get('preamble')),
+            'scores': FastParser.parse_scores(tokens.get('scores')),
+        }
+
+    @staticmethod
+    def parse_scores(raw_scores):
+        """Build the match results from the score table cell text
+        without the :meth:`trols_stats.Scraper.parse_scores` logging of
+        each cell.
+
+        Only complete rows of a home code, a two part score and an away
+        code of the same singles or doubles format are built here.  Any
+        other row is left to :meth:`trols_stats.Scraper.parse_scores`,
+        which then builds the whole table.
+
+        **Args:**
+            *raw_scores*: list of score table cell text values, three
+            to a row.  ``None`` represents an empty cell
+
+        **Returns:**
+            the same dictionary structure as
+            :meth:`trols_stats.Scraper.parse_scores`
+
+        """
+        if len(raw_scores) % 3:
+            return trols_stats.Scraper.parse_scores(raw_scores)
+
+        match_results = {}
+        for i in range(0, len(raw_scores), 3):
+            home, score, away = raw_scores[i:i + 3]
+            if home is None or score is None or away is None:
+                return trols_stats.Scraper.parse_scores(raw_scores)
+
+            home = DIGITS_RE.findall(home)
+            score = DIGITS_RE.findall(score)
+            away = DIGITS_RE.findall(away)
+            if (not home
+                    or not away
+                    or len(score) != 2
+                    or (len(home) > 1) != (len(away) > 1)):
+                return trols_stats.Scraper.parse_scores(raw_scores)
+
+            score_for, score_against = int(score[0]), int(score[1])
+            home_1 = int(home[0])
+            away_1 = int(away[0]) + 4
+
+            # The same stats as Scraper.create_stat, in the same order.
+            if len(home) == 1:
+                match_results.setdefault(home_1, []).append({
+                    'team_mate': None,
+                    'opposition': (away_1, None),
+                    'score_for': score_for,
+                    'score_against': score_against,
+                })
+                match_results.setdefault(away_1, []).append({
+                    'team_mate': None,
+                    'opposition': (home_1, None),
+                    'score_for': score_against,
+                    'score_against': score_for,
+                })
+                continue
+
+            home_2 = int(home[1])
+            away_2 = int(away[1]) + 4
+            match_results.setdefault(home_1, []).append({
+                'team_mate': home_2,
+                'opposition': (away_1, away_2),
+                'score_for': score_for,
+                'score_against': score_against,
+            })
+            match_results.setdefault(home_2, []).append({
+                'team_mate': home_1,
+                'opposition': (away_1, away_2),
+                'score_for': score_for,
+                'score_against': score_against,
+            })
+            match_results.setdefault(away_1, []).append({
+                'team_mate': home_2 + 4,
+                'opposition': (home_1, home_2),
+                'score_for': score_against,
+                'score_against': score_for,
+            })
+            match_results.setdefault(away_2, []).append({
+                'team_mate': home_1 + 4,
+                'opposition': (home_1, home_2),
+                'score_for': score_against,
+                'score_against': score_for,
+            })
+
+        return match_results
+
+    @staticmethod
+    def tokenise(html):
+        """Scan *html* for the raw match components.
+
+        **Args:**
+            *html*: string representation of the HTML page to process.
+
+        **Returns:**
+            dictionary structure of the form::
+
+                {
+                    'teams': [('Watsonia\\xa0', 'Red'), ('St Marys', None)],
+                    'preamble': 'GIRLS 14\\xa0on\\xa028th Feb 15 ...',
+                    'players': ['1.  Madeline Doyle', ...],
+                    'scores': ['1+2', '3-6', '1+2', ...],
+                }
+
+            ``None`` if *html* fails a structural check
+
+        """
+        def reject(reason):
+            logging.debug('Fast parser rejected match page: %s', reason)
+
+        if (any(x in html for x in UNSUPPORTED)
+                or UPPER_CASE_TAG_RE.search(html) is not None):
+            return reject('unsupported markup')
+
+        preamble = PREAMBLE_RE.search(html)
+        if preamble is None or not preamble.group(1):
+            return reject('no match preamble')
+
+        teams = TEAM_RE.findall(html)
+        if len(teams) != 2 or html.count('<b>') + html.count('<b ') != 2:
+            return reject('expected two teams')
+        if not all(x for x, _ in teams):
+            return reject('team element has no leading text')
+
+        players = PLAYER_RE.findall(html)
+        if (not players
+                or len(players) % 2
+                or len(PLAYER_TEXT_RE.findall(html)) != len(players)):
+            return reject('unexpected player layout')
+
+        rows = SCORE_ROW_RE.findall(html)
+        # Other than the score rows, only the enclosing players|scores
+        # row carries a vertical alignment.
+        if not rows or html.count('valign=') != len(rows) + 1:
+            return reject('unexpected score layout')
+
+        scores = []
+        for row in rows:
+            scores.extend(unescape(x) if x else None for x in row)
+
+        return {
+            'teams': [(unescape(x), unescape(y) if y else None) for x, y in teams],
+            'preamble': unescape(preamble.group(1)),
+            'players': [unescape(x) for x in players],
+            'scores': scores,
+        }
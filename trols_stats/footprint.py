@@ -0,0 +1,176 @@
+""":class:`trols_stats.Footprint`
+
+"""
+import tracemalloc
+import logging
+
+import trols_stats.model
+import trols_stats.model.entities as entities
+import trols_stats.model.aggregates as aggregates
+from trols_stats.statistics import Statistics
+
+__all__ = ['Footprint']
+
+
+class Footprint(object):
+    """Per-object memory benchmark of the slotted data model classes.
+
+    Each sample object is copied :attr:`count` times and the memory
+    allocated for the copies is traced with :mod:`tracemalloc`.  The
+    same is done for plain objects that hold the sample state in an
+    instance ``__dict__``, as the data model classes did before they
+    had ``__slots__``.  The copies share the attribute values of the
+    sample, so only the object overhead is measured.
+
+    .. attribute:: count
+        number of copies of each sample
+
+    .. attribute:: samples
+        list of the data model objects to measure.  Defaults to a
+        doubles :class:`trols_stats.model.aggregates.Game` and its
+        entities, and a :class:`trols_stats.Statistics`
+
+    """
+    @property
+    def count(self):
+        return self.__count
+
+    @property
+    def samples(self):
+        return self.__samples
+
+    def __init__(self, count=10000, samples=None):
+        self.__count = max(1, count)
+        if samples is None:
+            samples = Footprint.default_samples()
+        self.__samples = samples
+
+    def measure(self):
+        """Measure the per-object memory of each of the :attr:`samples`.
+
+        **Returns:**
+            list of dictionaries of the sample ``class`` name, the
+            ``slots`` and ``dict`` bytes per object and the ``saving``
+            bytes per object
+
+        """
+        reports = []
+        for sample in self.samples:
+            state = Footprint.state(sample)
+            legacy_class = type(type(sample).__name__, (object,), {})
+            slots = Footprint.allocated(
+                lambda: Footprint.slotted(type(sample), state),
+                self.count)
+            legacy = Footprint.allocated(
+                lambda: Footprint.legacy(legacy_class, state),
+                self.count)
+            report = {
+                'class': type(sample).__name__,
+                'slots': slots,
+                'dict': legacy,
+                'saving': legacy - slots,
+            }
+            logging.info(Footprint.format_report(report))
+            reports.append(report)
+
+        return reports
+
+    @staticmethod
+    def allocated(factory, count):
+        """Traced bytes per object of *count* objects built by *factory*.
+
+        """
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+
+        if not tracing:
+            tracemalloc.stop()
+
+        # Leave out the list that holds the objects.
+        size = after - before - objects.__sizeof__()
+
+        return size / count
+
+    @staticmethod
+    def state(obj):
+        """Attribute names and values of *obj* as held by an instance
+        ``__dict__``.  For example, ``{'_Player__name': 'Tara Watson'}``.
+
+        """
+        if hasattr(obj, '__dict__'):
+            return dict(vars(obj))
+
+        names = trols_stats.model.Base.slot_names(type(obj))
+
+        return {x: getattr(obj, x) for x in names if hasattr(obj, x)}
+
+    @staticmethod
+    def slotted(cls, state):
+        """Slotted *cls* object with *state* set directly in its slots.
+        Frozen objects are left unsealed.
+
+        """
+        obj = cls.__new__(cls)
+        for name, value in state.items():
+            object.__setattr__(obj, name, value)
+
+        return obj
+
+    @staticmethod
+    def legacy(cls, state):
+        """Plain *cls* object with *state* in its instance ``__dict__``.
+        A class of its own for each sample keeps the key sharing
+        instance dictionaries of the earlier classes.
+
+        """
+        obj = cls()
+        for name, value in state.items():
+            setattr(obj, name, value)
+
+        return obj
+
+    @staticmethod
+    def default_samples():
+        """Doubles game, its entities and a statistics object.
+
+        """
+        fixture = entities.Fixture(match_round=5,
+                                   competition='saturday_am_autumn_2015',
+                                   competition_type='girls',
+                                   section=14,
+                                   date='28 Feb 15',
+                                   home_team='Watsonia Red',
+                                   away_team='St Marys')
+        player = entities.Player(name='Madeline Doyle', team='Watsonia Red')
+        team_mate = entities.Player(name='Tara Watson', team='Watsonia Red')
+        opposition = (entities.Player(name='Lauren Amsing', team='St Marys'),
+                      entities.Player(name='Mia Bovalino', team='St Marys'))
+        game = aggregates.Game(fixture=fixture,
+                               player=player,
+                               team_mate=team_mate,
+                               opposition=opposition,
+                               score_for=3,
+                               score_against=6)
+
+        return [
+            game,
+            player,
+            fixture,
+            entities.MatchRound('5'),
+            Statistics(),
+        ]
+
+    @staticmethod
+    def format_report(report):
+        """One line summary of a :meth:`measure` *report*.
+
+        """
+        return ('{class}: {slots:.0f} bytes/object slotted|'
+                '{dict:.0f} bytes/object with __dict__|'
+                'saving {saving:.0f} bytes/object'.format(**report))
+
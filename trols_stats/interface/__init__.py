@@ -1,4 +1,13 @@
 """Support shorthand import of our classes into the namespace.
 """
+from .connectionpool import ConnectionPool
+from .ratelimiter import RateLimiter
+from .retrybudget import RetryBudget
+from .manifest import CrawlManifest
+from .discovery import DiscoveryState
+from .checkpoint import CrawlCheckpoint
 from .loader import Loader
+from .crawler import Crawler
 from .reporter import Reporter
+from .standinserver import StandInServer
+from .benchmark import Benchmark
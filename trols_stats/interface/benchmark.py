@@ -0,0 +1,193 @@
+""":class:`trols_stats.interface.Benchmark`
+
+"""
+import math
+import time
+import tempfile
+import logging
+
+import trols_stats
+import trols_stats.interface
+
+__all__ = ['Benchmark']
+
+PERCENTILES = (50, 95, 99)
+
+
+class Benchmark(object):
+    """Offline crawler throughput benchmark.
+
+    Each round crawls a :class:`trols_stats.interface.StandInServer`
+    into a new, empty cache directory and reports the pages per second
+    and the request latency percentiles.  The
+    :class:`trols_stats.interface.Loader` connection pool, rate limiter,
+    retry budget and cache writer are replaced for the run and restored
+    afterwards.
+
+    .. attribute:: corpus_dir
+        directory of the pages served by the stand-in server
+
+    .. attribute:: server_kwargs
+        dictionary of :class:`trols_stats.interface.StandInServer`
+        arguments.  For example, ``{'latency': 0.05}``
+
+    .. attribute:: crawler_kwargs
+        dictionary of :class:`trols_stats.interface.Crawler` arguments.
+        For example, ``{'concurrency': 16}``
+
+    .. attribute:: rate_limit
+        starting requests per second of the
+        :class:`trols_stats.interface.RateLimiter`
+
+    .. attribute:: max_retries
+        :class:`trols_stats.interface.RetryBudget` retries of each
+        request
+
+    .. attribute:: rounds
+        number of crawls
+
+    """
+    @property
+    def corpus_dir(self):
+        return self.__corpus_dir
+
+    @property
+    def server_kwargs(self):
+        return self.__server_kwargs
+
+    @property
+    def crawler_kwargs(self):
+        return self.__crawler_kwargs
+
+    @property
+    def rate_limit(self):
+        return self.__rate_limit
+
+    @property
+    def max_retries(self):
+        return self.__max_retries
+
+    @property
+    def rounds(self):
+        return self.__rounds
+
+    def __init__(self,
+                 corpus_dir,
+                 server_kwargs=None,
+                 crawler_kwargs=None,
+                 rate_limit=8.0,
+                 max_retries=3,
+                 rounds=1):
+        self.__corpus_dir = corpus_dir
+        self.__server_kwargs = dict(server_kwargs or {})
+        self.__crawler_kwargs = dict(crawler_kwargs or {})
+        self.__rate_limit = rate_limit
+        self.__max_retries = max_retries
+        self.__rounds = max(1, rounds)
+
+    def run(self):
+        """Run the benchmark rounds.
+
+        **Returns:**
+            list of the :meth:`crawl` reports of each round
+
+        """
+        loader = trols_stats.interface.Loader
+        saved = (loader.connection_pool,
+                 loader.rate_limiter,
+                 loader.retry_budget,
+                 loader.writer)
+
+        reports = []
+        server = trols_stats.interface.StandInServer(self.corpus_dir,
+                                                     **self.server_kwargs)
+        try:
+            with server:
+                for number in range(1, self.rounds + 1):
+                    report = self.crawl(server)
+                    logging.info('Benchmark round %d: %s',
+                                 number, Benchmark.format_report(report))
+                    reports.append(report)
+        finally:
+            (loader.connection_pool,
+             loader.rate_limiter,
+             loader.retry_budget,
+             loader.writer) = saved
+
+        return reports
+
+    def crawl(self, server):
+        """Crawl the running stand-in *server* once into an empty
+        cache directory.
+
+        **Returns:**
+            dictionary of the ``pages`` fetched, the ``requests`` sent,
+            the crawl ``seconds``, the ``pages_per_sec`` and the
+            ``p50``, ``p95`` and ``p99`` request latency seconds.  Also
+            the ``failures`` of the crawl and the ``errors`` injected by
+            the server
+
+        """
+        interface = trols_stats.interface
+        pool = interface.ConnectionPool()
+        limiter_kwargs = {
+            'rate': self.rate_limit,
+            'max_rate': max(self.rate_limit, interface.RateLimiter().max_rate),
+        }
+        interface.Loader.connection_pool = pool
+        interface.Loader.rate_limiter = interface.RateLimiter(**limiter_kwargs)
+        budget = interface.RetryBudget(max_retries=self.max_retries)
+        interface.Loader.retry_budget = budget
+        interface.Loader.writer = trols_stats.AtomicWriter()
+
+        errors = server.errors
+        with tempfile.TemporaryDirectory() as cache_dir, pool:
+            kwargs = dict(self.crawler_kwargs)
+            kwargs.update({
+                'results_url': server.results_url,
+                'popup_url': server.popup_url,
+            })
+            crawler = interface.Crawler(cache_dir, **kwargs)
+
+            start = time.monotonic()
+            crawler.crawl(server.trols_urls())
+            seconds = time.monotonic() - start
+
+        report = {
+            'pages': crawler.fetched,
+            'requests': len(crawler.latencies),
+            'seconds': seconds,
+            'pages_per_sec': crawler.fetched / seconds if seconds else 0.0,
+            'failures': len(crawler.failures),
+            'errors': server.errors - errors,
+        }
+        for percent in PERCENTILES:
+            key = 'p{}'.format(percent)
+            report[key] = Benchmark.percentile(crawler.latencies, percent)
+
+        return report
+
+    @staticmethod
+    def percentile(values, percent):
+        """Nearest-rank *percent* percentile of *values*.
+
+        **Returns:**
+            the percentile value or ``0.0`` if *values* is empty
+
+        """
+        if not values:
+            return 0.0
+
+        ordered = sorted(values)
+        rank = max(1, math.ceil(percent / 100.0 * len(ordered)))
+
+        return ordered[rank - 1]
+
+    @staticmethod
+    def format_report(report):
+        """One line summary of a :meth:`crawl` *report*.
+
+        """
+        return ('{pages} pages in {seconds:.2f}s ({pages_per_sec:.1f} pages/s) '
+                'latency p50 {p50:.3f}s|p95 {p95:.3f}s|p99 {p99:.3f}s '
+                'failures {failures}|errors {errors}'.format(**report))
@@ -0,0 +1,215 @@
+""":class:`trols_stats.interface.CrawlCheckpoint`
+
+"""
+import os
+import json
+import time
+import threading
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+
+__all__ = ['CrawlCheckpoint']
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+# Task states.
+QUEUED = 'queued'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+
+
+class CrawlCheckpoint(object):
+    """Progress of a :class:`trols_stats.interface.Crawler` crawl.
+
+    Each crawl task is keyed by its request URL and holds its state and
+    the arguments needed to run it again::
+
+        {
+            'http://www.trols.org.au/nejta/match_popup.php?matchid=AA039054&seasonid=': {
+                'task': 'popup',
+                'args': ['nejta', 'nejta_saturday_am_autumn_2015', 'AA039054'],
+                'state': 'done',
+            },
+        }
+
+    A task is ``done`` only once the tasks that it discovered have been
+    added.  A resumed crawl runs the ``queued`` and ``in_flight`` tasks
+    again and skips the ``done`` tasks.
+
+    .. attribute:: cache_dir
+        directory that holds the match popup cache and the checkpoint
+
+    .. attribute:: interval
+        minimum seconds between the periodic writes of :meth:`flush`
+
+    .. attribute:: path
+        checkpoint file path
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def interval(self):
+        return self.__interval
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, CHECKPOINT_FILE)
+
+    def __init__(self, cache_dir, interval=30.0):
+        self.__cache_dir = cache_dir
+        self.__interval = interval
+        self.__tasks = {}
+        self.__dirty = False
+        self.__saved = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__tasks)
+
+    def load(self):
+        """Read the checkpoint from :attr:`path`.  A missing checkpoint
+        is empty.
+
+        """
+        tasks = {}
+        if os.path.exists(self.path):
+            with open(self.path) as _fh:
+                tasks = json.load(_fh)
+
+        with self.__lock:
+            self.__tasks = tasks
+            self.__dirty = False
+
+        logging.info('Crawl checkpoint "%s" tasks: %d', self.path, len(tasks))
+
+    def save(self):
+        """Write the checkpoint to :attr:`path` if it has changed.  The
+        checkpoint is replaced atomically.
+
+        """
+        with self.__lock:
+            self.__saved = time.monotonic()
+            if not self.__dirty:
+                return
+            content = json.dumps(self.__tasks, indent=1, sort_keys=True)
+            self.__dirty = False
+
+        create_dir(self.cache_dir)
+        AtomicWriter().write(self.path, content)
+
+        logging.debug('Crawl checkpoint written to "%s"', self.path)
+
+    def flush(self):
+        """:meth:`save` if :attr:`interval` seconds have passed since the
+        last write.
+
+        """
+        with self.__lock:
+            due = time.monotonic() - self.__saved >= self.interval
+
+        if due:
+            self.save()
+
+    def reset(self):
+        """Drop all tasks and remove the checkpoint file.  Called once a
+        crawl is complete.
+
+        """
+        with self.__lock:
+            self.__tasks = {}
+            self.__dirty = False
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def add(self, key, task, args):
+        """Queue the *task* identified by *key*.  A known *key* keeps its
+        current state.
+
+        **Args:**
+            *key*: request URL of the task
+
+            *task*: task type.  For example, ``popup``
+
+            *args*: list of arguments that run the task
+
+        """
+        with self.__lock:
+            if key not in self.__tasks:
+                self.__tasks[key] = {
+                    'task': task,
+                    'args': list(args),
+                    'state': QUEUED,
+                }
+                self.__dirty = True
+
+    def start(self, key):
+        """Mark the *key* task as in flight.
+
+        """
+        self.__set_state(key, IN_FLIGHT)
+
+    def finish(self, key):
+        """Mark the *key* task as done.
+
+        """
+        self.__set_state(key, DONE)
+
+    def retry(self, key):
+        """Return the *key* task to the queue.  For example, after a
+        failed request.
+
+        """
+        self.__set_state(key, QUEUED)
+
+    def __set_state(self, key, state):
+        with self.__lock:
+            entry = self.__tasks.get(key)
+            if entry is not None and entry['state'] != state:
+                entry['state'] = state
+                self.__dirty = True
+
+    def tasks(self, task=None, pending=None):
+        """Filter the checkpoint tasks.
+
+        **Kwargs:**
+            *task*: limit to the one task type
+
+            *pending*: ``True`` limits to the tasks that are not done.
+            ``False`` limits to the done tasks
+
+        **Returns:**
+            list of ``(key, task, args)`` tuples in key order
+
+        """
+        with self.__lock:
+            entries = sorted(self.__tasks.items())
+
+        tasks = []
+        for key, entry in entries:
+            if task is not None and entry['task'] != task:
+                continue
+            if pending is not None and pending == (entry['state'] == DONE):
+                continue
+            tasks.append((key, entry['task'], list(entry['args'])))
+
+        return tasks
+
+    def counts(self):
+        """Number of tasks in each state.
+
+        **Returns:**
+            dictionary of ``queued``, ``in_flight`` and ``done`` counts
+
+        """
+        counts = {QUEUED: 0, IN_FLIGHT: 0, DONE: 0}
+        with self.__lock:
+            for entry in self.__tasks.values():
+                counts[entry['state']] += 1
+
+        return counts
@@ -0,0 +1,390 @@
+""":class:`trols_stats.interface.ConnectionPool`
+
+"""
+import io
+import ssl
+import base64
+import time
+import threading
+import logging
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+
+__all__ = ['ConnectionPool']
+
+# Redirect status codes that are followed.  The first three switch a
+# POST to a GET as per urllib.request.
+REDIRECT_TO_GET = (301, 302, 303)
+REDIRECT_KEEP_METHOD = (307, 308)
+
+# Same limit as urllib.request.HTTPRedirectHandler.
+MAX_REDIRECTS = 10
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class ConnectionPool(object):
+    """Thread safe pool of persistent HTTP/1.1 connections.
+
+    Idle connections are held per ``(scheme, host, port)`` and reused by
+    later requests to the same host.  This saves a TCP and TLS handshake
+    per request.  A reused connection that the server has since closed
+    is transparently replaced.
+
+    The ``http_proxy``, ``https_proxy`` and ``no_proxy`` environment
+    settings are honoured as they are by :func:`urllib.request.urlopen`.
+    HTTP requests are forwarded through the proxy and HTTPS requests are
+    tunnelled through it with ``CONNECT``.
+
+    .. attribute:: size
+        maximum number of idle connections held per host
+
+    .. attribute:: idle_timeout
+        seconds that an idle connection is held before it is closed
+
+    .. attribute:: timeout
+        socket timeout in seconds of each connection
+
+    .. attribute:: connections_opened
+        number of connections opened over the life of the pool
+
+    """
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def idle_timeout(self):
+        return self.__idle_timeout
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @property
+    def connections_opened(self):
+        return self.__connections_opened
+
+    def __init__(self, size=4, idle_timeout=30.0, timeout=60.0):
+        self.__size = size
+        self.__idle_timeout = idle_timeout
+        self.__timeout = timeout
+        self.__connections_opened = 0
+
+        self.__lock = threading.Lock()
+        self.__idle = {}
+        self.__ssl_context = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close all idle connections.
+
+        """
+        with self.__lock:
+            idle = self.__idle
+            self.__idle = {}
+
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+    def request(self, method, url, body=None, headers=None):
+        """Send a HTTP request to *url* and read the whole response.
+
+        **Args:**
+            *method*: HTTP method.  For example, ``POST``
+
+            *url*: the web address to send request
+
+        **Kwargs:**
+            *body*: request payload bytes
+
+            *headers*: dictionary of request headers
+
+        **Returns:**
+            the response body bytes
+
+        **Raises:**
+            :class:`urllib.error.HTTPError` on a HTTP error status
+
+        """
+        return self.fetch(method, url, body=body, headers=headers)[2]
+
+    def fetch(self, method, url, body=None, headers=None):
+        """Version of :meth:`request` that also returns the response
+        status and headers.  Use this for conditional requests as a
+        ``304 Not Modified`` status is not an error.
+
+        **Returns:**
+            tuple of the response status, the
+            :class:`http.client.HTTPMessage` headers and the body bytes
+
+        """
+        key, connection, response = self.__open(method, url, body, headers)
+        try:
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        self.__finish(key, connection, response)
+
+        return response.status, response.headers, data
+
+    def stream(self, method, url, body=None, headers=None, chunk_size=8192):
+        """Streaming version of :meth:`request`.
+
+        The connection is returned to the pool once the response has
+        been read in full.  A partly read response closes the
+        connection.
+
+        **Returns:**
+            generator of response body bytes chunks
+
+        """
+        key, connection, response = self.__open(method, url, body, headers)
+
+        complete = False
+        try:
+            for chunk in iter(lambda: response.read(chunk_size), b''):
+                yield chunk
+            complete = True
+        finally:
+            if complete:
+                self.__finish(key, connection, response)
+            else:
+                connection.close()
+
+    def __open(self, method, url, body, headers):
+        """Send the request and follow any redirects.
+
+        **Returns:**
+            tuple of the pool key, connection and
+            :class:`http.client.HTTPResponse` with the body unread
+
+        """
+        headers = dict(headers or {})
+
+        for _ in range(MAX_REDIRECTS + 1):
+            components = urllib.parse.urlsplit(url)
+            scheme = components.scheme.lower()
+            port = components.port or DEFAULT_PORTS.get(scheme)
+            proxy = ConnectionPool.proxy(scheme, components.hostname)
+            key = (scheme, components.hostname, port, proxy)
+
+            path = components.path or '/'
+            if components.query:
+                path = '{}?{}'.format(path, components.query)
+
+            send_headers = headers
+            if proxy is not None and scheme == 'http':
+                # A forward proxy takes the absolute URL.
+                path = urllib.parse.urlunsplit((scheme,
+                                                components.netloc,
+                                                path,
+                                                '',
+                                                ''))
+                send_headers = dict(headers)
+                send_headers.update(ConnectionPool.proxy_headers(proxy))
+
+            connection, response = self.__send(key,
+                                                method,
+                                                path,
+                                                body,
+                                                send_headers)
+
+            location = response.getheader('Location')
+            redirect = (REDIRECT_TO_GET + REDIRECT_KEEP_METHOD)
+            if response.status in redirect and location is not None:
+                response.read()
+                self.__finish(key, connection, response)
+
+                url = urllib.parse.urljoin(url, location)
+                logging.debug('HTTP %d redirect to "%s"', response.status, url)
+                if response.status in REDIRECT_TO_GET and method != 'HEAD':
+                    method = 'GET'
+                    body = None
+                    headers.pop('Content-Type', None)
+                continue
+
+            if response.status >= 400:
+                data = response.read()
+                self.__finish(key, connection, response)
+                raise urllib.error.HTTPError(url,
+                                             response.status,
+                                             response.reason,
+                                             response.headers,
+                                             io.BytesIO(data))
+
+            return key, connection, response
+
+        raise urllib.error.HTTPError(url,
+                                     response.status,
+                                     'Too many redirects',
+                                     response.headers,
+                                     None)
+
+    def __send(self, key, method, path, body, headers):
+        """Send the request over a pooled connection.  A failure on a
+        reused connection is retried once over a new connection as the
+        server may have closed the idle connection.
+
+        """
+        connection, reused = self.__acquire(key)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+        except (http.client.HTTPException, ConnectionError) as err:
+            connection.close()
+            if not reused:
+                raise
+
+            logging.debug('Stale pooled connection to %s: %s', key, err)
+            connection = self.__connect(key)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+
+        return connection, response
+
+    def __acquire(self, key):
+        """Take the most recently used idle connection for *key*.
+
+        **Returns:**
+            tuple of the connection and a flag that is ``True`` if the
+            connection was reused
+
+        """
+        now = time.monotonic()
+        expired = []
+        connection = None
+
+        with self.__lock:
+            connections = self.__idle.get(key, [])
+
+            # Connections are held oldest first.
+            while connections and now - connections[0][1] > self.idle_timeout:
+                expired.append(connections.pop(0)[0])
+
+            if connections:
+                connection = connections.pop()[0]
+
+        for stale in expired:
+            stale.close()
+
+        if connection is not None:
+            return connection, True
+
+        return self.__connect(key), False
+
+    def __release(self, key, connection):
+        """Return *connection* to the idle pool of *key*.
+
+        """
+        with self.__lock:
+            connections = self.__idle.setdefault(key, [])
+            if len(connections) < self.size:
+                connections.append((connection, time.monotonic()))
+                connection = None
+
+        if connection is not None:
+            connection.close()
+
+    def __finish(self, key, connection, response):
+        """Pool or close *connection* once *response* is read.
+
+        """
+        if response.will_close:
+            connection.close()
+        else:
+            self.__release(key, connection)
+
+    def __connect(self, key):
+        """Open a new connection to *key*.
+
+        """
+        scheme, host, port, proxy = key
+        logging.debug('Opening HTTP connection to %s://%s:%s (proxy %s)',
+                      scheme, host, port, proxy)
+
+        if scheme not in DEFAULT_PORTS:
+            raise ValueError('Unsupported URL scheme "{}"'.format(scheme))
+
+        connect_host, connect_port = host, port
+        if proxy is not None:
+            components = urllib.parse.urlsplit(proxy)
+            connect_host = components.hostname
+            connect_port = components.port or DEFAULT_PORTS.get('http')
+
+        if scheme == 'https':
+            if self.__ssl_context is None:
+                self.__ssl_context = ssl.create_default_context()
+            connection = http.client.HTTPSConnection(connect_host,
+                                                     connect_port,
+                                                     timeout=self.timeout,
+                                                     context=self.__ssl_context)
+            if proxy is not None:
+                connection.set_tunnel(host,
+                                      port,
+                                      headers=ConnectionPool.proxy_headers(proxy))
+        else:
+            connection = http.client.HTTPConnection(connect_host,
+                                                    connect_port,
+                                                    timeout=self.timeout)
+
+        with self.__lock:
+            self.__connections_opened += 1
+
+        return connection
+
+    @staticmethod
+    def proxy(scheme, host):
+        """Proxy of the *scheme* requests to *host* from the environment
+        settings, as used by :func:`urllib.request.urlopen`.
+
+        **Returns:**
+            the proxy URL.  For example, ``http://proxy:3128``.  ``None``
+            if there is no proxy or *host* bypasses it
+
+        """
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+
+        if '://' not in proxy:
+            proxy = 'http://{}'.format(proxy)
+
+        return proxy
+
+    @staticmethod
+    def proxy_headers(proxy):
+        """``Proxy-Authorization`` header of the credentials in the
+        *proxy* URL.
+
+        **Returns:**
+            dictionary of headers.  Empty if *proxy* has no credentials
+
+        """
+        components = urllib.parse.urlsplit(proxy)
+        if components.username is None:
+            return {}
+
+        credentials = '{}:{}'.format(urllib.parse.unquote(components.username),
+                                     urllib.parse.unquote(components.password or ''))
+        token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+
+        return {'Proxy-Authorization': 'Basic {}'.format(token)}
+
@@ -0,0 +1,566 @@
+""":class:`trols_stats.interface.Crawler`
+
+"""
+import os
+import time
+import asyncio
+import functools
+import logging
+import urllib.parse
+import concurrent.futures
+
+import trols_stats
+import trols_stats.interface
+
+__all__ = ['Crawler']
+
+RESULTS_URL = 'https://trols.org.au/{}/results.php'
+POPUP_URL = 'http://www.trols.org.au/{}/match_popup.php'
+
+
+class Crawler(object):
+    """Concurrent TROLS crawler.
+
+    Discovery of the competition sections and their match IDs is
+    pipelined with the match popup fetches.  Each match popup fetch is
+    scheduled as soon as its match ID is received from the streamed
+    section results page.  Blocking :class:`trols_stats.interface.Loader`
+    requests run in a thread pool under a global and a per-host limit.
+    Match popups are written to the same cache layout as
+    :meth:`trols_stats.interface.Loader.request`.
+
+    .. attribute:: cache_dir
+        directory to write the match popup HTML
+
+    .. attribute:: force_cache
+        overwrite match popups that are already in the cache.  With a
+        :attr:`manifest`, match popups that are not finalised are fetched
+        again without revalidation
+
+    .. attribute:: manifest
+        :class:`trols_stats.interface.CrawlManifest` of the
+        :attr:`cache_dir`.  Skips finalised matches and revalidates the
+        other cached match popups
+
+    .. attribute:: pack
+        open :class:`trols_stats.PackCache` that holds the match popups
+        in place of the :attr:`cache_dir` HTML files
+
+    .. attribute:: layout
+        :class:`trols_stats.CacheLayout` of the :attr:`cache_dir`.  New
+        match popups are written to the sharded layout
+
+    .. attribute:: discovery
+        :class:`trols_stats.interface.DiscoveryState` of the
+        :attr:`cache_dir`.  Match IDs that were seen by the last crawl
+        are not queued again once their match popup is settled in the
+        cache
+
+    .. attribute:: checkpoint
+        :class:`trols_stats.interface.CrawlCheckpoint` that records the
+        crawl progress so that an interrupted crawl can be resumed
+
+    .. attribute:: concurrency
+        maximum number of requests in flight across all hosts
+
+    .. attribute:: per_host
+        maximum number of requests in flight to the one host
+
+    .. attribute:: results_url
+        TROLS results page URL template that takes the league
+
+    .. attribute:: popup_url
+        TROLS match popup URL template that takes the league
+
+    .. attribute:: match_ids
+        set of the match IDs discovered
+
+    .. attribute:: fetched
+        number of match popups fetched or found in the cache
+
+    .. attribute:: skipped
+        number of unchanged match popups that were not queued
+
+    .. attribute:: diff
+        dictionary of competition tokens and their ``added``,
+        ``unchanged`` and ``vanished`` match ID counts against the
+        :attr:`discovery` state
+
+    .. attribute:: failures
+        list of ``(uri, exception)`` tuples of the failed requests
+
+    .. attribute:: latencies
+        list of the seconds taken by each request once it was given a
+        request slot.  Includes the rate limiter waits and the retries
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def force_cache(self):
+        return self.__force_cache
+
+    @property
+    def manifest(self):
+        return self.__manifest
+
+    @property
+    def pack(self):
+        return self.__pack
+
+    @property
+    def layout(self):
+        return self.__layout
+
+    @property
+    def discovery(self):
+        return self.__discovery
+
+    @property
+    def checkpoint(self):
+        return self.__checkpoint
+
+    @property
+    def concurrency(self):
+        return self.__concurrency
+
+    @property
+    def per_host(self):
+        return self.__per_host
+
+    @property
+    def results_url(self):
+        return self.__results_url
+
+    @property
+    def popup_url(self):
+        return self.__popup_url
+
+    @property
+    def match_ids(self):
+        return self.__match_ids
+
+    @property
+    def fetched(self):
+        return self.__fetched
+
+    @property
+    def skipped(self):
+        return self.__skipped
+
+    @property
+    def diff(self):
+        return self.__diff
+
+    @property
+    def failures(self):
+        return self.__failures
+
+    @property
+    def latencies(self):
+        return self.__latencies
+
+    def __init__(self,
+                 cache_dir,
+                 force_cache=False,
+                 manifest=None,
+                 pack=None,
+                 layout=None,
+                 discovery=None,
+                 checkpoint=None,
+                 concurrency=8,
+                 per_host=4,
+                 results_url=RESULTS_URL,
+                 popup_url=POPUP_URL):
+        self.__cache_dir = cache_dir
+        self.__force_cache = force_cache
+        self.__manifest = manifest
+        self.__pack = pack
+        self.__layout = layout
+        self.__discovery = discovery
+        self.__checkpoint = checkpoint
+        self.__concurrency = max(1, concurrency)
+        self.__per_host = max(1, min(per_host, self.__concurrency))
+        self.__results_url = results_url
+        self.__popup_url = popup_url
+
+        self.__match_ids = set()
+        self.__fetched = 0
+        self.__skipped = 0
+        self.__diff = {}
+        self.__failures = []
+        self.__latencies = []
+
+        self.__loop = None
+        self.__executor = None
+        self.__global_limit = None
+        self.__host_limits = {}
+        self.__tasks = set()
+        self.__errors = []
+
+    def crawl(self, trols_urls, resume=False):
+        """Crawl the TROLS leagues defined by *trols_urls*.
+
+        **Args:**
+            *trols_urls*: dictionary of league names and their comma
+            separated competition option values as per
+            :attr:`trols_stats.Config.trols_urls`.  For example::
+
+                {'nejta': 'AA', 'dvta': 'TN,HN'}
+
+        **Kwargs:**
+            *resume*: continue the pending tasks of the :attr:`checkpoint`
+            instead of starting from *trols_urls*.  An empty checkpoint
+            starts a new crawl
+
+        **Returns:**
+            the number of match popups fetched
+
+        """
+        return asyncio.run(self.crawl_async(trols_urls, resume=resume))
+
+    async def crawl_async(self, trols_urls, resume=False):
+        """Coroutine version of :meth:`crawl`.
+
+        """
+        self.__loop = asyncio.get_running_loop()
+        self.__global_limit = asyncio.Semaphore(self.concurrency)
+        self.__host_limits = {}
+
+        executor_kwargs = {
+            'max_workers': self.concurrency,
+            'thread_name_prefix': 'trols-crawler',
+        }
+        with concurrent.futures.ThreadPoolExecutor(**executor_kwargs) as executor:
+            self.__executor = executor
+
+            try:
+                if not self.__resume(resume):
+                    for league, option_values in trols_urls.items():
+                        for option_value in option_values.split(','):
+                            self.__schedule('competition', league, option_value)
+
+                # Tasks spawn further tasks as they discover more content.
+                while self.__tasks:
+                    await asyncio.wait(list(self.__tasks))
+            finally:
+                self.__close_checkpoint()
+
+        self.__executor = None
+
+        if self.__errors:
+            raise self.__errors[0]
+
+        for comp_token, counts in sorted(self.diff.items()):
+            logging.info('Discovery "%s": %d added, %d unchanged, %d vanished',
+                         comp_token,
+                         counts['added'],
+                         counts['unchanged'],
+                         counts['vanished'])
+
+        logging.info('Crawl complete: %d match popups, %d skipped '
+                     '(%d failed requests)',
+                     self.fetched, self.skipped, len(self.failures))
+
+        return self.fetched
+
+    def __resume(self, resume):
+        """Schedule the pending tasks of the :attr:`checkpoint`.
+
+        **Returns:**
+            boolean ``True`` if the crawl was resumed
+
+        """
+        if self.checkpoint is None:
+            return False
+
+        if not resume:
+            self.checkpoint.reset()
+            return False
+
+        self.checkpoint.load()
+        if not len(self.checkpoint):
+            return False
+
+        # Match popups already in the checkpoint are not queued again
+        # by a section that is crawled again.
+        for _, _, (_, _, match_id) in self.checkpoint.tasks(task='popup'):
+            self.__match_ids.add(match_id)
+
+        pending = self.checkpoint.tasks(pending=True)
+        logging.info('Resuming crawl: %d of %d tasks pending',
+                     len(pending), len(self.checkpoint))
+        for _, task, args in pending:
+            self.__schedule(task, *args)
+
+        return True
+
+    def __close_checkpoint(self):
+        """Remove the :attr:`checkpoint` of a complete crawl.  An
+        incomplete crawl keeps its checkpoint for a resume.
+
+        """
+        if self.checkpoint is None:
+            return
+
+        if not self.__tasks and not self.__errors and not self.failures:
+            self.checkpoint.reset()
+        else:
+            logging.info('Crawl checkpoint tasks: %s', self.checkpoint.counts())
+            self.checkpoint.save()
+
+    def __schedule(self, task, *args):
+        """Queue a ``competition``, ``section`` or ``popup`` *task* in
+        the :attr:`checkpoint` and spawn it.
+
+        """
+        key = self.__task_key(task, *args)
+        if self.checkpoint is not None:
+            self.checkpoint.add(key, task, args)
+
+        self.__spawn(self.__run_task(key, task, args))
+
+    async def __run_task(self, key, task, args):
+        """Run the *task* coroutine and record its outcome in the
+        :attr:`checkpoint`.
+
+        """
+        coroutine = {
+            'competition': self.__crawl_competition,
+            'section': self.__crawl_section,
+            'popup': self.__fetch_popup,
+        }[task](*args)
+
+        if self.checkpoint is None:
+            await coroutine
+            return
+
+        self.checkpoint.start(key)
+        if await coroutine:
+            self.checkpoint.finish(key)
+        else:
+            self.checkpoint.retry(key)
+        self.checkpoint.flush()
+
+    def __task_key(self, task, *args):
+        """Request URL that identifies the *task*.
+
+        """
+        if task == 'competition':
+            league, option_value = args
+            query_args = {'daytime': option_value}
+            url = self.results_url.format(league)
+        elif task == 'section':
+            league, option_value, _, code = args
+            query_args = self.__section_args(option_value, code)
+            url = self.results_url.format(league)
+        else:
+            league, _, match_id = args
+            query_args = self.__popup_args(match_id)
+            url = self.popup_url.format(league)
+
+        return '{}?{}'.format(url, urllib.parse.urlencode(query_args))
+
+    @staticmethod
+    def __section_args(option_value, code):
+        return {
+            'which': 1,
+            'style': '',
+            'daytime': option_value,
+            'section': code,
+        }
+
+    @staticmethod
+    def __popup_args(match_id):
+        return {
+            'matchid': match_id,
+            'seasonid': str(),
+        }
+
+    def __spawn(self, coroutine):
+        task = self.__loop.create_task(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__task_done)
+
+    def __task_done(self, task):
+        self.__tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.__errors.append(task.exception())
+
+    async def __run(self, target, func, *args, **kwargs):
+        """Run the blocking *func* in the thread pool once a global and
+        a per-host request slot for the *target* URI is available.
+
+        **Returns:**
+            the *func* return value or ``None`` if *func* raised
+
+        """
+        host = urllib.parse.urlparse(target).netloc
+        host_limit = self.__host_limits.get(host)
+        if host_limit is None:
+            host_limit = asyncio.Semaphore(self.per_host)
+            self.__host_limits[host] = host_limit
+
+        result = None
+        async with host_limit, self.__global_limit:
+            call = functools.partial(func, *args, **kwargs)
+            start = time.monotonic()
+            try:
+                result = await self.__loop.run_in_executor(self.__executor,
+                                                           call)
+            except Exception as err:
+                logging.error('Crawler request "%s" failed: %s', target, err)
+                self.__failures.append((target, err))
+            self.__latencies.append(time.monotonic() - start)
+
+        return result
+
+    async def __crawl_competition(self, league, option_value):
+        """Fetch the *league* competition results page and schedule a
+        crawl of each section.
+
+        **Returns:**
+            boolean ``True`` if the results page was fetched
+
+        """
+        # NEJTA does not take a "daytime" query parameter.
+        daytime = option_value
+        if league.lower() == 'nejta':
+            daytime = str()
+
+        uri = self.results_url.format(league)
+        comps_html = await self.__run(uri,
+                                      trols_stats.interface.Loader.request,
+                                      uri,
+                                      {'daytime': daytime})
+        if comps_html is None:
+            return False
+
+        kwargs = {
+            'html': comps_html,
+            'tokenise': True,
+            'league': league,
+            'option_value': option_value,
+        }
+        comp_name = trols_stats.Scraper.scrape_competition_name(**kwargs)
+
+        # Each competition is made of sections.  For example, "BOYS 21".
+        # Each section is identified by a code.
+        codes = [code for _, code
+                 in trols_stats.Scraper.iter_competition_ids(comps_html)]
+
+        if not codes:
+            # A truncated or error page would otherwise vanish every
+            # stored section, so keep the previous discovery state.
+            logging.warning('No sections found for competition "%s": '
+                            'keeping the previous section state', comp_name)
+        elif self.discovery is not None:
+            vanished = self.discovery.update_sections(comp_name, codes)
+            self.__add_diff(comp_name, vanished=len(vanished))
+
+        for code in codes:
+            self.__schedule('section', league, option_value, comp_name, code)
+
+        return True
+
+    async def __crawl_section(self, league, option_value, comp_name, code):
+        """Stream the section results page and schedule a fetch of
+        each match popup as its match ID is received.
+
+        **Returns:**
+            boolean ``True`` if the section results page was fetched
+
+        """
+        query_args = self.__section_args(option_value, code)
+
+        previous = set()
+        if self.discovery is not None:
+            previous = self.discovery.match_ids(comp_name, code)
+
+        def on_match_id(match_id):
+            if match_id in self.__match_ids:
+                return
+            self.__match_ids.add(match_id)
+
+            if match_id in previous and self.__is_settled(comp_name, match_id):
+                self.__skipped += 1
+                return
+
+            self.__schedule('popup', league, comp_name, match_id)
+
+        def discover(uri):
+            match_ids = []
+            stream = trols_stats.interface.Loader.request_stream(uri, query_args)
+            for match_id in trols_stats.Scraper.iter_match_ids(stream):
+                match_ids.append(match_id)
+                self.__loop.call_soon_threadsafe(on_match_id, match_id)
+
+            return match_ids
+
+        uri = self.results_url.format(league)
+        match_ids = await self.__run(uri, discover, uri)
+
+        # A failed section keeps its last known match IDs.
+        if match_ids is not None and self.discovery is not None:
+            diff = self.discovery.update_section(comp_name, code, match_ids)
+            self.__add_diff(comp_name, **{k: len(v) for k, v in diff.items()})
+
+        return match_ids is not None
+
+    def __is_settled(self, comp_name, match_id):
+        """Check if the cached *match_id* match popup does not need to be
+        fetched again.  With a :attr:`manifest` only finalised matches
+        are settled.
+
+        """
+        file_name = '{}--{}.html'.format(comp_name, match_id)
+        if self.pack is not None:
+            cached = file_name in self.pack
+        elif self.layout is not None:
+            cached = os.path.exists(self.layout.locate(comp_name, match_id))
+        else:
+            cached = os.path.exists(os.path.join(self.cache_dir, file_name))
+
+        if not cached:
+            return False
+
+        if self.manifest is not None:
+            return self.manifest.is_finalised(match_id)
+
+        return not self.force_cache
+
+    def __add_diff(self, comp_name, added=0, unchanged=0, vanished=0):
+        counts = self.__diff.setdefault(comp_name, {'added': 0,
+                                                    'unchanged': 0,
+                                                    'vanished': 0})
+        counts['added'] += added
+        counts['unchanged'] += unchanged
+        counts['vanished'] += vanished
+
+    async def __fetch_popup(self, league, comp_name, match_id):
+        """Fetch the *match_id* match popup into the cache.
+
+        **Returns:**
+            boolean ``True`` if the match popup was fetched
+
+        """
+        uri = self.__task_key('popup', league, comp_name, match_id)
+        request_kwargs = {
+            'uri': uri,
+            'cache_dir': self.cache_dir,
+            'force_cache': self.force_cache,
+            'comp_token': comp_name,
+            'match_id': match_id,
+            'manifest': self.manifest,
+            'pack': self.pack,
+            'layout': self.layout,
+        }
+        html = await self.__run(uri,
+                                trols_stats.interface.Loader.request,
+                                **request_kwargs)
+        if html is not None:
+            self.__fetched += 1
+
+        return html is not None
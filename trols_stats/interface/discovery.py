@@ -0,0 +1,180 @@
+""":class:`trols_stats.interface.DiscoveryState`
+
+"""
+import os
+import json
+import threading
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+
+__all__ = ['DiscoveryState']
+
+DISCOVERY_FILE = 'discovery.json'
+
+
+class DiscoveryState(object):
+    """Section codes and match IDs seen by the last crawl of each
+    competition.
+
+    The state is keyed by competition token, then section code::
+
+        {
+            'nejta_saturday_am_autumn_2015': {
+                'AA039': ['AA039011', 'AA039013', 'AA039014'],
+            },
+        }
+
+    A crawl compares the match IDs that it discovers against the state
+    to tell which matches were added, which are unchanged and which have
+    vanished.
+
+    .. attribute:: cache_dir
+        directory that holds the match popup cache and the state
+
+    .. attribute:: path
+        state file path
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, DISCOVERY_FILE)
+
+    def __init__(self, cache_dir):
+        self.__cache_dir = cache_dir
+        self.__competitions = {}
+        self.__dirty = False
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+    def load(self):
+        """Read the state from :attr:`path`.  A missing state is empty.
+
+        """
+        competitions = {}
+        if os.path.exists(self.path):
+            with open(self.path) as _fh:
+                competitions = json.load(_fh)
+
+        with self.__lock:
+            self.__competitions = competitions
+            self.__dirty = False
+
+        logging.info('Discovery state "%s" competitions: %d',
+                     self.path, len(competitions))
+
+    def save(self):
+        """Write the state to :attr:`path` if it has changed.  The state
+        is replaced atomically.
+
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            content = json.dumps(self.__competitions, indent=1, sort_keys=True)
+            self.__dirty = False
+
+        create_dir(self.cache_dir)
+        AtomicWriter().write(self.path, content)
+
+        logging.info('Discovery state written to "%s"', self.path)
+
+    def sections(self, comp_token):
+        """Section codes of *comp_token* seen by the last crawl.
+
+        **Returns:**
+            sorted list of section codes
+
+        """
+        with self.__lock:
+            return sorted(self.__competitions.get(comp_token, {}))
+
+    def match_ids(self, comp_token, section=None):
+        """Match IDs of *comp_token* seen by the last crawl.
+
+        **Kwargs:**
+            *section*: limit the match IDs to the one section code
+
+        **Returns:**
+            set of match IDs
+
+        """
+        with self.__lock:
+            sections = self.__competitions.get(comp_token, {})
+            if section is not None:
+                return set(sections.get(section, []))
+
+            match_ids = set()
+            for section_ids in sections.values():
+                match_ids.update(section_ids)
+
+        return match_ids
+
+    def update_sections(self, comp_token, sections):
+        """Replace the section codes of *comp_token* with *sections*.
+        Match IDs of the sections that are no longer listed are dropped.
+
+        **Args:**
+            *comp_token*: competition token.  For example,
+            ``nejta_saturday_am_autumn_2015``
+
+            *sections*: iterable of the current section codes
+
+        **Returns:**
+            sorted list of the match IDs of the vanished sections
+
+        """
+        sections = set(sections)
+
+        vanished = set()
+        with self.__lock:
+            current = self.__competitions.setdefault(comp_token, {})
+            for section in list(current):
+                if section not in sections:
+                    vanished.update(current.pop(section))
+                    self.__dirty = True
+
+        return sorted(vanished)
+
+    def update_section(self, comp_token, section, match_ids):
+        """Replace the match IDs of the *comp_token* *section* with
+        *match_ids* and report the difference.
+
+        **Args:**
+            *comp_token*: competition token.  For example,
+            ``nejta_saturday_am_autumn_2015``
+
+            *section*: section code.  For example, ``AA039``
+
+            *match_ids*: iterable of the current section match IDs
+
+        **Returns:**
+            dictionary of sorted ``added``, ``unchanged`` and
+            ``vanished`` match ID lists
+
+        """
+        match_ids = set(match_ids)
+
+        with self.__lock:
+            sections = self.__competitions.setdefault(comp_token, {})
+            previous = set(sections.get(section, []))
+            if section not in sections or previous != match_ids:
+                sections[section] = sorted(match_ids)
+                self.__dirty = True
+
+        return {
+            'added': sorted(match_ids - previous),
+            'unchanged': sorted(match_ids & previous),
+            'vanished': sorted(previous - match_ids),
+        }
@@ -3,23 +3,93 @@
 """
 import re
 import os
+import sys
+import ssl
+import time
+import socket
 import urllib
-import urllib.request
-import tempfile
+import urllib.error
+import urllib.parse
+import http.client
 import logging
-from filer.files import copy_file
+from filer.files import create_dir
 
 import trols_stats
 import trols_stats.interface
+from trols_stats.interface.connectionpool import ConnectionPool
+from trols_stats.interface.ratelimiter import RateLimiter
+from trols_stats.interface.retrybudget import RetryBudget
 
 __all__ = ['Loader']
 
+# Read size of a streamed response.
+CHUNK_SIZE = 8192
+
+# TROLS takes the request arguments as a form POST.  The User-Agent is
+# the same as that sent by urllib.request.
+POST_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'User-Agent': 'Python-urllib/{}.{}'.format(*sys.version_info[:2]),
+}
+
+# HTTP error status codes that are worth a retry.  Other 4xx codes will
+# fail again.
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Network errors that are worth a retry.  Other errors such as a refused
+# connection, a failed certificate check or a local file error will fail
+# again.
+RETRY_ERRORS = (
+    TimeoutError,
+    socket.timeout,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+    http.client.RemoteDisconnected,
+    http.client.IncompleteRead,
+)
+
 
 class Loader(object):
     """
     .. attribute:: games
 
+    .. attribute:: interner
+        :class:`trols_stats.Interner` of all the matches loaded.  Pass
+        in an existing :class:`trols_stats.Interner` to share the
+        entities across loaders
+
+    .. attribute:: player_map
+        :attr:`trols_stats.Stats.player_map` shared by all the matches
+        loaded.  Each player has the one
+        :class:`trols_stats.model.entities.Player` object
+
+    .. attribute:: fixture_map
+        :attr:`trols_stats.Stats.fixture_map` shared by all the matches
+        loaded
+
+    .. attribute:: connection_pool
+        :class:`trols_stats.interface.ConnectionPool` shared by all
+        URL requests.  Replace to change the pool size or idle timeout
+
+    .. attribute:: rate_limiter
+        :class:`trols_stats.interface.RateLimiter` shared by all URL
+        requests
+
+    .. attribute:: retry_budget
+        :class:`trols_stats.interface.RetryBudget` of the URL requests
+        that fail with a transient error
+
+    .. attribute:: writer
+        :class:`trols_stats.AtomicWriter` of the cache files.  Replace
+        to flush the cache writes to disk
+
     """
+    connection_pool = ConnectionPool()
+    rate_limiter = RateLimiter()
+    retry_budget = RetryBudget()
+    writer = trols_stats.AtomicWriter()
+
     @property
     def competition_map(self):
         return self.__competition_map
@@ -37,57 +107,122 @@ class Loader(object):
     def games(self, value):
         self.__games = value
 
-    def __init__(self):
+    @property
+    def interner(self):
+        return self.__interner
+
+    @property
+    def player_map(self):
+        return self.interner.player_map
+
+    @property
+    def fixture_map(self):
+        return self.interner.fixture_map
+
+    def __init__(self, interner=None):
         self.__competition_map = {}
         self.__games = []
+        if interner is None:
+            interner = trols_stats.Interner()
+        self.__interner = interner
 
-    def build_game_map(self, html, source_file):
+    def build_game_map(self, html, source_file, fast=False):
         """Scrape *html* game page and build a game map.
 
         Produces a list of :class:`trols_stats.model.aggregates.Games`
         objects that are appended to the :attr:`games` attribute.
 
         **Args:**
-            *html*: string representation of the HTML page to process.
-            *html* is typically a TROLS match results page.
+            *html*: string representation or raw bytes of the HTML page
+            to process.  *html* is typically a TROLS match results page.
+
+        **Kwargs:**
+            *fast*: scrape with the :class:`trols_stats.FastParser`
+            (falls back to :mod:`lxml` on unrecognised pages)
+
+        """
+        match = trols_stats.Scraper.parse_match(html, fast=fast)
+        self.load_match(match, source_file)
+
+    def build_game_maps(self,
+                        items,
+                        executor='serial',
+                        workers=None,
+                        fast=False,
+                        chunksize=1):
+        """Batch version of :meth:`build_game_map`.
+
+        The pages are scraped with :meth:`trols_stats.Scraper.scrape_many`
+        and the games are appended to the :attr:`games` attribute in the
+        same order as *items*.
+
+        **Args:**
+            *items*: iterable of ``(source_file, html)`` pairs
+
+        **Kwargs:**
+            *executor*, *workers*, *fast* and *chunksize* are passed
+            through to :meth:`trols_stats.Scraper.scrape_many`
+
+        **Returns:**
+            the number of match pages loaded
 
         """
-        # Get the competition token.
-        comp_token = source_file.split('--')[0]
-        logging.debug('Competition token "%s" parsed from filename: "%s"', source_file, comp_token)
+        kwargs = {
+            'executor': executor,
+            'workers': workers,
+            'fast': fast,
+            'chunksize': chunksize,
+        }
+
+        count = 0
+        for source_file, match in trols_stats.Scraper.scrape_many(items,
+                                                                  **kwargs):
+            self.load_match(match, source_file)
+            count += 1
+
+        return count
+
+    def load_match(self, match, source_file):
+        """Build a game map from the *match* structure produced by
+        :meth:`trols_stats.Scraper.parse_match`.
 
-        # Scrape match teams.
-        xpath = '//table/tr/td/b'
-        color_xpath = "//table/tr/td/b[contains(text(), '%s')]/span/text()"
-        teams = trols_stats.Scraper.scrape_match_teams(html,
-                                                       xpath,
-                                                       color_xpath)
+        Produces a list of :class:`trols_stats.model.aggregates.Games`
+        objects that are appended to the :attr:`games` attribute.  The
+        strings, players and fixtures of the games are those of the
+        :attr:`interner`.
+
+        **Args:**
+            *match*: dictionary of ``teams``, ``players``, ``preamble``
+            and ``scores`` scraped from a TROLS match results page
+
+            *source_file*: name of the source HTML file.  The competition
+            token is taken from the file name prefix
 
-        # Scrape player names.
-        players = trols_stats.Scraper.scrape_player_names(html)
+        """
+        match = self.interner.match(match)
 
-        # Scrape match preamble.
-        xpath = '//table/tr/td[contains(@class, "mb")]/text()'
-        preamble = trols_stats.Scraper.scrape_match_preamble(html, xpath)
+        # Get the competition token.
+        comp_token = self.interner.string(source_file.split('--')[0])
+        logging.debug('Competition token "%s" parsed from filename: "%s"', source_file, comp_token)
 
-        # Scrape match scores.
-        xpath = '//td/table/tr[contains(@valign, "top")]/td'
-        match_data = trols_stats.Scraper.scrape_match_scores(html, xpath)
+        teams = match.get('teams')
 
         # Augment the data structures.
         #
         # Fixture needs the teams.
-        fixture = preamble.copy()
+        fixture = match.get('preamble').copy()
         fixture.update(teams)
         fixture.update({'competition': comp_token})
         logging.debug('Fixture: %s', fixture)
 
         # Build the Game aggregate object.
-        stats = trols_stats.Stats(players=dict(players),
+        stats = trols_stats.Stats(players=dict(match.get('players')),
                                   teams=teams,
-                                  fixture=fixture)
-        stats.build_game_aggregate(match_data)
-        self.games.extend(stats.games_cache)
+                                  fixture=fixture,
+                                  player_map=self.player_map,
+                                  fixture_map=self.fixture_map)
+        stats.build_game_aggregate(match.get('scores'))
+        self.games.extend(self.interner.games(stats.games_cache))
 
     @staticmethod
     def request(uri,
@@ -95,7 +230,10 @@ class Loader(object):
                 cache_dir=None,
                 force_cache=False,
                 comp_token='match',
-                match_id=None):
+                match_id=None,
+                manifest=None,
+                pack=None,
+                layout=None):
         """Send a URL request to *uri*.  If *uri* is a file-type resource
         then an attempt will be made to open the file instead.
 
@@ -111,27 +249,76 @@ class Loader(object):
             locally
 
             *force_cache*: overwrite the file if it already exists in the
-            cache
+            cache.  With a *manifest*, the match popup is fetched with an
+            unconditional request in place of a revalidation
 
             *match_id*: identifier of the match.  For example:
 
                 ``TN024083``
 
+            *manifest*: :class:`trols_stats.interface.CrawlManifest` of
+            the *cache_dir*.  Cached match popups are revalidated with a
+            conditional request and finalised matches are not fetched
+            again, even with *force_cache*
+
+            *pack*: open :class:`trols_stats.PackCache` that holds the
+            cached match popups in place of the *cache_dir* HTML files
+
+            *layout*: :class:`trols_stats.CacheLayout` of the *cache_dir*.
+            New match popups are written to the sharded layout.  Match
+            popups in the flat layout are still read
+
         **Returns:**
-            HTML response string of the *uri*
+            HTML response bytes of the *uri*.  Character decoding is
+            left to the :class:`trols_stats.Scraper`
 
         """
         target_file = None
         if match_id is not None and cache_dir is not None:
-            target_file = os.path.join(cache_dir,
-                                       '{}--{}.html'.format(comp_token,
-                                                            match_id))
+            if layout is not None:
+                target_file = layout.locate(comp_token, match_id)
+            else:
+                target_file = os.path.join(cache_dir,
+                                           '{}--{}.html'.format(comp_token,
+                                                                match_id))
             logging.debug('HTML response cache filename: "%s"', target_file)
 
+        if target_file is not None and manifest is not None:
+            html = Loader._request_manifest(uri,
+                                            request_args,
+                                            target_file,
+                                            force_cache,
+                                            match_id,
+                                            manifest,
+                                            pack)
+        else:
+            html = Loader._request_cache(uri,
+                                         request_args,
+                                         target_file,
+                                         force_cache,
+                                         pack)
+
+        # Only register the section once the match popup is on disk, so
+        # that a failed request leaves no layout entry behind.
+        if (layout is not None
+                and pack is None
+                and target_file is not None
+                and target_file == layout.target_file(comp_token, match_id)):
+            layout.add(comp_token, match_id)
+
+        return html
+
+    @staticmethod
+    def _request_cache(uri, request_args, target_file, force_cache, pack=None):
+        """:meth:`request` of a resource that is not tracked in a crawl
+        manifest.  The *target_file* cache is read unless *force_cache*
+        is set.
+
+        """
         html = None
         if (force_cache
                 or target_file is None
-                or not os.path.exists(target_file)):
+                or not Loader._is_cached(target_file, pack)):
             components = urllib.parse.urlparse(uri)
             logging.debug('URI "%s" scheme|path: %s|%s', uri, components.scheme, components.path)
             scheme_match = re.match('http',
@@ -144,22 +331,170 @@ class Loader(object):
 
         if html is not None:
             if target_file is not None:
-                logging.info('Writing HTML response to cache file "%s"', target_file)
-                with tempfile.NamedTemporaryFile(mode='w') as _fh:
-                    try:
-                        _fh.write(html.decode('utf-8'))
-                    except AttributeError:
-                        _fh.write(html)
-                    _fh.flush()
-                    copy_file(_fh.name, target_file)
+                Loader._write_cache(target_file, html, pack)
         else:
             if target_file is not None:
-                logging.info('Returning HTML response from cache file "%s"', target_file)
-                with open(target_file) as _fh:
-                    html = _fh.read()
+                html = Loader._read_cache(target_file, pack)
+
+        return html
+
+    @staticmethod
+    def _request_manifest(uri,
+                          request_args,
+                          target_file,
+                          force_cache,
+                          match_id,
+                          manifest,
+                          pack=None):
+        """:meth:`request` of a match popup that is tracked in the crawl
+        *manifest*.
+
+        """
+        cached = Loader._is_cached(target_file, pack)
+        entry = manifest.get(match_id)
+
+        if cached and entry is None and not force_cache:
+            # Adopt a cache file from before the manifest.
+            html = Loader._read_cache(target_file, pack)
+            entry = manifest.record(match_id,
+                                    html,
+                                    file_name=os.path.basename(target_file),
+                                    finalised=trols_stats.Scraper.is_finalised(html))
+
+        if cached and entry is not None and entry.get('finalised'):
+            logging.info('Match %s is finalised: skipping fetch', match_id)
+            return Loader._read_cache(target_file, pack)
+
+        headers = {}
+        if cached and not force_cache:
+            headers = manifest.conditional_headers(match_id)
+
+        components = urllib.parse.urlparse(uri)
+        if re.match('http', components.scheme, flags=re.IGNORECASE):
+            response = Loader._request_url_conditional(uri,
+                                                       request_args,
+                                                       headers)
+            status, response_headers, html = response
+        else:
+            status, response_headers = 200, {}
+            html = Loader._request_file(components.path)
+
+        if status == 304:
+            logging.info('Match %s not modified: using cache file "%s"',
+                         match_id, target_file)
+            manifest.touch(match_id)
+            return Loader._read_cache(target_file, pack)
+
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+
+        Loader._write_cache(target_file, html, pack)
+        manifest.record(match_id,
+                        html,
+                        file_name=os.path.basename(target_file),
+                        etag=response_headers.get('ETag'),
+                        last_modified=response_headers.get('Last-Modified'),
+                        finalised=trols_stats.Scraper.is_finalised(html))
+
+        return html
+
+    @staticmethod
+    def _is_cached(target_file, pack=None):
+        """Check if the *target_file* cache file or its *pack* record
+        exists.
+
+        """
+        if pack is not None:
+            return os.path.basename(target_file) in pack
+
+        return os.path.exists(target_file)
+
+    @staticmethod
+    def _write_cache(target_file, html, pack=None):
+        """Write the raw *html* response to the *target_file* cache file.
+        With a *pack*, the response is appended to the pack under the
+        *target_file* name instead.
+
+        """
+        # The raw response bytes are cached as received.
+        data = html
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        if pack is not None:
+            logging.info('Writing HTML response to pack "%s" record "%s"',
+                         pack.path, os.path.basename(target_file))
+            pack.put(os.path.basename(target_file), data)
+            return
+
+        logging.info('Writing HTML response to cache file "%s"', target_file)
+        create_dir(os.path.dirname(target_file))
+        Loader.writer.write(target_file, data)
+
+    @staticmethod
+    def _read_cache(target_file, pack=None):
+        """Read the raw HTML response from the *target_file* cache file
+        or its *pack* record.
+
+        """
+        if pack is not None:
+            logging.info('Returning HTML response from pack "%s" record "%s"',
+                         pack.path, os.path.basename(target_file))
+            return pack.get(os.path.basename(target_file))
+
+        logging.info('Returning HTML response from cache file "%s"', target_file)
+        with open(target_file, 'rb') as _fh:
+            html = _fh.read()
 
         return html
 
+    @staticmethod
+    def request_stream(uri, request_args=None, chunk_size=CHUNK_SIZE):
+        """Streaming version of :meth:`request`.  The response from
+        *uri* is yielded in chunks as it is received.  Streamed
+        responses are not cached.
+
+        **Args:**
+            *uri*: the web address to send request
+
+        **Kwargs:**
+            *request_args*: dictionary of query terms that will form part
+            of the POST request payload
+
+            *chunk_size*: maximum size in bytes of each chunk
+
+        **Returns:**
+            generator of HTML response bytes chunks
+
+        """
+        components = urllib.parse.urlparse(uri)
+        scheme_match = re.match('http', components.scheme, flags=re.IGNORECASE)
+        if scheme_match:
+            logging.info('URL stream request "%s": args "%s"', uri, request_args)
+            if request_args is None:
+                request_args = {}
+            encoded_args = urllib.parse.urlencode(request_args).encode('utf-8')
+
+            # Only a failure before the first chunk can be retried.
+            def first_chunk():
+                stream = Loader.connection_pool.stream('POST',
+                                                       uri,
+                                                       body=encoded_args,
+                                                       headers=POST_HEADERS,
+                                                       chunk_size=chunk_size)
+                return next(stream, b''), stream
+
+            chunk, stream = Loader._retry(uri, first_chunk)
+            if chunk:
+                yield chunk
+                yield from stream
+        else:
+            logging.info('Attempting to stream file resource "%s"',
+                         components.path)
+            with open(components.path, 'rb') as file_h:
+                for chunk in iter(lambda: file_h.read(chunk_size), b''):
+                    yield chunk
+
     @staticmethod
     def _request_file(path):
         """Request a file resource.
@@ -175,13 +510,13 @@ class Loader(object):
             *path*: file resource as taken from the ``file`` URI scheme type
 
         **Returns:**
-            HTML response string of the *path*
+            HTML response bytes of the *path*
 
         """
         logging.info('Attempting to read file resource "%s"', path)
         html = None
 
-        with open(path) as file_h:
+        with open(path, 'rb') as file_h:
             html = file_h.read()
 
         return html
@@ -195,14 +530,131 @@ class Loader(object):
 
         """
         logging.info('URL request "%s": args "%s"', url, request_args)
-        request = urllib.request.Request(url)
 
         if request_args is None:
             request_args = {}
 
         encoded_args = urllib.parse.urlencode(request_args).encode('utf-8')
 
-        response = urllib.request.urlopen(request, encoded_args)
-        html = response.read()
+        def send():
+            return Loader.connection_pool.request('POST',
+                                                  url,
+                                                  body=encoded_args,
+                                                  headers=POST_HEADERS)
+
+        html = Loader._retry(url, send)
 
         return html
+
+    @staticmethod
+    def _request_url_conditional(url, request_args=None, headers=None):
+        """Conditional version of :meth:`_request_url`.
+
+        **Kwargs:**
+            *headers*: dictionary of conditional request headers.  For
+            example, ``If-None-Match``
+
+        **Returns:**
+            tuple of the response status, response headers and HTML
+            response bytes.  The HTML is empty on a ``304 Not Modified``
+            status
+
+        """
+        logging.info('Conditional URL request "%s": args "%s"', url, request_args)
+
+        if request_args is None:
+            request_args = {}
+
+        encoded_args = urllib.parse.urlencode(request_args).encode('utf-8')
+
+        request_headers = dict(POST_HEADERS)
+        request_headers.update(headers or {})
+
+        def send():
+            return Loader.connection_pool.fetch('POST',
+                                                url,
+                                                body=encoded_args,
+                                                headers=request_headers)
+
+        return Loader._retry(url, send)
+
+    @staticmethod
+    def _retry(url, send):
+        """Call *send* under the :attr:`rate_limiter` and retry it with
+        backoff on a transient error while the :attr:`retry_budget`
+        allows.
+
+        **Args:**
+            *url*: the web address of the request.  Used for logging
+
+            *send*: callable that makes the request
+
+        **Returns:**
+            the *send* return value
+
+        **Raises:**
+            the last *send* error once the retries are spent, or the
+            first error that is not transient
+
+        """
+        Loader.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            Loader.rate_limiter.acquire()
+            start = time.monotonic()
+            try:
+                result = send()
+            except Exception as err:
+                if not Loader._is_transient(err):
+                    raise
+
+                Loader.rate_limiter.on_error()
+                attempt += 1
+                if not Loader.retry_budget.withdraw(attempt):
+                    logging.error('URL request "%s" failed: %s', url, err)
+                    raise
+
+                delay = max(Loader.retry_budget.delay(attempt),
+                            Loader._retry_after(err))
+                logging.warning('URL request "%s" failed: %s: '
+                                'retry %d in %.2fs', url, err, attempt, delay)
+                time.sleep(delay)
+                continue
+
+            Loader.rate_limiter.on_success(time.monotonic() - start)
+
+            return result
+
+    @staticmethod
+    def _is_transient(err):
+        """Check if the request error *err* may succeed on a retry.
+        Server errors, throttling, timeouts and dropped connections are
+        transient.  Certificate errors never are.
+
+        """
+        if isinstance(err, urllib.error.HTTPError):
+            return err.code in RETRY_STATUS
+
+        if isinstance(err, urllib.error.URLError):
+            err = err.reason
+
+        if isinstance(err, ssl.SSLCertVerificationError):
+            return False
+
+        return isinstance(err, RETRY_ERRORS)
+
+    @staticmethod
+    def _retry_after(err):
+        """Seconds to wait as per the ``Retry-After`` header of an HTTP
+        error *err*.  Dates are not supported.
+
+        """
+        headers = getattr(err, 'headers', None)
+        value = headers.get('Retry-After') if headers is not None else None
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            seconds = 0.0
+
+        return min(max(seconds, 0.0), Loader.retry_budget.max_backoff)
@@ -0,0 +1,199 @@
+""":class:`trols_stats.interface.CrawlManifest`
+
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+
+__all__ = ['CrawlManifest']
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class CrawlManifest(object):
+    """Record of the match popups held in the cache.
+
+    Each match ID maps to an entry of the form::
+
+        {
+            'file': 'nejta_saturday_am_autumn_2015--AA039054.html',
+            'fetched': 1425085200.0,
+            'checked': 1425085200.0,
+            'sha1': '5ba93c9db0cff93f52b521d7420e43f6eda2784f',
+            'etag': '"7d1-50f9b5c1"',
+            'last_modified': 'Sat, 28 Feb 2015 09:00:00 GMT',
+            'finalised': True,
+        }
+
+    ``fetched`` is when the content was last downloaded and ``checked``
+    when it was last confirmed as current.  ``finalised`` matches have
+    a complete set of scores and are never fetched again.
+
+    .. attribute:: cache_dir
+        directory that holds the match popup cache and the manifest
+
+    .. attribute:: path
+        manifest file path
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, MANIFEST_FILE)
+
+    def __init__(self, cache_dir):
+        self.__cache_dir = cache_dir
+        self.__entries = {}
+        self.__dirty = False
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.save()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def load(self):
+        """Read the manifest from :attr:`path`.  A missing manifest is
+        empty.
+
+        """
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path) as _fh:
+                entries = json.load(_fh)
+
+        with self.__lock:
+            self.__entries = entries
+            self.__dirty = False
+
+        logging.info('Crawl manifest "%s" entries: %d', self.path, len(entries))
+
+    def save(self):
+        """Write the manifest to :attr:`path` if it has changed.  The
+        manifest is replaced atomically.
+
+        """
+        with self.__lock:
+            if not self.__dirty:
+                return
+            content = json.dumps(self.__entries, indent=1, sort_keys=True)
+            self.__dirty = False
+
+        create_dir(self.cache_dir)
+        AtomicWriter().write(self.path, content)
+
+        logging.info('Crawl manifest written to "%s"', self.path)
+
+    def get(self, match_id):
+        """Return a copy of the manifest entry of *match_id*.
+
+        **Returns:**
+            the entry dictionary or ``None`` if *match_id* is not in the
+            manifest
+
+        """
+        with self.__lock:
+            entry = self.__entries.get(match_id)
+            if entry is not None:
+                entry = dict(entry)
+
+        return entry
+
+    def is_finalised(self, match_id):
+        """Check if *match_id* is finalised.
+
+        """
+        entry = self.get(match_id)
+
+        return entry is not None and entry.get('finalised', False)
+
+    def record(self,
+               match_id,
+               html,
+               file_name=None,
+               etag=None,
+               last_modified=None,
+               finalised=False):
+        """Record a download of the *match_id* match popup.
+
+        **Args:**
+            *match_id*: identifier of the match.  For example,
+            ``AA039054``
+
+            *html*: raw HTML bytes of the match popup
+
+        **Kwargs:**
+            *file_name*: name of the cache file
+
+            *etag*: ``ETag`` response header value
+
+            *last_modified*: ``Last-Modified`` response header value
+
+            *finalised*: the match has a complete set of scores
+
+        **Returns:**
+            the new manifest entry
+
+        """
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+
+        now = time.time()
+        entry = {
+            'file': file_name,
+            'fetched': now,
+            'checked': now,
+            'sha1': hashlib.sha1(html).hexdigest(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'finalised': finalised,
+        }
+
+        with self.__lock:
+            self.__entries[match_id] = entry
+            self.__dirty = True
+
+        return dict(entry)
+
+    def touch(self, match_id):
+        """Record that the *match_id* cache content was confirmed as
+        current.  For example, on a ``304 Not Modified`` response.
+
+        """
+        with self.__lock:
+            entry = self.__entries.get(match_id)
+            if entry is not None:
+                entry['checked'] = time.time()
+                self.__dirty = True
+
+    def conditional_headers(self, match_id):
+        """Build the conditional request headers of *match_id*.
+
+        **Returns:**
+            dictionary of ``If-None-Match`` and ``If-Modified-Since``
+            request headers taken from the manifest entry
+
+        """
+        entry = self.get(match_id) or {}
+
+        headers = {}
+        if entry.get('etag') is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified') is not None:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
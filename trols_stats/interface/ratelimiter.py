@@ -0,0 +1,160 @@
+""":class:`trols_stats.interface.RateLimiter`
+
+"""
+import time
+import threading
+import logging
+
+__all__ = ['RateLimiter']
+
+
+class RateLimiter(object):
+    """Thread safe token bucket that adapts its rate to the server.
+
+    Each request takes a token from a bucket that fills at :attr:`rate`
+    tokens per second, up to :attr:`burst` tokens.  The rate adapts
+    additive-increase/multiplicative-decrease (AIMD) style.  Each quick
+    response raises the rate by :attr:`increase` divided by the current
+    rate, which adds about :attr:`increase` per second of traffic.  A
+    failed request or a response slower than :attr:`target_latency` cuts
+    the rate by the :attr:`decrease` factor.  At most one cut is made
+    per :attr:`cooldown` seconds, so a burst of failures from requests
+    already in flight counts once.
+
+    .. attribute:: rate
+        current requests per second
+
+    .. attribute:: burst
+        maximum number of requests sent back to back
+
+    .. attribute:: min_rate
+        lower bound of :attr:`rate`
+
+    .. attribute:: max_rate
+        upper bound of :attr:`rate`
+
+    .. attribute:: increase
+        additive increase of :attr:`rate`
+
+    .. attribute:: decrease
+        multiplicative decrease factor of :attr:`rate`
+
+    .. attribute:: target_latency
+        response seconds above which the server is taken as overloaded
+
+    .. attribute:: cooldown
+        minimum seconds between two decreases of :attr:`rate`
+
+    """
+    @property
+    def rate(self):
+        return self.__rate
+
+    @property
+    def burst(self):
+        return self.__burst
+
+    @property
+    def min_rate(self):
+        return self.__min_rate
+
+    @property
+    def max_rate(self):
+        return self.__max_rate
+
+    @property
+    def increase(self):
+        return self.__increase
+
+    @property
+    def decrease(self):
+        return self.__decrease
+
+    @property
+    def target_latency(self):
+        return self.__target_latency
+
+    @property
+    def cooldown(self):
+        return self.__cooldown
+
+    def __init__(self,
+                 rate=8.0,
+                 burst=4,
+                 min_rate=0.5,
+                 max_rate=32.0,
+                 increase=1.0,
+                 decrease=0.5,
+                 target_latency=2.0,
+                 cooldown=1.0):
+        self.__min_rate = min_rate
+        self.__max_rate = max_rate
+        self.__rate = min(max(rate, min_rate), max_rate)
+        self.__burst = max(1, burst)
+        self.__increase = increase
+        self.__decrease = decrease
+        self.__target_latency = target_latency
+        self.__cooldown = cooldown
+
+        self.__lock = threading.Lock()
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__decreased = None
+
+    def acquire(self):
+        """Take a token from the bucket.  Blocks until a token is
+        available.
+
+        **Returns:**
+            the seconds spent waiting for the token
+
+        """
+        waited = 0.0
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.burst,
+                                    self.__tokens
+                                    + (now - self.__updated) * self.__rate)
+                self.__updated = now
+
+                if self.__tokens >= 1.0:
+                    self.__tokens -= 1.0
+                    return waited
+
+                wait = (1.0 - self.__tokens) / self.__rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def on_success(self, latency):
+        """Adapt the rate to a successful response that took *latency*
+        seconds.
+
+        """
+        if latency > self.target_latency:
+            self.__cut('slow response {:.2f}s'.format(latency))
+            return
+
+        with self.__lock:
+            self.__rate = min(self.max_rate,
+                              self.__rate + self.increase / self.__rate)
+
+    def on_error(self):
+        """Adapt the rate to a failed request.
+
+        """
+        self.__cut('request error')
+
+    def __cut(self, reason):
+        with self.__lock:
+            now = time.monotonic()
+            if (self.__decreased is not None
+                    and now - self.__decreased < self.cooldown):
+                return
+
+            self.__decreased = now
+            self.__rate = max(self.min_rate, self.__rate * self.decrease)
+            rate = self.__rate
+
+        logging.info('Request rate cut to %.2f/s: %s', rate, reason)
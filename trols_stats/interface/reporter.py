@@ -8,6 +8,7 @@ import collections
 import logging
 
 import trols_stats
+from trols_stats.model.aggregates import Game
 
 
 class Reporter:
@@ -44,20 +45,23 @@ class Reporter:
             list of simplified player token IDs in the form::
 
         """
+        # Split each token once for all of the filters.
+        parts = {x: Game.split_token(x) for x in self.db.keys()}
+
         def cmp_name(name, token):
-            return  name.lower() in token.split('~')[0].lower()
+            return  name.lower() in parts[token][0].lower()
 
         def cmp_team(team, token):
-            return token.split('~')[1] == team
+            return parts[token][1] == team
 
         def cmp_section(section, token):
-            return token.split('~')[2] == str(section)
+            return parts[token][2] == str(section)
 
         def cmp_comp_type(competition_type, token):
-            return token.split('~')[3] == competition_type
+            return parts[token][3] == competition_type
 
         def cmp_comp(competition, token):
-            return token.split('~')[4] == str(competition)
+            return parts[token][4] == str(competition)
 
         matched = self.db.keys()
         if names is not None:
@@ -138,7 +142,7 @@ class Reporter:
                 ]
 
         """
-        competitions = set(x.split('~')[4] for x in self.db.keys())
+        competitions = set(Game.split_token(x)[4] for x in self.db.keys())
 
         return sorted(competitions)
 
@@ -181,7 +185,7 @@ class Reporter:
         }
         tokens = self.get_players(**kwargs)
 
-        teams = set(x.get('token').split('~')[1] for x in tokens)
+        teams = set(x.get('team') for x in tokens)
 
         return sorted(teams)
 
@@ -206,7 +210,7 @@ class Reporter:
         }
         tokens = self.get_players(**kwargs)
 
-        sections = set(x.get('token').split('~')[2] for x in tokens)
+        sections = set(x.get('section') for x in tokens)
 
         return sorted([int(x) for x in sections])
 
@@ -536,7 +540,7 @@ class Reporter:
 
         """
         def player_id_struct(player_id):
-            (name, team, section, comp_type, comp) = player_id.split('~')
+            (name, team, section, comp_type, comp) = Game.split_token(player_id)
             comp_parts = comp.split('_')
             comp_string = '{} {} {} {} {}'.format(comp_parts[0].upper(),
                                                   comp_parts[1].title(),
@@ -0,0 +1,127 @@
+""":class:`trols_stats.interface.RetryBudget`
+
+"""
+import random
+import threading
+
+__all__ = ['RetryBudget']
+
+
+class RetryBudget(object):
+    """Thread safe limit on retries across all requests.
+
+    Each request may be retried up to :attr:`max_retries` times.  Every
+    retry also spends one token from a budget shared by all requests.
+    Each new request adds :attr:`ratio` tokens, up to :attr:`reserve`.
+    While the server is healthy the budget stays full.  During an outage
+    retries are capped at about :attr:`ratio` of the request volume, so
+    the retries do not add to the load on a failing server.
+
+    .. attribute:: max_retries
+        maximum retries of the one request
+
+    .. attribute:: ratio
+        retry tokens earned by each request
+
+    .. attribute:: reserve
+        maximum retry tokens held.  The budget starts full
+
+    .. attribute:: backoff
+        base seconds of the exponential backoff
+
+    .. attribute:: max_backoff
+        upper bound of the backoff seconds
+
+    .. attribute:: balance
+        retry tokens available
+
+    .. attribute:: retries
+        number of retries allowed
+
+    .. attribute:: refused
+        number of retries refused because the budget ran out
+
+    """
+    @property
+    def max_retries(self):
+        return self.__max_retries
+
+    @property
+    def ratio(self):
+        return self.__ratio
+
+    @property
+    def reserve(self):
+        return self.__reserve
+
+    @property
+    def backoff(self):
+        return self.__backoff
+
+    @property
+    def max_backoff(self):
+        return self.__max_backoff
+
+    @property
+    def balance(self):
+        return self.__balance
+
+    @property
+    def retries(self):
+        return self.__retries
+
+    @property
+    def refused(self):
+        return self.__refused
+
+    def __init__(self,
+                 max_retries=3,
+                 ratio=0.2,
+                 reserve=10.0,
+                 backoff=0.5,
+                 max_backoff=30.0):
+        self.__max_retries = max_retries
+        self.__ratio = ratio
+        self.__reserve = reserve
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+
+        self.__lock = threading.Lock()
+        self.__balance = float(reserve)
+        self.__retries = 0
+        self.__refused = 0
+
+    def deposit(self):
+        """Earn retry tokens for a new request.
+
+        """
+        with self.__lock:
+            self.__balance = min(self.reserve, self.__balance + self.ratio)
+
+    def withdraw(self, attempt):
+        """Spend a retry token on retry number *attempt* of a request.
+        The first retry is attempt ``1``.
+
+        **Returns:**
+            boolean ``True`` if the retry is allowed
+
+        """
+        with self.__lock:
+            if attempt > self.max_retries or self.__balance < 1.0:
+                self.__refused += 1
+                return False
+
+            self.__balance -= 1.0
+            self.__retries += 1
+
+        return True
+
+    def delay(self, attempt):
+        """Backoff seconds before retry number *attempt*.  The delay is
+        drawn uniformly between zero and the exponential backoff.  This
+        "full jitter" spreads out retries that failed together.
+
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+
+        return random.uniform(0, ceiling)
@@ -0,0 +1,376 @@
+""":class:`trols_stats.interface.StandInServer`
+
+"""
+import os
+import re
+import time
+import random
+import hashlib
+import threading
+import logging
+import http.server
+import urllib.parse
+import lxml.html
+
+__all__ = ['StandInServer']
+
+# Match popup file names of the flat and sharded cache layouts, and of
+# the test fixtures.  For example, nejta_saturday_am_autumn_2015--AA039054.html
+# and match_AA039054.html.
+POPUP_FILE = re.compile(r'^(?:.+--|match_)(\w+)\.html$')
+
+RESULTS_FILE = 'results.php'
+SECTIONS_DIR = 'results'
+
+# Write size of a bandwidth capped response.
+CHUNK_SIZE = 8192
+
+
+class StandInServer(object):
+    """Local stand-in of the TROLS web site for offline crawler
+    benchmarks.
+
+    Pages are served from a corpus directory such as
+    ``trols_stats/tests/files``.  The corpus is searched for:
+
+    * ``<league>/results.php`` - the competition results page of the
+      league.  Also the default section results page
+    * ``<league>/results/<section>.php`` - optional results page of the
+      one section
+    * ``*--<match_id>.html`` or ``match_<match_id>.html`` - match
+      popups in any directory.  Both cache layouts can be used as they
+      are
+
+    ``POST /<league>/results.php`` returns the section results page when
+    the form has a ``section`` value, otherwise the competition results
+    page.  ``/<league>/match_popup.php?matchid=<match_id>`` returns the
+    match popup.  Responses carry an ``ETag`` and honour
+    ``If-None-Match``.
+
+    Slow or unreliable servers are simulated with :attr:`latency`,
+    :attr:`jitter`, :attr:`error_rate` and :attr:`bandwidth`.
+
+    .. attribute:: corpus_dir
+        directory of the pages that are served
+
+    .. attribute:: latency
+        seconds added before each response
+
+    .. attribute:: jitter
+        upper bound of the random seconds added to :attr:`latency`
+
+    .. attribute:: error_rate
+        fraction of the requests that fail with a
+        ``503 Service Unavailable``
+
+    .. attribute:: bandwidth
+        bytes per second cap of each response.  ``None`` is uncapped
+
+    .. attribute:: strict
+        unknown match IDs return ``404 Not Found``.  Otherwise the first
+        match popup of the corpus is served in its place, so that a small
+        corpus can stand in for a large crawl
+
+    .. attribute:: url
+        base URL of the running server.  For example,
+        ``http://127.0.0.1:8080``
+
+    .. attribute:: requests
+        number of requests received
+
+    .. attribute:: errors
+        number of injected ``503`` responses
+
+    """
+    @property
+    def corpus_dir(self):
+        return self.__corpus_dir
+
+    @property
+    def latency(self):
+        return self.__latency
+
+    @property
+    def jitter(self):
+        return self.__jitter
+
+    @property
+    def error_rate(self):
+        return self.__error_rate
+
+    @property
+    def bandwidth(self):
+        return self.__bandwidth
+
+    @property
+    def strict(self):
+        return self.__strict
+
+    @property
+    def url(self):
+        if self.__httpd is None:
+            return None
+
+        host, port = self.__httpd.server_address[:2]
+
+        return 'http://{}:{}'.format(host, port)
+
+    @property
+    def results_url(self):
+        """:class:`trols_stats.interface.Crawler` *results_url* of the
+        running server.
+
+        """
+        return '{}/{{}}/{}'.format(self.url, RESULTS_FILE)
+
+    @property
+    def popup_url(self):
+        """:class:`trols_stats.interface.Crawler` *popup_url* of the
+        running server.
+
+        """
+        return '{}/{{}}/match_popup.php'.format(self.url)
+
+    @property
+    def requests(self):
+        return self.__requests
+
+    @property
+    def errors(self):
+        return self.__errors
+
+    def __init__(self,
+                 corpus_dir,
+                 host='127.0.0.1',
+                 port=0,
+                 latency=0.0,
+                 jitter=0.0,
+                 error_rate=0.0,
+                 bandwidth=None,
+                 strict=False,
+                 seed=None):
+        self.__corpus_dir = corpus_dir
+        self.__address = (host, port)
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__error_rate = error_rate
+        self.__bandwidth = bandwidth
+        self.__strict = strict
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__errors = 0
+
+        self.__leagues = {}
+        self.__popups = {}
+        self.__httpd = None
+        self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Index the corpus and serve it from a background thread.
+
+        """
+        self.index()
+
+        self.__httpd = http.server.ThreadingHTTPServer(self.__address,
+                                                       StandInHandler)
+        self.__httpd.daemon_threads = True
+        self.__httpd.standin = self
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever,
+                                         name='trols-standin',
+                                         daemon=True)
+        self.__thread.start()
+
+        logging.info('Stand-in TROLS server "%s" serving "%s"',
+                     self.url, self.corpus_dir)
+
+    def stop(self):
+        """Shut down the server.
+
+        """
+        if self.__httpd is None:
+            return
+
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+        self.__thread.join()
+        self.__httpd = None
+        self.__thread = None
+
+        logging.info('Stand-in TROLS server stopped: requests %d|errors %d',
+                     self.requests, self.errors)
+
+    def index(self):
+        """Walk :attr:`corpus_dir` for the league results pages and the
+        match popups.
+
+        """
+        leagues = {}
+        popups = {}
+        for dirpath, dirnames, filenames in os.walk(self.corpus_dir):
+            dirnames.sort()
+            if RESULTS_FILE in filenames:
+                leagues.setdefault(os.path.basename(dirpath), dirpath)
+
+            for filename in sorted(filenames):
+                match = POPUP_FILE.match(filename)
+                if match is not None:
+                    popups.setdefault(match.group(1),
+                                      os.path.join(dirpath, filename))
+
+        self.__leagues = leagues
+        self.__popups = popups
+
+        logging.info('Stand-in corpus "%s": leagues %d|match popups %d',
+                     self.corpus_dir, len(leagues), len(popups))
+
+    def trols_urls(self):
+        """Leagues of the corpus and their competition option values in
+        the form of :attr:`trols_stats.Config.trols_urls`.
+
+        **Returns:**
+            dictionary such as ``{'nejta': 'AA'}``
+
+        """
+        trols_urls = {}
+        for league, league_dir in sorted(self.__leagues.items()):
+            with open(os.path.join(league_dir, RESULTS_FILE), 'rb') as _fh:
+                root = lxml.html.fromstring(_fh.read())
+            values = root.xpath('//select[@id="daytime"]/option/@value')
+            values = [x for x in values if x]
+            if values:
+                trols_urls[league] = ','.join(values)
+
+        return trols_urls
+
+    def resolve(self, path, args):
+        """Corpus file that answers a request.
+
+        **Args:**
+            *path*: URL path.  For example, ``/nejta/results.php``
+
+            *args*: dictionary of the query and form arguments
+
+        **Returns:**
+            the file path or ``None`` if the corpus has no such page
+
+        """
+        parts = path.strip('/').split('/')
+        if len(parts) != 2 or parts[0] not in self.__leagues:
+            return None
+
+        league_dir = self.__leagues[parts[0]]
+        if parts[1] == RESULTS_FILE:
+            section = args.get('section')
+            if section:
+                section_file = os.path.join(league_dir,
+                                            SECTIONS_DIR,
+                                            '{}.php'.format(section))
+                if os.path.exists(section_file):
+                    return section_file
+
+            return os.path.join(league_dir, RESULTS_FILE)
+
+        if parts[1] == 'match_popup.php':
+            popup_file = self.__popups.get(args.get('matchid'))
+            if popup_file is None and not self.strict and self.__popups:
+                popup_file = self.__popups[min(self.__popups)]
+
+            return popup_file
+
+        return None
+
+    def count(self):
+        """Count a request and draw whether it fails.
+
+        **Returns:**
+            tuple of the seconds to delay the response and a boolean
+            ``True`` if an error is injected
+
+        """
+        with self.__lock:
+            self.__requests += 1
+            delay = self.latency
+            if self.jitter:
+                delay += self.__random.uniform(0, self.jitter)
+            failed = self.__random.random() < self.error_rate
+            if failed:
+                self.__errors += 1
+
+        return delay, failed
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Keep-alive request handler of the :class:`StandInServer`.
+
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.respond(b'')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.respond(self.rfile.read(length))
+
+    def respond(self, body):
+        standin = self.server.standin
+
+        components = urllib.parse.urlparse(self.path)
+        args = dict(urllib.parse.parse_qsl(components.query))
+        args.update(urllib.parse.parse_qsl(body.decode('utf-8')))
+
+        delay, failed = standin.count()
+        if delay:
+            time.sleep(delay)
+
+        if failed:
+            self.send_empty(503)
+            return
+
+        page = standin.resolve(components.path, args)
+        if page is None:
+            self.send_empty(404)
+            return
+
+        with open(page, 'rb') as _fh:
+            data = _fh.read()
+
+        etag = '"{}"'.format(hashlib.md5(data).hexdigest())
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+
+        if standin.bandwidth is None:
+            self.wfile.write(data)
+            return
+
+        for offset in range(0, len(data), CHUNK_SIZE):
+            chunk = data[offset:offset + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / standin.bandwidth)
+
+    def send_empty(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logging.debug('Stand-in request: ' + format, *args)
@@ -0,0 +1,69 @@
+"""Unit test cases for :class:`Benchmark`.
+
+"""
+import unittest
+import os
+
+import trols_stats.interface as interface
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.Benchmark object.
+        """
+        benchmark = interface.Benchmark('corpus')
+        msg = 'Object is not a interface.Benchmark'
+        self.assertIsInstance(benchmark, interface.Benchmark, msg)
+
+    def test_percentile(self):
+        """Nearest-rank percentiles.
+        """
+        # Given 100 latencies
+        values = [x / 100.0 for x in range(100, 0, -1)]
+
+        # when I take the percentiles
+        received = [interface.Benchmark.percentile(values, x)
+                    for x in (50, 95, 99, 100)]
+
+        # then I should receive the nearest-rank values
+        expected = [0.5, 0.95, 0.99, 1.0]
+        msg = 'Nearest-rank percentile error'
+        self.assertListEqual(received, expected, msg)
+
+        # and no values should give zero
+        msg = 'Empty percentile error'
+        self.assertEqual(interface.Benchmark.percentile([], 99), 0.0, msg)
+
+    def test_run(self):
+        """Benchmark the crawler against the stand-in server.
+        """
+        # Given the test files corpus
+        corpus_dir = os.path.join('trols_stats', 'tests', 'files')
+
+        # and a flaky stand-in server
+        kwargs = {
+            'server_kwargs': {'error_rate': 0.1, 'seed': 1},
+            'crawler_kwargs': {'concurrency': 4},
+            'rate_limit': 100.0,
+        }
+        benchmark = interface.Benchmark(corpus_dir, **kwargs)
+
+        # when I run the benchmark
+        limiter = interface.Loader.rate_limiter
+        reports = benchmark.run()
+
+        # then every match popup of the results page should be fetched
+        msg = 'Benchmark pages fetched error'
+        self.assertEqual(reports[0]['pages'], 11, msg)
+
+        # and the injected errors should be retried
+        msg = 'Benchmark failed requests error'
+        self.assertEqual(reports[0]['failures'], 0, msg)
+
+        # and the latencies should be ordered
+        msg = 'Benchmark latency percentiles error'
+        self.assertLessEqual(reports[0]['p50'], reports[0]['p99'], msg)
+
+        # and the Loader should be restored
+        msg = 'Benchmark Loader rate limiter not restored'
+        self.assertIs(interface.Loader.rate_limiter, limiter, msg)
@@ -0,0 +1,82 @@
+"""Unit test cases for :class:`CrawlCheckpoint`.
+
+"""
+import unittest
+import os
+import tempfile
+
+import trols_stats.interface as interface
+
+
+class TestCrawlCheckpoint(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.CrawlCheckpoint object.
+        """
+        checkpoint = interface.CrawlCheckpoint(tempfile.mkdtemp())
+        msg = 'Object is not a interface.CrawlCheckpoint'
+        self.assertIsInstance(checkpoint, interface.CrawlCheckpoint, msg)
+
+    def test_task_states(self):
+        """Track the crawl task states.
+        """
+        # Given a checkpoint
+        checkpoint = interface.CrawlCheckpoint(tempfile.mkdtemp())
+
+        # when I queue tasks
+        for match_id in ('AA039011', 'AA039013', 'AA039014'):
+            key = 'match_popup.php?matchid={}'.format(match_id)
+            checkpoint.add(key, 'popup', ['nejta', 'comp', match_id])
+
+        # and start one task
+        checkpoint.start('match_popup.php?matchid=AA039011')
+
+        # and finish another
+        checkpoint.start('match_popup.php?matchid=AA039013')
+        checkpoint.finish('match_popup.php?matchid=AA039013')
+
+        # then I should receive the task state counts
+        expected = {'queued': 1, 'in_flight': 1, 'done': 1}
+        msg = 'Checkpoint task state counts error'
+        self.assertDictEqual(checkpoint.counts(), expected, msg)
+
+        # and the pending tasks
+        received = [x[2][2] for x in checkpoint.tasks(pending=True)]
+        msg = 'Checkpoint pending tasks error'
+        self.assertListEqual(received, ['AA039011', 'AA039014'], msg)
+
+        # and a queued task should keep its state
+        checkpoint.add('match_popup.php?matchid=AA039013',
+                       'popup',
+                       ['nejta', 'comp', 'AA039013'])
+        received = [x[2][2] for x in checkpoint.tasks(pending=False)]
+        msg = 'Checkpoint done tasks error'
+        self.assertListEqual(received, ['AA039013'], msg)
+
+    def test_save_load_reset(self):
+        """Persist and reset a checkpoint.
+        """
+        # Given a cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+
+        # and a checkpoint with a task in flight
+        checkpoint = interface.CrawlCheckpoint(cache_dir_obj.name)
+        checkpoint.add('results.php?daytime=AA', 'competition', ['nejta', 'AA'])
+        checkpoint.start('results.php?daytime=AA')
+
+        # when I save the checkpoint
+        checkpoint.save()
+
+        # then the next crawl should load the task
+        resumed = interface.CrawlCheckpoint(cache_dir_obj.name)
+        resumed.load()
+        expected = [('results.php?daytime=AA', 'competition', ['nejta', 'AA'])]
+        msg = 'Loaded checkpoint tasks error'
+        self.assertListEqual(resumed.tasks(pending=True), expected, msg)
+
+        # when I reset the checkpoint
+        resumed.reset()
+
+        # then the checkpoint file should be removed
+        msg = 'Checkpoint file not removed on reset'
+        self.assertFalse(os.path.exists(resumed.path), msg)
+        self.assertEqual(len(resumed), 0, msg)
@@ -0,0 +1,311 @@
+"""Unit test cases for :class:`Crawler`.
+
+"""
+import unittest
+import unittest.mock
+import os
+import tempfile
+import threading
+import urllib.parse
+
+import trols_stats.interface as interface
+
+
+class TestCrawler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        files_dir = os.path.join('trols_stats', 'tests', 'files')
+
+        with open(os.path.join(files_dir, 'main_results.php'), 'rb') as _fh:
+            cls._comps_html = _fh.read()
+
+        section_file = os.path.join(files_dir,
+                                    'www.trols.org.au',
+                                    'nejta',
+                                    'results.php')
+        with open(section_file, 'rb') as _fh:
+            cls._section_html = _fh.read()
+
+        popup_file = os.path.join(files_dir, 'match_AA039054.html')
+        with open(popup_file, 'rb') as _fh:
+            cls._popup_html = _fh.read()
+
+    def test_init(self):
+        """Initialise a interface.Crawler object.
+        """
+        crawler = interface.Crawler(cache_dir=tempfile.mkdtemp())
+        msg = 'Object is not a interface.Crawler'
+        self.assertIsInstance(crawler, interface.Crawler, msg)
+
+    def test_crawl(self):
+        """Crawl the competition, sections and match popups.
+        """
+        # Given a cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = cache_dir_obj.name
+
+        # and TROLS endpoints that track the requests in flight
+        lock = threading.Lock()
+        in_flight = {}
+        max_in_flight = {}
+        popup_ids = []
+
+        def track(uri, response):
+            hosts = ('all', urllib.parse.urlparse(uri).netloc)
+            with lock:
+                for host in hosts:
+                    in_flight[host] = in_flight.get(host, 0) + 1
+                    max_in_flight[host] = max(max_in_flight.get(host, 0),
+                                              in_flight[host])
+            threading.Event().wait(0.01)
+            with lock:
+                for host in hosts:
+                    in_flight[host] -= 1
+            return response
+
+        def request_url(url, request_args=None):
+            if 'match_popup' in url:
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+                with lock:
+                    popup_ids.append(query['matchid'][0])
+                return track(url, self._popup_html)
+            return track(url, self._comps_html)
+
+        def request_stream(uri, request_args=None):
+            yield track(uri, self._section_html)
+
+        # when I crawl a league
+        crawler = interface.Crawler(cache_dir=cache_dir,
+                                    concurrency=4,
+                                    per_host=2)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url',
+                                        side_effect=request_url),\
+                unittest.mock.patch.object(interface.Loader,
+                                           'request_stream',
+                                           side_effect=request_stream):
+            received = crawler.crawl({'nejta': 'AA'})
+
+        # then each unique match popup should be fetched once
+        expected = ['AA039011',
+                    'AA039013',
+                    'AA039014',
+                    'AA039022',
+                    'AA039023',
+                    'AA039024',
+                    'AA039042',
+                    'AA039043',
+                    'AA039044',
+                    'AA039051',
+                    'AA039054']
+        msg = 'Crawled match popup fetch error'
+        self.assertEqual(received, len(expected), msg)
+        self.assertListEqual(sorted(popup_ids), expected, msg)
+
+        # and written to the Loader.request cache layout
+        received = sorted(os.listdir(cache_dir))
+        expected = ['nejta_saturday_am_autumn_2015--{}.html'.format(x)
+                    for x in expected]
+        msg = 'Crawled match popup cache files error'
+        self.assertListEqual(received, expected, msg)
+
+        # and the request limits should not be exceeded
+        msg = 'Global request limit exceeded'
+        self.assertLessEqual(max_in_flight.pop('all'), 4, msg)
+        msg = 'Per-host request limit exceeded'
+        self.assertLessEqual(max(max_in_flight.values()), 2, msg)
+
+    def test_crawl_discovery(self):
+        """Crawl again and only queue the changed match popups.
+        """
+        # Given a cache directory with a crawl manifest and discovery
+        # state
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = cache_dir_obj.name
+        manifest = interface.CrawlManifest(cache_dir)
+        discovery = interface.DiscoveryState(cache_dir)
+
+        # and TROLS endpoints
+        popup_ids = []
+        section_html = [self._section_html]
+
+        def request_url(url, request_args=None):
+            return self._comps_html
+
+        def request_url_conditional(url, request_args=None, headers=None):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+            popup_ids.append(query['matchid'][0])
+            return 200, {}, self._popup_html
+
+        def request_stream(uri, request_args=None):
+            if request_args['section'] == 'AA039':
+                yield section_html[0]
+            else:
+                yield b'<html></html>'
+
+        def crawl():
+            popup_ids.clear()
+            crawler = interface.Crawler(cache_dir=cache_dir,
+                                        manifest=manifest,
+                                        discovery=discovery)
+            with unittest.mock.patch.object(interface.Loader,
+                                            '_request_url',
+                                            side_effect=request_url),\
+                    unittest.mock.patch.object(interface.Loader,
+                                               '_request_url_conditional',
+                                               side_effect=request_url_conditional),\
+                    unittest.mock.patch.object(interface.Loader,
+                                               'request_stream',
+                                               side_effect=request_stream):
+                crawler.crawl({'nejta': 'AA'})
+
+            return crawler
+
+        comp_token = 'nejta_saturday_am_autumn_2015'
+
+        # when I crawl a league
+        crawler = crawl()
+
+        # then every match ID should be added
+        msg = 'First crawl discovery diff error'
+        expected = {'added': 11, 'unchanged': 0, 'vanished': 0}
+        self.assertDictEqual(crawler.diff[comp_token], expected, msg)
+        msg = 'First crawl match popup fetch error'
+        self.assertEqual(len(popup_ids), 11, msg)
+
+        # when I crawl the league again
+        crawler = crawl()
+
+        # then every match ID should be unchanged
+        msg = 'Second crawl discovery diff error'
+        expected = {'added': 0, 'unchanged': 11, 'vanished': 0}
+        self.assertDictEqual(crawler.diff[comp_token], expected, msg)
+
+        # and the finalised match popups should not be queued
+        msg = 'Second crawl should not fetch finalised match popups'
+        self.assertListEqual(popup_ids, [], msg)
+        self.assertEqual(crawler.skipped, 11, msg)
+
+        # when a match ID vanishes from the section results
+        section_html[0] = self._section_html.replace(b'AA039054', b'AA039055')
+        crawler = crawl()
+
+        # then the diff should report the added and vanished match
+        msg = 'Changed section discovery diff error'
+        expected = {'added': 1, 'unchanged': 10, 'vanished': 1}
+        self.assertDictEqual(crawler.diff[comp_token], expected, msg)
+
+        # and only the new match popup should be fetched
+        msg = 'Changed section match popup fetch error'
+        self.assertListEqual(popup_ids, ['AA039055'], msg)
+
+        # when the competition results page lists no sections
+        with unittest.mock.patch('trols_stats.Scraper.iter_competition_ids',
+                                 return_value=iter([])):
+            crawler = crawl()
+
+        # then no match IDs should vanish
+        msg = 'Empty results page should not vanish the sections'
+        self.assertEqual(crawler.diff.get(comp_token, {}).get('vanished', 0),
+                         0,
+                         msg)
+
+        # and the section match IDs should be kept
+        msg = 'Empty results page dropped the section match IDs'
+        self.assertEqual(len(discovery.match_ids(comp_token, 'AA039')),
+                         11,
+                         msg)
+
+    def test_crawl_resume(self):
+        """Resume an interrupted crawl from its checkpoint.
+        """
+        # Given a cache directory with a crawl checkpoint
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = cache_dir_obj.name
+
+        # and TROLS endpoints that fail on one match popup
+        requests = []
+        failing = ['AA039054']
+
+        def request_url(url, request_args=None):
+            requests.append(url)
+            if 'match_popup' in url:
+                if any(x in url for x in failing):
+                    raise OSError('connection reset')
+                return self._popup_html
+            return self._comps_html
+
+        def request_stream(uri, request_args=None):
+            requests.append(uri)
+            if request_args['section'] == 'AA039':
+                yield self._section_html
+            else:
+                yield b'<html></html>'
+
+        def crawl(resume):
+            requests.clear()
+            checkpoint = interface.CrawlCheckpoint(cache_dir)
+            crawler = interface.Crawler(cache_dir=cache_dir,
+                                        checkpoint=checkpoint)
+            with unittest.mock.patch.object(interface.Loader,
+                                            '_request_url',
+                                            side_effect=request_url),\
+                    unittest.mock.patch.object(interface.Loader,
+                                               'request_stream',
+                                               side_effect=request_stream):
+                fetched = crawler.crawl({'nejta': 'AA'}, resume=resume)
+
+            return fetched, checkpoint
+
+        # when a crawl is interrupted by a failed request
+        fetched, checkpoint = crawl(resume=False)
+
+        # then the checkpoint should hold the failed match popup
+        msg = 'Interrupted crawl fetch error'
+        self.assertEqual(fetched, 10, msg)
+        msg = 'Interrupted crawl checkpoint not kept'
+        self.assertTrue(os.path.exists(checkpoint.path), msg)
+        expected = ['AA039054']
+        received = [x[2][2]
+                    for x in checkpoint.tasks(task='popup', pending=True)]
+        msg = 'Interrupted crawl pending tasks error'
+        self.assertListEqual(received, expected, msg)
+
+        # when I resume the crawl
+        failing.clear()
+        fetched, checkpoint = crawl(resume=True)
+
+        # then only the pending match popup should be requested
+        msg = 'Resumed crawl requests error'
+        self.assertEqual(len(requests), 1, msg)
+        self.assertIn('AA039054', requests[0], msg)
+        msg = 'Resumed crawl fetch error'
+        self.assertEqual(fetched, 1, msg)
+
+        # and the complete crawl should remove the checkpoint
+        msg = 'Complete crawl checkpoint not removed'
+        self.assertFalse(os.path.exists(checkpoint.path), msg)
+
+    def test_crawl_failed_request(self):
+        """Crawl with a failed competition request.
+        """
+        # Given a cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+
+        # and a TROLS endpoint that fails
+        side_effect = OSError('connection refused')
+
+        # when I crawl a league
+        crawler = interface.Crawler(cache_dir=cache_dir_obj.name)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url',
+                                        side_effect=side_effect):
+            received = crawler.crawl({'nejta': 'AA'})
+
+        # then no match popups should be fetched
+        msg = 'Failed crawl should not fetch match popups'
+        self.assertEqual(received, 0, msg)
+
+        # and the failure should be recorded
+        msg = 'Failed crawl request not recorded'
+        self.assertEqual(len(crawler.failures), 1, msg)
@@ -0,0 +1,84 @@
+"""Unit test cases for :class:`DiscoveryState`.
+
+"""
+import unittest
+import os
+import tempfile
+
+import trols_stats.interface as interface
+
+
+class TestDiscoveryState(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.DiscoveryState object.
+        """
+        state = interface.DiscoveryState(tempfile.mkdtemp())
+        msg = 'Object is not a interface.DiscoveryState'
+        self.assertIsInstance(state, interface.DiscoveryState, msg)
+
+    def test_update_section(self):
+        """Diff the match IDs of a section against the last crawl.
+        """
+        # Given a section seen by the last crawl
+        state = interface.DiscoveryState(tempfile.mkdtemp())
+        comp_token = 'nejta_saturday_am_autumn_2015'
+        received = state.update_section(comp_token,
+                                        'AA039',
+                                        ['AA039011', 'AA039013'])
+
+        # then a new section should only have added match IDs
+        expected = {
+            'added': ['AA039011', 'AA039013'],
+            'unchanged': [],
+            'vanished': [],
+        }
+        msg = 'New section diff error'
+        self.assertDictEqual(received, expected, msg)
+
+        # when I update the section match IDs
+        received = state.update_section(comp_token,
+                                        'AA039',
+                                        ['AA039013', 'AA039014'])
+
+        # then I should receive the difference
+        expected = {
+            'added': ['AA039014'],
+            'unchanged': ['AA039013'],
+            'vanished': ['AA039011'],
+        }
+        msg = 'Updated section diff error'
+        self.assertDictEqual(received, expected, msg)
+
+        # and the section should hold the new match IDs
+        received = state.match_ids(comp_token, 'AA039')
+        msg = 'Updated section match IDs error'
+        self.assertSetEqual(received, {'AA039013', 'AA039014'}, msg)
+
+    def test_update_sections_save_load(self):
+        """Drop the vanished sections and persist the state.
+        """
+        # Given a cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        comp_token = 'nejta_saturday_am_autumn_2015'
+
+        # and the sections seen by the last crawl
+        with interface.DiscoveryState(cache_dir_obj.name) as state:
+            state.update_section(comp_token, 'AA039', ['AA039011'])
+            state.update_section(comp_token, 'AA040', ['AA040011'])
+
+        msg = 'Discovery state file not written'
+        self.assertTrue(os.path.exists(state.path), msg)
+
+        # when the next crawl only lists one of the sections
+        with interface.DiscoveryState(cache_dir_obj.name) as state:
+            received = state.update_sections(comp_token, ['AA039'])
+
+        # then the match IDs of the vanished section should be returned
+        msg = 'Vanished section match IDs error'
+        self.assertListEqual(received, ['AA040011'], msg)
+
+        # and the section should be dropped from the saved state
+        with interface.DiscoveryState(cache_dir_obj.name) as state:
+            received = state.sections(comp_token)
+        msg = 'Saved discovery state sections error'
+        self.assertListEqual(received, ['AA039'], msg)
@@ -4,8 +4,12 @@
 import unittest
 import unittest.mock
 import os
+import ssl
 import tempfile
+import http.client
+import urllib.error
 
+import trols_stats
 import trols_stats.interface as interface
 from filer.files import (get_directory_files_list,
                          remove_files,
@@ -104,6 +108,115 @@ class TestLoader(unittest.TestCase):
         msg = 'interface.Loader.games list length should be 16'
         self.assertEqual(len(received), expected, msg)
 
+    def test_load_match(self):
+        """load_match of a parsed match structure.
+        """
+        # Given a TROLS detailed match results page parsed into a
+        # match structure
+        match_file = 'nejta_saturday_am_autumn_2015--AA039094.html'
+        with open(os.path.join(self._test_dir, match_file)) as html_fh:
+            match = trols_stats.Scraper.parse_match(html_fh.read())
+
+        # when a load occurs
+        loader = interface.Loader()
+        loader.load_match(match, match_file)
+        received = loader.games
+
+        # then I should receive a list of Game objects
+        expected = 16
+        msg = 'interface.Loader.games list length should be 16'
+        self.assertEqual(len(received), expected, msg)
+
+        # and the competition should be taken from the source file name
+        received = loader.games[0].fixture.competition
+        expected = 'nejta_saturday_am_autumn_2015'
+        msg = 'Game competition not sourced from file name'
+        self.assertEqual(received, expected, msg)
+
+    def test_load_match_shared_players(self):
+        """load_match of two matches shares the Player objects.
+        """
+        # Given two matches of the same section
+        loader = interface.Loader()
+        for match_file in ('nejta_saturday_am_autumn_2015--AA039054.html',
+                           'nejta_saturday_am_autumn_2015--AA039094.html'):
+            with open(os.path.join(self._test_dir, match_file)) as html_fh:
+                match = trols_stats.Scraper.parse_match(html_fh.read())
+
+            # when a load occurs
+            loader.load_match(match, match_file)
+
+        # then each player should have the one Player object
+        players = {}
+        for game in loader.games:
+            key = (game.player.name, game.player.team)
+            players.setdefault(key, set()).add(id(game.player))
+        msg = 'Player objects not shared across matches'
+        self.assertTrue(all(len(x) == 1 for x in players.values()), msg)
+
+        # and the player map should hold every player
+        msg = 'Loader player map size error'
+        self.assertEqual(len(loader.player_map), len(players), msg)
+
+    def test_load_match_interned(self):
+        """load_match interns the strings and entities of the matches.
+        """
+        # Given a loader with a shared interner
+        interner = trols_stats.Interner()
+        loader = interface.Loader(interner=interner)
+
+        # when two matches are loaded
+        for match_file in ('nejta_saturday_am_autumn_2015--AA039054.html',
+                           'nejta_saturday_am_autumn_2015--AA039094.html'):
+            with open(os.path.join(self._test_dir, match_file)) as html_fh:
+                match = trols_stats.Scraper.parse_match(html_fh.read())
+            loader.load_match(match, match_file)
+
+        # then the loader maps should be those of the interner
+        msg = 'Loader player map is not the interner player map'
+        self.assertIs(loader.player_map, interner.player_map, msg)
+        msg = 'Loader fixture map is not the interner fixture map'
+        self.assertIs(loader.fixture_map, interner.fixture_map, msg)
+
+        # and the games should share the competition token string
+        tokens = {id(x.fixture.competition) for x in loader.games}
+        msg = 'Competition token strings not interned'
+        self.assertEqual(len(tokens), 1, msg)
+
+        # and the interner should report the memory saved
+        report = interner.report()
+        msg = 'Interner report before|after error'
+        self.assertLess(report.get('after'), report.get('before'), msg)
+
+    def test_build_game_maps(self):
+        """Batch build game maps.
+        """
+        # Given a batch of TROLS detailed match results pages
+        items = []
+        for match_file in sorted(os.listdir(self._test_dir)):
+            if match_file.endswith('.html'):
+                with open(os.path.join(self._test_dir, match_file), 'rb') as _fh:
+                    items.append((match_file, _fh.read()))
+
+        # and the one at a time game maps
+        loader = interface.Loader()
+        for match_file, html in items:
+            loader.build_game_map(html, match_file)
+        expected = [x() for x in loader.games]
+
+        # when I batch build the game maps over a thread pool
+        loader = interface.Loader()
+        count = loader.build_game_maps(items, executor='thread', workers=2)
+
+        # then every page should be loaded
+        msg = 'Batch game map page count error'
+        self.assertEqual(count, len(items), msg)
+
+        # and the games should match the one at a time load
+        received = [x() for x in loader.games]
+        msg = 'Batch game map games error'
+        self.assertListEqual(received, expected, msg)
+
     def test_request_http(self):
         """Make request to a HTTP resource.
         """
@@ -164,6 +277,12 @@ class TestLoader(unittest.TestCase):
         msg = 'Cached HTML match popup not created'
         self.assertTrue(os.path.exists(cache_file), msg)
 
+        # as the raw HTML bytes
+        with open(cache_file, 'rb') as _fh:
+            received = _fh.read()
+        msg = 'Cached HTML match popup content error'
+        self.assertEqual(received, html.encode('utf-8'), msg)
+
         # Clean up.
         remove_files(get_directory_files_list(cache_dir))
         os.removedirs(cache_dir)
@@ -193,8 +312,8 @@ class TestLoader(unittest.TestCase):
         }
         received = interface.Loader.request(uri, **kwargs)
 
-        # then I should receive a HTML string response
-        with open(html_file) as _fh:
+        # then I should receive the raw HTML response bytes
+        with open(html_file, 'rb') as _fh:
             expected = _fh.read()
             msg = 'Expected a HTML response'
             self.assertEqual(expected, received, msg)
@@ -247,6 +366,468 @@ class TestLoader(unittest.TestCase):
         remove_files(get_directory_files_list(cache_dir))
         os.removedirs(cache_dir)
 
+    def test_request_manifest_saved_to_cache(self):
+        """Make request to a HTTP resource: recorded in the manifest.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a crawl manifest
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        manifest = interface.CrawlManifest(cache_dir_obj.name)
+
+        # when I make a TROLS request
+        match = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        with open(os.path.join(self._test_dir, match), 'rb') as _fh:
+            html = _fh.read()
+
+        response = (200, {'ETag': '"7d1-50f9b5c1"'}, html)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url_conditional',
+                                        return_value=response) as mock_request:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'manifest': manifest,
+            }
+            received = interface.Loader.request(uri, **kwargs)
+
+        # then an unconditional request should be made
+        msg = 'Uncached match popup request should not be conditional'
+        self.assertDictEqual(mock_request.call_args[0][2], {}, msg)
+
+        # and the HTML response should be saved in the cache
+        msg = 'Manifest request response error'
+        self.assertEqual(received, html, msg)
+        msg = 'Cached HTML match popup not created'
+        self.assertTrue(os.path.exists(os.path.join(cache_dir_obj.name, match)),
+                        msg)
+
+        # and recorded in the manifest
+        entry = manifest.get('AA026044')
+        msg = 'Manifest entry error'
+        self.assertEqual(entry['file'], match, msg)
+        self.assertEqual(entry['etag'], '"7d1-50f9b5c1"', msg)
+        self.assertTrue(entry['finalised'], msg)
+
+    def test_request_manifest_finalised(self):
+        """Make request to a HTTP resource: finalised match is not fetched.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a crawl manifest
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        manifest = interface.CrawlManifest(cache_dir_obj.name)
+
+        # and a finalised match popup already cached
+        match_file = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        html_file = os.path.join(self._test_dir, match_file)
+        copy_file(html_file, os.path.join(cache_dir_obj.name, match_file))
+
+        # when I make a TROLS request that overwrites the cache
+        with open(html_file, 'rb') as _fh:
+            expected = _fh.read()
+        response = (200, {}, expected)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url_conditional',
+                                        return_value=response) as mock_request:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'force_cache': True,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'manifest': manifest,
+            }
+            interface.Loader.request(uri, **kwargs)
+
+            # and make the same request again
+            received_again = interface.Loader.request(uri, **kwargs)
+
+        # then the first request should fetch the match popup
+        msg = 'Finalised match popup fetch count error'
+        self.assertEqual(mock_request.call_count, 1, msg)
+
+        # and the second request should read the cache
+        msg = 'Finalised match popup response error'
+        self.assertEqual(received_again, expected, msg)
+
+    def test_request_manifest_not_modified(self):
+        """Make request to a HTTP resource: cached match not modified.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a crawl manifest
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        manifest = interface.CrawlManifest(cache_dir_obj.name)
+
+        # and a match popup without a complete set of scores cached
+        match_file = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        with open(os.path.join(self._test_dir, match_file), 'rb') as _fh:
+            html = _fh.read()
+        html = html.replace(b'>6-', b'>', 1)
+        with open(os.path.join(cache_dir_obj.name, match_file), 'wb') as _fh:
+            _fh.write(html)
+        manifest.record('AA026044',
+                        html,
+                        file_name=match_file,
+                        etag='"7d1-50f9b5c1"',
+                        finalised=False)
+        checked = manifest.get('AA026044')['checked']
+
+        # when I make a TROLS request that has not been modified
+        response = (304, {}, b'')
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url_conditional',
+                                        return_value=response) as mock_request:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'manifest': manifest,
+            }
+            received = interface.Loader.request(uri, **kwargs)
+
+        # then a conditional request should be made
+        expected = {'If-None-Match': '"7d1-50f9b5c1"'}
+        msg = 'Cached match popup request should be conditional'
+        self.assertDictEqual(mock_request.call_args[0][2], expected, msg)
+
+        # and I should receive the cached HTML
+        msg = 'Not modified match popup response error'
+        self.assertEqual(received, html, msg)
+
+        # and the manifest entry should be marked as checked
+        msg = 'Not modified manifest entry not checked'
+        self.assertGreaterEqual(manifest.get('AA026044')['checked'],
+                                checked,
+                                msg)
+
+    def test_request_manifest_force_unconditional(self):
+        """Make request to a HTTP resource: forced fetch is unconditional.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a crawl manifest
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        manifest = interface.CrawlManifest(cache_dir_obj.name)
+
+        # and a match popup without a complete set of scores cached
+        match_file = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        with open(os.path.join(self._test_dir, match_file), 'rb') as _fh:
+            expected = _fh.read()
+        html = expected.replace(b'>6-', b'>', 1)
+        with open(os.path.join(cache_dir_obj.name, match_file), 'wb') as _fh:
+            _fh.write(html)
+        manifest.record('AA026044',
+                        html,
+                        file_name=match_file,
+                        etag='"7d1-50f9b5c1"',
+                        finalised=False)
+
+        # when I make a forced TROLS request
+        response = (200, {}, expected)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url_conditional',
+                                        return_value=response) as mock_request:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'force_cache': True,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'manifest': manifest,
+            }
+            received = interface.Loader.request(uri, **kwargs)
+
+        # then an unconditional request should be made
+        msg = 'Forced match popup request should be unconditional'
+        self.assertDictEqual(mock_request.call_args[0][2], {}, msg)
+
+        # and I should receive the fetched HTML
+        msg = 'Forced match popup response error'
+        self.assertEqual(received, expected, msg)
+
+    def test_request_http_saved_to_pack(self):
+        """Make request to a HTTP resource: saved to a pack.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a pack
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        match = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        with open(os.path.join(self._test_dir, match), 'rb') as _fh:
+            html = _fh.read()
+
+        with trols_stats.PackCache(cache_dir_obj.name) as pack:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'pack': pack,
+            }
+
+            # when I make a TROLS request
+            with unittest.mock.patch.object(interface.Loader,
+                                            '_request_url',
+                                            return_value=html):
+                interface.Loader.request(uri, **kwargs)
+
+            # and make the same request again
+            with unittest.mock.patch.object(interface.Loader,
+                                            '_request_url') as mock_request:
+                received = interface.Loader.request(uri, **kwargs)
+
+            # then the HTML response should be saved in the pack
+            msg = 'Packed HTML match popup content error'
+            self.assertEqual(pack.get(match), html, msg)
+
+        # and not as a HTML file
+        msg = 'Packed HTML match popup should not be a file'
+        self.assertFalse(os.path.exists(os.path.join(cache_dir_obj.name, match)),
+                         msg)
+
+        # and the second request should read the pack
+        msg = 'Packed HTML match popup should not be fetched again'
+        self.assertEqual(mock_request.call_count, 0, msg)
+        self.assertEqual(received, html, msg)
+
+    def test_request_http_saved_to_layout(self):
+        """Make request to a HTTP resource: saved to the sharded layout.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a sharded layout
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        layout = trols_stats.CacheLayout(cache_dir_obj.name)
+
+        # when I make a TROLS request
+        match = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        with open(os.path.join(self._test_dir, match), 'rb') as _fh:
+            html = _fh.read()
+
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url',
+                                        return_value=html):
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'layout': layout,
+            }
+            interface.Loader.request(uri, **kwargs)
+
+        # then the HTML response should be saved in the section shard
+        cache_file = os.path.join(cache_dir_obj.name,
+                                  'nejta',
+                                  'nejta_saturday_am_autumn_2015',
+                                  'AA026',
+                                  match)
+        msg = 'Sharded HTML match popup not created'
+        self.assertTrue(os.path.exists(cache_file), msg)
+
+        # and the section should be in the layout manifest
+        msg = 'Sharded layout manifest section error'
+        self.assertListEqual(layout.sections('nejta_saturday_am_autumn_2015'),
+                             ['AA026'],
+                             msg)
+
+    def test_request_http_failed_not_in_layout(self):
+        """Make request to a HTTP resource: failed request not in layout.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a cache directory with a sharded layout
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        layout = trols_stats.CacheLayout(cache_dir_obj.name)
+
+        # when a TROLS request fails
+        error = urllib.error.HTTPError(uri, 404, 'Not Found', {}, None)
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url',
+                                        side_effect=error):
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'layout': layout,
+            }
+            with self.assertRaises(urllib.error.HTTPError):
+                interface.Loader.request(uri, **kwargs)
+
+        # then the section should not be in the layout manifest
+        msg = 'Failed request section added to the layout manifest'
+        self.assertListEqual(layout.sections('nejta_saturday_am_autumn_2015'),
+                             [],
+                             msg)
+
+    def test_request_http_flat_layout_cached(self):
+        """Make request to a HTTP resource: flat layout file already cached.
+        """
+        # Given a match popup URI
+        uri = 'http://www.trols.org.au/nejta/match_popup.php'
+
+        # and a flat layout cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        match_file = 'nejta_saturday_am_autumn_2015--AA026044.html'
+        html_file = os.path.join(self._test_dir, match_file)
+        copy_file(html_file, os.path.join(cache_dir_obj.name, match_file))
+
+        # when I make a TROLS request through the sharded layout
+        with unittest.mock.patch.object(interface.Loader,
+                                        '_request_url') as mock_request_url:
+            kwargs = {
+                'cache_dir': cache_dir_obj.name,
+                'comp_token': 'nejta_saturday_am_autumn_2015',
+                'match_id': 'AA026044',
+                'layout': trols_stats.CacheLayout(cache_dir_obj.name),
+            }
+            received = interface.Loader.request(uri, **kwargs)
+
+        # then I should receive the flat layout cached HTML
+        with open(html_file, 'rb') as _fh:
+            expected = _fh.read()
+        msg = 'Flat layout cached HTML response error'
+        self.assertEqual(received, expected, msg)
+        self.assertEqual(mock_request_url.call_count, 0, msg)
+
+    def test_request_url_retry(self):
+        """Retry a URL request that fails with a transient error.
+        """
+        # Given a TROLS endpoint that fails once with a server error
+        url = 'http://www.trols.org.au/nejta/match_popup.php'
+        error = urllib.error.HTTPError(url, 503, 'Unavailable', {}, None)
+        pool = unittest.mock.Mock()
+        pool.request.side_effect = [error, b'<html></html>']
+
+        # when I make a URL request
+        budget = interface.RetryBudget(backoff=0.0)
+        with unittest.mock.patch.object(interface.Loader,
+                                        'connection_pool',
+                                        pool),\
+                unittest.mock.patch.object(interface.Loader,
+                                           'retry_budget',
+                                           budget):
+            received = interface.Loader._request_url(url)
+
+        # then the request should be retried
+        msg = 'Transient error request retry error'
+        self.assertEqual(received, b'<html></html>', msg)
+        self.assertEqual(pool.request.call_count, 2, msg)
+        self.assertEqual(budget.retries, 1, msg)
+
+    def test_request_url_no_retry(self):
+        """Do not retry a URL request that fails with a client error.
+        """
+        # Given a TROLS endpoint that fails with a client error
+        url = 'http://www.trols.org.au/nejta/match_popup.php'
+        error = urllib.error.HTTPError(url, 404, 'Not Found', {}, None)
+        pool = unittest.mock.Mock()
+        pool.request.side_effect = error
+
+        # when I make a URL request
+        # then the error should be raised without a retry
+        budget = interface.RetryBudget(backoff=0.0)
+        with unittest.mock.patch.object(interface.Loader,
+                                        'connection_pool',
+                                        pool),\
+                unittest.mock.patch.object(interface.Loader,
+                                           'retry_budget',
+                                           budget):
+            with self.assertRaises(urllib.error.HTTPError):
+                interface.Loader._request_url(url)
+
+        msg = 'Client error request should not be retried'
+        self.assertEqual(pool.request.call_count, 1, msg)
+
+    def test_request_url_retries_spent(self):
+        """Give up on a URL request once the retries are spent.
+        """
+        # Given a TROLS endpoint that keeps timing out
+        url = 'http://www.trols.org.au/nejta/match_popup.php'
+        pool = unittest.mock.Mock()
+        pool.request.side_effect = TimeoutError('timed out')
+
+        # when I make a URL request
+        # then the error should be raised after the maximum retries
+        budget = interface.RetryBudget(max_retries=2, backoff=0.0)
+        with unittest.mock.patch.object(interface.Loader,
+                                        'connection_pool',
+                                        pool),\
+                unittest.mock.patch.object(interface.Loader,
+                                           'retry_budget',
+                                           budget):
+            with self.assertRaises(TimeoutError):
+                interface.Loader._request_url(url)
+
+        msg = 'Request retry count error'
+        self.assertEqual(pool.request.call_count, 3, msg)
+
+    def test_is_transient(self):
+        """Only network errors that may pass are transient.
+        """
+        # Given transient network errors
+        transient = [
+            TimeoutError('timed out'),
+            ConnectionResetError('reset by peer'),
+            ConnectionAbortedError('aborted'),
+            BrokenPipeError('broken pipe'),
+            http.client.RemoteDisconnected('closed'),
+            http.client.IncompleteRead(b''),
+            urllib.error.URLError(TimeoutError('timed out')),
+        ]
+
+        # when I check if they are transient
+        # then they should be retried
+        msg = 'Transient network error not retried'
+        for err in transient:
+            self.assertTrue(interface.Loader._is_transient(err), msg)
+
+        # Given permanent errors
+        permanent = [
+            ssl.SSLCertVerificationError('certificate verify failed'),
+            ssl.SSLError('bad handshake'),
+            ConnectionRefusedError('refused'),
+            PermissionError('permission denied'),
+            FileNotFoundError('no such file'),
+            urllib.error.URLError(ConnectionRefusedError('refused')),
+        ]
+
+        # when I check if they are transient
+        # then they should not be retried
+        msg = 'Permanent error retried'
+        for err in permanent:
+            self.assertFalse(interface.Loader._is_transient(err), msg)
+
+    def test_request_url_refused_no_retry(self):
+        """Do not retry a URL request to a host that refuses connections.
+        """
+        # Given a host that refuses connections
+        url = 'http://www.trols.org.au/nejta/match_popup.php'
+        pool = unittest.mock.Mock()
+        pool.request.side_effect = ConnectionRefusedError('refused')
+
+        # when I make a URL request
+        # then the error should be raised without a retry
+        budget = interface.RetryBudget(backoff=0.0)
+        with unittest.mock.patch.object(interface.Loader,
+                                        'connection_pool',
+                                        pool),\
+                unittest.mock.patch.object(interface.Loader,
+                                           'retry_budget',
+                                           budget):
+            with self.assertRaises(ConnectionRefusedError):
+                interface.Loader._request_url(url)
+
+        msg = 'Refused connection should not be retried'
+        self.assertEqual(pool.request.call_count, 1, msg)
+        self.assertEqual(budget.retries, 0, msg)
+
     def test_request_file(self):
         """Make request to a file resource.
         """
@@ -260,6 +841,26 @@ class TestLoader(unittest.TestCase):
         msg = 'URI request should not return None'
         self.assertIsNotNone(received, msg)
 
+    def test_request_stream_file(self):
+        """Stream a file resource.
+        """
+        # Given a file resource on the local file system.
+        uri_file = 'trols_stats/tests/files/main_results.php'
+
+        # when I make a TROLS stats stream request
+        received = list(interface.Loader.request_stream(uri_file,
+                                                        chunk_size=1024))
+
+        # then the response should arrive in chunks
+        msg = 'Stream request chunk size error'
+        self.assertTrue(all(len(x) <= 1024 for x in received), msg)
+
+        # that reassemble into the file content
+        with open(uri_file, 'rb') as _fh:
+            expected = _fh.read()
+        msg = 'Stream request content error'
+        self.assertEqual(b''.join(received), expected, msg)
+
     @classmethod
     def tearDownClass(cls):
         cls._test_dir = None
@@ -0,0 +1,81 @@
+"""Unit test cases for :class:`CrawlManifest`.
+
+"""
+import unittest
+import os
+import hashlib
+import tempfile
+
+import trols_stats.interface as interface
+
+
+class TestCrawlManifest(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.CrawlManifest object.
+        """
+        manifest = interface.CrawlManifest(tempfile.mkdtemp())
+        msg = 'Object is not a interface.CrawlManifest'
+        self.assertIsInstance(manifest, interface.CrawlManifest, msg)
+
+    def test_record_save_load(self):
+        """Record a match popup and persist the manifest.
+        """
+        # Given a cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = cache_dir_obj.name
+
+        # when I record a match popup download
+        with interface.CrawlManifest(cache_dir) as manifest:
+            kwargs = {
+                'file_name': 'nejta_saturday_am_autumn_2015--AA039054.html',
+                'etag': '"7d1-50f9b5c1"',
+                'last_modified': 'Sat, 28 Feb 2015 09:00:00 GMT',
+                'finalised': True,
+            }
+            manifest.record('AA039054', b'<html></html>', **kwargs)
+
+        # then the manifest should be written to the cache directory
+        msg = 'Crawl manifest file not written'
+        self.assertTrue(os.path.exists(manifest.path), msg)
+
+        # and the entry should be available to the next crawl
+        with interface.CrawlManifest(cache_dir) as manifest:
+            received = manifest.get('AA039054')
+
+        expected = {
+            'file': 'nejta_saturday_am_autumn_2015--AA039054.html',
+            'etag': '"7d1-50f9b5c1"',
+            'last_modified': 'Sat, 28 Feb 2015 09:00:00 GMT',
+            'finalised': True,
+            'sha1': hashlib.sha1(b'<html></html>').hexdigest(),
+        }
+        msg = 'Crawl manifest entry error'
+        for key, value in expected.items():
+            self.assertEqual(received[key], value, msg)
+        self.assertTrue(manifest.is_finalised('AA039054'), msg)
+
+    def test_conditional_headers(self):
+        """Build the conditional request headers of a match.
+        """
+        # Given a manifest with a match popup entry
+        manifest = interface.CrawlManifest(tempfile.mkdtemp())
+        kwargs = {
+            'etag': '"7d1-50f9b5c1"',
+            'last_modified': 'Sat, 28 Feb 2015 09:00:00 GMT',
+        }
+        manifest.record('AA039054', b'<html></html>', **kwargs)
+
+        # when I build the conditional request headers
+        received = manifest.conditional_headers('AA039054')
+
+        # then I should receive the validators of the entry
+        expected = {
+            'If-None-Match': '"7d1-50f9b5c1"',
+            'If-Modified-Since': 'Sat, 28 Feb 2015 09:00:00 GMT',
+        }
+        msg = 'Conditional request headers error'
+        self.assertDictEqual(received, expected, msg)
+
+        # and an unknown match should have no conditional headers
+        msg = 'Unknown match conditional request headers error'
+        self.assertDictEqual(manifest.conditional_headers('AA000000'), {}, msg)
@@ -0,0 +1,94 @@
+"""Unit test cases for :class:`RateLimiter`.
+
+"""
+import unittest
+import time
+
+import trols_stats.interface as interface
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.RateLimiter object.
+        """
+        limiter = interface.RateLimiter()
+        msg = 'Object is not a interface.RateLimiter'
+        self.assertIsInstance(limiter, interface.RateLimiter, msg)
+
+    def test_acquire(self):
+        """Take tokens from the bucket.
+        """
+        # Given a rate limiter with a burst of two requests
+        limiter = interface.RateLimiter(rate=20.0, burst=2)
+
+        # when I take the burst tokens
+        waited = [limiter.acquire() for _ in range(2)]
+
+        # then I should not wait
+        msg = 'Burst tokens should not wait'
+        self.assertListEqual(waited, [0.0, 0.0], msg)
+
+        # when I take another token
+        start = time.monotonic()
+        waited = limiter.acquire()
+
+        # then I should wait for the bucket to refill
+        msg = 'Empty bucket should wait for a token'
+        self.assertGreater(waited, 0.0, msg)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04, msg)
+
+    def test_adapt(self):
+        """Adapt the rate to the server responses.
+        """
+        # Given a rate limiter
+        kwargs = {
+            'rate': 4.0,
+            'min_rate': 1.0,
+            'max_rate': 5.0,
+            'target_latency': 1.0,
+            'cooldown': 0.0,
+        }
+        limiter = interface.RateLimiter(**kwargs)
+
+        # when I receive a quick response
+        limiter.on_success(0.1)
+
+        # then the rate should increase additively
+        msg = 'Quick response rate increase error'
+        self.assertAlmostEqual(limiter.rate, 4.25, msg=msg)
+
+        # when I receive a failed request
+        limiter.on_error()
+
+        # then the rate should decrease multiplicatively
+        msg = 'Failed request rate decrease error'
+        self.assertAlmostEqual(limiter.rate, 2.125, msg=msg)
+
+        # when I receive a slow response
+        limiter.on_success(1.5)
+
+        # then the rate should decrease down to the minimum rate
+        msg = 'Slow response rate decrease error'
+        self.assertAlmostEqual(limiter.rate, 1.0625, msg=msg)
+        limiter.on_error()
+        self.assertEqual(limiter.rate, 1.0, msg)
+
+        # and many quick responses should not pass the maximum rate
+        for _ in range(100):
+            limiter.on_success(0.1)
+        msg = 'Rate increase beyond the maximum rate'
+        self.assertEqual(limiter.rate, 5.0, msg)
+
+    def test_adapt_cooldown(self):
+        """Failed requests in flight together cut the rate once.
+        """
+        # Given a rate limiter
+        limiter = interface.RateLimiter(rate=8.0, cooldown=60.0)
+
+        # when a burst of requests fail
+        for _ in range(4):
+            limiter.on_error()
+
+        # then the rate should only be cut once
+        msg = 'Rate cut more than once within the cooldown'
+        self.assertEqual(limiter.rate, 4.0, msg)
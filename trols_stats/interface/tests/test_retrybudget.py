@@ -0,0 +1,57 @@
+"""Unit test cases for :class:`RetryBudget`.
+
+"""
+import unittest
+
+import trols_stats.interface as interface
+
+
+class TestRetryBudget(unittest.TestCase):
+    def test_init(self):
+        """Initialise a interface.RetryBudget object.
+        """
+        budget = interface.RetryBudget()
+        msg = 'Object is not a interface.RetryBudget'
+        self.assertIsInstance(budget, interface.RetryBudget, msg)
+
+    def test_withdraw(self):
+        """Spend the retry budget.
+        """
+        # Given a retry budget of two tokens
+        budget = interface.RetryBudget(max_retries=3, ratio=0.5, reserve=2.0)
+
+        # when I retry beyond the budget
+        received = [budget.withdraw(1) for _ in range(3)]
+
+        # then the retries should stop once the budget is spent
+        msg = 'Spent retry budget error'
+        self.assertListEqual(received, [True, True, False], msg)
+        self.assertEqual(budget.refused, 1, msg)
+
+        # when new requests earn tokens
+        budget.deposit()
+        budget.deposit()
+
+        # then a retry should be allowed again
+        msg = 'Earned retry budget error'
+        self.assertTrue(budget.withdraw(1), msg)
+
+        # but not beyond the maximum retries of the one request
+        budget.deposit()
+        budget.deposit()
+        msg = 'Retry beyond the maximum retries should be refused'
+        self.assertFalse(budget.withdraw(4), msg)
+
+    def test_delay(self):
+        """Exponential backoff with jitter.
+        """
+        # Given a retry budget
+        budget = interface.RetryBudget(backoff=0.5, max_backoff=3.0)
+
+        # when I calculate the backoff delays
+        for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (6, 3.0)):
+            delays = [budget.delay(attempt) for _ in range(50)]
+
+            # then each delay should be within the backoff ceiling
+            msg = 'Retry {} backoff delay error'.format(attempt)
+            self.assertTrue(all(0 <= x <= ceiling for x in delays), msg)
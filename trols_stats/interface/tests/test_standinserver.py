@@ -0,0 +1,125 @@
+"""Unit test cases for :class:`StandInServer`.
+
+"""
+import unittest
+import os
+import urllib.error
+
+import trols_stats.interface as interface
+
+
+class TestStandInServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._corpus_dir = os.path.join('trols_stats', 'tests', 'files')
+        cls._server = interface.StandInServer(cls._corpus_dir, strict=True)
+        cls._server.start()
+
+    def test_init(self):
+        """Initialise a interface.StandInServer object.
+        """
+        server = interface.StandInServer(self._corpus_dir)
+        msg = 'Object is not a interface.StandInServer'
+        self.assertIsInstance(server, interface.StandInServer, msg)
+
+    def test_trols_urls(self):
+        """Leagues and competitions of the corpus.
+        """
+        # When I list the corpus competitions
+        received = self._server.trols_urls()
+
+        # then I should receive the config trols_urls form
+        expected = {'nejta': 'AA'}
+        msg = 'Stand-in server trols_urls error'
+        self.assertDictEqual(received, expected, msg)
+
+    def test_results_page(self):
+        """Serve the league results page.
+        """
+        # Given the stand-in results URL
+        url = self._server.results_url.format('nejta')
+
+        # when I post a section request
+        pool = interface.ConnectionPool()
+        with pool:
+            received = pool.request('POST', url, body=b'section=AA039')
+
+        # then I should receive the corpus results page
+        path = os.path.join(self._corpus_dir,
+                            'www.trols.org.au',
+                            'nejta',
+                            'results.php')
+        with open(path, 'rb') as _fh:
+            expected = _fh.read()
+        msg = 'Stand-in results page error'
+        self.assertEqual(received, expected, msg)
+
+    def test_match_popup(self):
+        """Serve a match popup with revalidation.
+        """
+        # Given the stand-in match popup URL
+        url = '{}?matchid=AA039054'.format(self._server.popup_url.format('nejta'))
+
+        # when I request the match popup
+        pool = interface.ConnectionPool()
+        with pool:
+            status, headers, received = pool.fetch('POST', url)
+
+            # and revalidate it
+            revalidate = {'If-None-Match': headers.get('ETag')}
+            not_modified = pool.fetch('POST', url, headers=revalidate)[0]
+
+        # then I should receive the corpus match popup
+        path = os.path.join(self._corpus_dir, 'match_AA039054.html')
+        with open(path, 'rb') as _fh:
+            expected = _fh.read()
+        msg = 'Stand-in match popup error'
+        self.assertEqual(received, expected, msg)
+
+        # and the revalidation should not be modified
+        msg = 'Stand-in match popup revalidation error'
+        self.assertEqual(not_modified, 304, msg)
+
+    def test_match_popup_unknown(self):
+        """Unknown match popup of a strict server.
+        """
+        # Given an unknown match ID
+        url = '{}?matchid=ZZ000000'.format(self._server.popup_url.format('nejta'))
+
+        # when I request the match popup
+        pool = interface.ConnectionPool()
+        with pool, self.assertRaises(urllib.error.HTTPError) as context:
+            pool.request('POST', url)
+
+        # then I should receive a Not Found
+        msg = 'Stand-in unknown match popup status error'
+        self.assertEqual(context.exception.code, 404, msg)
+
+    def test_error_rate(self):
+        """Injected server errors.
+        """
+        # Given a server that fails every request
+        kwargs = {
+            'error_rate': 1.0,
+            'seed': 0,
+        }
+        with interface.StandInServer(self._corpus_dir, **kwargs) as server:
+            url = server.results_url.format('nejta')
+
+            # when I make a request
+            pool = interface.ConnectionPool()
+            with pool, self.assertRaises(urllib.error.HTTPError) as context:
+                pool.request('POST', url)
+
+            # then I should receive a Service Unavailable
+            msg = 'Stand-in injected error status error'
+            self.assertEqual(context.exception.code, 503, msg)
+
+            # and the error should be counted
+            msg = 'Stand-in injected error count error'
+            self.assertTupleEqual((server.requests, server.errors), (1, 1), msg)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._server.stop()
+        cls._server = None
@@ -0,0 +1,212 @@
+""":class:`trols_stats.Interner`
+
+"""
+import sys
+import logging
+
+import trols_stats
+
+__all__ = ['Interner']
+
+
+class Interner(object):
+    """Corpus wide identity maps of the data model entities.
+
+    One :class:`Interner` lives for a whole
+    :class:`trols_stats.interface.Loader` run.  Each player, fixture and
+    repeated string such as a team name, section or competition token
+    is then held once however many matches refer to it.  The games
+    pickled into the shelve share the objects, so the pickle memo
+    stores each of them once.
+
+    :attr:`player_map` and :attr:`fixture_map` are the
+    :attr:`trols_stats.Stats.player_map` and
+    :attr:`trols_stats.Stats.fixture_map` of every match loaded.
+
+    .. attribute:: player_map
+        dictionary of ``(name, team)`` tuples and their
+        :class:`trols_stats.model.entities.Player` object
+
+    .. attribute:: fixture_map
+        dictionary of :meth:`trols_stats.Stats.fixture_key` tuples and
+        their :class:`trols_stats.model.entities.Fixture` object
+
+    .. attribute:: strings
+        number of distinct strings held
+
+    .. attribute:: before
+        estimated bytes of the entities and strings had each match kept
+        its own copies
+
+    .. attribute:: after
+        estimated bytes of the interned entities and strings
+
+    """
+    @property
+    def player_map(self):
+        return self.__player_map
+
+    @property
+    def fixture_map(self):
+        return self.__fixture_map
+
+    @property
+    def strings(self):
+        return len(self.__strings)
+
+    @property
+    def before(self):
+        return self.__before
+
+    @property
+    def after(self):
+        entities = (list(self.__player_map.values())
+                    + list(self.__fixture_map.values()))
+
+        return (self.__string_bytes
+                + sum(Interner.sizeof(x) for x in entities))
+
+    def __init__(self):
+        self.__player_map = {}
+        self.__fixture_map = {}
+        self.__strings = {}
+        self.__before = 0
+        self.__string_bytes = 0
+        self.__nobody = None
+
+    def string(self, value):
+        """Canonical copy of *value*.  Values other than :class:`str`
+        are returned as is.
+
+        """
+        if not isinstance(value, str):
+            return value
+
+        size = sys.getsizeof(value)
+        self.__before += size
+
+        canonical = self.__strings.get(value)
+        if canonical is None:
+            canonical = self.__strings[value] = value
+            self.__string_bytes += size
+
+        return canonical
+
+    def match(self, match):
+        """Intern the strings of a :meth:`trols_stats.Scraper.parse_match`
+        *match* structure.
+
+        **Returns:**
+            a copy of *match* that refers to the canonical strings.  The
+            scores are shared with *match*
+
+        """
+        return {
+            'teams': {k: self.string(v)
+                      for k, v in match.get('teams').items()},
+            'players': [(code, self.string(name))
+                        for code, name in match.get('players')],
+            'preamble': {k: self.string(v)
+                         for k, v in match.get('preamble').items()},
+            'scores': match.get('scores'),
+        }
+
+    def player(self, player):
+        """Canonical :class:`trols_stats.model.entities.Player` object of
+        *player*.  The empty team mates of the singles games share the
+        one empty player, which is not held in :attr:`player_map`.
+
+        """
+        if player is None:
+            return None
+
+        if player.name is None and player.team is None:
+            if self.__nobody is None:
+                self.__nobody = player
+            return self.__nobody
+
+        key = (self.string(player.name), self.string(player.team))
+        canonical = self.__player_map.get(key)
+        if canonical is None:
+            canonical = self.__player_map[key] = player
+
+        return canonical
+
+    def fixture(self, fixture):
+        """Canonical :class:`trols_stats.model.entities.Fixture` object of
+        *fixture*.
+
+        """
+        key = trols_stats.Stats.fixture_key(fixture())
+        canonical = self.__fixture_map.get(key)
+        if canonical is None:
+            canonical = self.__fixture_map[key] = fixture
+
+        return canonical
+
+    def games(self, games):
+        """Point the *games* of a batch of matches at the canonical
+        players and fixtures.  Also merges games that were loaded with
+        other identity maps.  For example, by a worker process.
+
+        The entities of the batch are counted in :attr:`before` once
+        each, as a batch keeps its own copies.
+
+        **Returns:**
+            *games*
+
+        """
+        batch = {}
+        for game in games:
+            players = (game.player, game.team_mate) + tuple(game.opposition)
+            for player in players:
+                if player is not None:
+                    batch.setdefault(id(player), player)
+            batch.setdefault(id(game.fixture), game.fixture)
+
+            game.fixture = self.fixture(game.fixture)
+            game.player = self.player(game.player)
+            game.team_mate = self.player(game.team_mate)
+            game.opposition = tuple(self.player(x) for x in game.opposition)
+
+        self.__before += sum(Interner.sizeof(x) for x in batch.values())
+
+        return games
+
+    def report(self):
+        """Sizes of the identity maps and the memory saved.
+
+        **Returns:**
+            dictionary of the ``players``, ``fixtures`` and ``strings``
+            counts and the estimated ``before`` and ``after`` bytes
+
+        """
+        return {
+            'players': len(self.__player_map),
+            'fixtures': len(self.__fixture_map),
+            'strings': self.strings,
+            'before': self.before,
+            'after': self.after,
+        }
+
+    def log_report(self):
+        """Log the :meth:`report`.
+
+        """
+        logging.info('Interned %(players)d players, %(fixtures)d fixtures '
+                     'and %(strings)d strings: '
+                     '%(before)d bytes before|%(after)d bytes after',
+                     self.report())
+
+    @staticmethod
+    def sizeof(obj):
+        """Shallow size in bytes of the entity *obj* and its attribute
+        dictionary.
+
+        """
+        size = sys.getsizeof(obj)
+        attributes = getattr(obj, '__dict__', None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+
+        return size
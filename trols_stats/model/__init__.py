@@ -1,3 +1,4 @@
 """Support shorthand import of our classes into the namespace.
 """
 from .base import Base
+from .frozen import Frozen
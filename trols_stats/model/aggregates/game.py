@@ -5,6 +5,10 @@ import trols_stats.model.entities as entities
 
 __all__ = ['Game']
 
+# Separator of the player token parts.  For example,
+# Isabella Markovski~Watsonia~12~girls~saturday_am_spring_2015
+TOKEN_SEPARATOR = '~'
+
 
 class Game(trols_stats.model.Base):
     """
@@ -22,7 +26,28 @@ class Game(trols_stats.model.Base):
 
     .. attribute:: player_won
 
+    .. attribute:: token
+        player token of the form
+        ``<name>~<team>~<section>~<competition_type>~<competition>``.
+        Worked out when the game is created or its player or fixture is
+        replaced, and stored on the game.  A change to the values of a
+        shared player or fixture bumps the
+        :attr:`trols_stats.model.Base.generation`, so the stored token
+        is checked again on its next read
+
+    .. attribute:: token_parts
+        tuple of the :attr:`token` name, team, section, competition type
+        and competition values
+
     """
+    __slots__ = ('__fixture',
+                 '__player',
+                 '__team_mate',
+                 '__opposition',
+                 '__score_for',
+                 '__score_against',
+                 '__player_won',
+                 '__token')
 
     def __init__(self,
                  fixture=None,
@@ -39,6 +64,7 @@ class Game(trols_stats.model.Base):
         self.__score_for = score_for
         self.__score_against = score_against
         self.__player_won = None
+        self.__tokenise()
 
         logging.debug('SF|SA: %s|%s', self.__score_for, self.__score_against)
         if (self.__score_for is not None
@@ -81,6 +107,7 @@ class Game(trols_stats.model.Base):
     @fixture.setter
     def fixture(self, value):
         self.__fixture = Game.set_fixture(value)
+        self.__tokenise()
 
     @property
     def player(self):
@@ -89,6 +116,7 @@ class Game(trols_stats.model.Base):
     @player.setter
     def player(self, value):
         self.__player = Game.set_player(value)
+        self.__tokenise()
 
     @property
     def team_mate(self):
@@ -130,6 +158,61 @@ class Game(trols_stats.model.Base):
     def player_won(self, value):
         self.__player_won = value
 
+    @property
+    def token(self):
+        stored = self.__token
+        if stored[2] != trols_stats.model.Base.generation:
+            stored = self.__tokenise()
+
+        return stored[0]
+
+    @property
+    def token_parts(self):
+        stored = self.__token
+        if stored[2] != trols_stats.model.Base.generation:
+            stored = self.__tokenise()
+
+        return stored[1]
+
+    def __tokenise(self):
+        """Store the :attr:`token` and :attr:`token_parts` of the game
+        along with the :attr:`trols_stats.model.Base.generation` that
+        they are current for.  The token is formatted again only when
+        the player or fixture values have changed.
+
+        **Returns:** tuple of the token, the token parts and the
+        generation
+
+        """
+        generation = trols_stats.model.Base.generation
+        parts = (
+            self.__player.name,
+            self.__player.team,
+            self.__fixture.section,
+            self.__fixture.competition_type,
+            self.__fixture.competition,
+        )
+        stored = getattr(self, '_Game__token', None)
+        if stored is None or stored[1] != parts:
+            token = Game.join_token(parts)
+        else:
+            token, parts = stored[:2]
+        stored = self.__token = (token, parts, generation)
+
+        return stored
+
+    def __getstate__(self):
+        # The token is derived, so leave it out to keep the pickle the
+        # same as that of the earlier classes.
+        state = super().__getstate__()
+        state.pop('_Game__token', None)
+
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__tokenise()
+
     def compact_match(self):
         """Returns a simple, compact representation of the object instance.
 
@@ -159,7 +242,7 @@ class Game(trols_stats.model.Base):
         return fixture
 
     def __str__(self):
-        return str(self.__dict__)
+        return str(self.__getstate__())
 
     def __eq__(self, other):
         player = {
@@ -174,21 +257,15 @@ class Game(trols_stats.model.Base):
         identify a player.
 
         """
-        args = (
-            self.player.name,
-            self.player.team,
-            self.fixture.section,
-            self.fixture.competition_type,
-            self.fixture.competition
-        )
+        (name, team, section, competition_type, competition) = self.token_parts
 
         return {
-            'name': self.player.name,
-            'team': self.player.team,
-            'section': self.fixture.section,
-            'competition_type': self.fixture.competition_type,
-            'competition': self.fixture.competition,
-            'token': '{}~{}~{}~{}~{}'.format(*args)
+            'name': name,
+            'team': team,
+            'section': section,
+            'competition_type': competition_type,
+            'competition': competition,
+            'token': self.token,
         }
 
     def is_singles(self):
@@ -302,3 +379,50 @@ class Game(trols_stats.model.Base):
             fixture = data
 
         return fixture
+
+    @staticmethod
+    def join_token(parts):
+        """Player token of the *parts* tuple of name, team, section,
+        competition type and competition values.
+
+        """
+        return TOKEN_SEPARATOR.join(str(x) for x in parts)
+
+    @staticmethod
+    def split_token(token):
+        """Split *token* into its name, team, section, competition type
+        and competition strings.
+
+        **Returns:** tuple of the five token parts
+
+        """
+        return tuple(token.split(TOKEN_SEPARATOR))
+
+    @staticmethod
+    def group_by_token(games, groups=None):
+        """Group *games* by their stored :attr:`token`.
+
+        **Args:**
+            *games*: iterable of :class:`trols_stats.model.aggregates.Game`
+
+        **Kwargs:**
+            *groups*: dictionary of tokens and their list of games to
+            add to.  For example, the groups of an earlier batch
+
+        **Returns:**
+            dictionary of player tokens and their list of games in
+            *games* order
+
+        """
+        if groups is None:
+            groups = {}
+
+        for game in games:
+            token = game.token
+            group = groups.get(token)
+            if group is None:
+                group = groups[token] = []
+            group.append(game)
+
+        return groups
+
@@ -2,8 +2,10 @@
 
 """
 import unittest
+import unittest.mock
 import os
 import json
+import pickle
 import datetime
 
 import trols_stats.model.entities as entities
@@ -322,6 +324,217 @@ class TestGame(unittest.TestCase):
         msg = 'Compact match format error: singles'
         self.assertDictEqual(received, expected, msg)
 
+    def test_slots(self):
+        """Game and its entities hold no instance __dict__.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when I check its objects for an instance __dict__
+        objects = [game, game.player, game.team_mate, game.fixture]
+        objects.extend(game.opposition)
+
+        # then none should have one
+        msg = 'Data model object has an instance __dict__'
+        for obj in objects:
+            self.assertFalse(hasattr(obj, '__dict__'), msg)
+
+    def test_pickle(self):
+        """Pickle round trip of a slotted Game.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the game is pickled and restored
+        received = pickle.loads(pickle.dumps(game))
+
+        # then the restored game should match the original
+        msg = 'Pickled Game round trip error'
+        self.assertDictEqual(received(), game(), msg)
+
+        # and the state should be keyed as the earlier instance __dict__
+        msg = 'Game pickle state not keyed by the mangled attribute names'
+        self.assertIn('_Game__fixture', game.__getstate__(), msg)
+
+    def test_unpickle_legacy(self):
+        """Unpickle Game objects written before the __slots__ change.
+        """
+        # Given games pickled by the earlier __dict__ based classes
+        legacy_file = os.path.join(self._files_dir, 'legacy_games.pickle')
+
+        # when the pickle is loaded
+        with open(legacy_file, 'rb') as _fh:
+            received = pickle.load(_fh)
+
+        # then I should receive the same games
+        expected = [
+            trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES),
+            trols_stats.model.aggregates.Game(**game_aggregates.SINGLES),
+        ]
+        msg = 'Legacy Game pickle load error'
+        self.assertListEqual([x() for x in received],
+                             [x() for x in expected],
+                             msg)
+
+    def test_token(self):
+        """Game player token is worked out on creation.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when I check the token
+        received = game.token
+
+        # then it should match the player_id token
+        expected = 'Madeline Doyle~Watsonia Red~14~girls~saturday_am_autumn_2015'
+        msg = 'Game token error'
+        self.assertEqual(received, expected, msg)
+        self.assertEqual(game.player_id().get('token'), expected, msg)
+
+        # and the parts should split from the token
+        msg = 'Game token parts error'
+        self.assertTupleEqual(game.token_parts,
+                              ('Madeline Doyle',
+                               'Watsonia Red',
+                               14,
+                               'girls',
+                               'saturday_am_autumn_2015'),
+                              msg)
+        self.assertTupleEqual(
+            trols_stats.model.aggregates.Game.split_token(received),
+            ('Madeline Doyle',
+             'Watsonia Red',
+             '14',
+             'girls',
+             'saturday_am_autumn_2015'),
+            msg)
+
+    def test_token_player_changed(self):
+        """Game player token follows a new player.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the player is replaced
+        game.player = {'name': 'Tara Watson', 'team': 'Watsonia Red'}
+
+        # then the token should name the new player
+        expected = 'Tara Watson~Watsonia Red~14~girls~saturday_am_autumn_2015'
+        msg = 'Game token not updated with the player'
+        self.assertEqual(game.token, expected, msg)
+
+    def test_token_cached(self):
+        """Game token is cached on the game.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the token is read twice
+        received = (game.token, game.token)
+
+        # then both reads should return the one cached string
+        msg = 'Game token not cached'
+        self.assertIs(received[0], received[1], msg)
+
+    def test_token_stored_on_creation(self):
+        """Game token is worked out once, when the game is created.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the token and its parts are read
+        Game = trols_stats.model.aggregates.Game
+        with unittest.mock.patch.object(Game,
+                                        'join_token',
+                                        wraps=Game.join_token) as mock_join:
+            game.token
+            game.token_parts
+
+        # then the token should not be formatted again
+        msg = 'Game token formatted again on read'
+        self.assertEqual(mock_join.call_count, 0, msg)
+
+    def test_token_shared_player_changed(self):
+        """Game token follows a change to a shared player.
+        """
+        # Given two games that share the one Player object
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+        game_2 = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+        game_2.player = game.player
+        tokens = (game.token, game_2.token)
+
+        # when the shared player is renamed
+        game.player.name = 'Tara Watson'
+
+        # then the token of both games should name the new player
+        expected = 'Tara Watson~Watsonia Red~14~girls~saturday_am_autumn_2015'
+        msg = 'Stale Game token after a shared player change'
+        self.assertNotEqual(tokens[0], expected, msg)
+        self.assertEqual(game.token, expected, msg)
+        self.assertEqual(game_2.token, expected, msg)
+
+        # and the games should group under the new token
+        received = trols_stats.model.aggregates.Game.group_by_token(
+            [game, game_2])
+        msg = 'Games grouped under a stale token'
+        self.assertListEqual(list(received.keys()), [expected], msg)
+
+    def test_token_shared_fixture_changed(self):
+        """Game token follows a change to a shared fixture.
+        """
+        # Given a game with a cached token
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+        game.token
+
+        # when the section of its fixture is changed
+        game.fixture.section = 15
+
+        # then the token should show the new section
+        expected = 'Madeline Doyle~Watsonia Red~15~girls~saturday_am_autumn_2015'
+        msg = 'Stale Game token after a shared fixture change'
+        self.assertEqual(game.token, expected, msg)
+
+    def test_group_by_token(self):
+        """Group games by their player token.
+        """
+        # Given doubles and singles games
+        doubles = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+        singles = trols_stats.model.aggregates.Game(**game_aggregates.SINGLES)
+        doubles_2 = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the games are grouped
+        received = trols_stats.model.aggregates.Game.group_by_token(
+            [doubles, singles, doubles_2])
+
+        # then each player token should hold its games in order
+        expected = {
+            doubles.token: [doubles, doubles_2],
+            singles.token: [singles],
+        }
+        msg = 'Games grouped by token error'
+        self.assertListEqual(list(received.keys()), list(expected.keys()), msg)
+        for token, games in expected.items():
+            self.assertListEqual([id(x) for x in received[token]],
+                                 [id(x) for x in games],
+                                 msg)
+
+    def test_token_pickle(self):
+        """Game token is restored but not pickled.
+        """
+        # Given a doubles game
+        game = trols_stats.model.aggregates.Game(**game_aggregates.DOUBLES)
+
+        # when the game is pickled and restored
+        received = pickle.loads(pickle.dumps(game))
+
+        # then the token should be worked out again
+        msg = 'Unpickled Game token error'
+        self.assertEqual(received.token, game.token, msg)
+
+        # and not be part of the pickled state
+        msg = 'Game token should not be pickled'
+        self.assertNotIn('_Game__token', game.__getstate__(), msg)
+
     @classmethod
     def tearDownClass(cls):
         cls._files_dir = None
@@ -10,8 +10,66 @@ __all__ = ['Base']
 class Base(object):
     """This is a abstract class that must be inherited.
 
+    Data model classes hold their attributes in ``__slots__`` rather
+    than a per-instance ``__dict__``.  The pickled state is the
+    dictionary of the mangled attribute names that the ``__dict__`` of
+    the earlier classes held, so that existing shelves still load and
+    new ones can be read by the earlier classes.
+
     """
     __metaclass__ = abc.ABCMeta
 
+    __slots__ = ()
+
+    # Bumped on a change to an entity value that a derived value is
+    # worked out from.  For example, the name of a player that is part
+    # of the trols_stats.model.aggregates.Game player token.
+    generation = 0
+
     def to_json(self):
         return json.dumps(self())
+
+    def __getstate__(self):
+        state = {}
+        for name in Base.slot_names(type(self)):
+            try:
+                state[name] = getattr(self, name)
+            except AttributeError:
+                pass
+
+        return state
+
+    def __setstate__(self, state):
+        # Slotted objects pickled with the default protocol 2 reduce
+        # carry a (dict, slots) pair.
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = dict(dict_state or {})
+            state.update(slot_state or {})
+
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def touch():
+        """Flag a change to an entity value that derived values are
+        worked out from.  Derived values cached at an earlier
+        :attr:`generation` are checked again on their next read.
+
+        """
+        Base.generation += 1
+
+    @staticmethod
+    def slot_names(cls):
+        """Mangled attribute names of the ``__slots__`` of *cls* and its
+        base classes.  For example, ``_Player__name``.
+
+        """
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_{}{}'.format(klass.__name__.lstrip('_'), name)
+                names.append(name)
+
+        return names
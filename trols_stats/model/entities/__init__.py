@@ -1,5 +1,5 @@
 """Support shorthand import of our classes into the namespace.
 """
-from .fixture import Fixture
-from .player import Player
-from .matchround import MatchRound
+from .fixture import Fixture, FrozenFixture
+from .player import Player, FrozenPlayer
+from .matchround import MatchRound, FrozenMatchRound
@@ -5,7 +5,7 @@ import trols_stats.model
 import time
 import datetime
 
-__all__ = ['Fixture']
+__all__ = ['Fixture', 'FrozenFixture']
 
 
 class Fixture(trols_stats.model.Base):
@@ -26,6 +26,14 @@ class Fixture(trols_stats.model.Base):
     .. attribute:: away_team
 
     """
+    __slots__ = ('__round',
+                 '__competition_type',
+                 '__competition',
+                 '__section',
+                 '__date',
+                 '__home_team',
+                 '__away_team')
+
     @property
     def match_round(self):
         return self.__round()
@@ -47,6 +55,7 @@ class Fixture(trols_stats.model.Base):
     @competition_type.setter
     def competition_type(self, value):
         self.__competition_type = value
+        trols_stats.model.Base.touch()
 
     @property
     def competition(self):
@@ -55,6 +64,7 @@ class Fixture(trols_stats.model.Base):
     @competition.setter
     def competition(self, value):
         self.__competition = value
+        trols_stats.model.Base.touch()
 
     @property
     def section(self):
@@ -63,6 +73,7 @@ class Fixture(trols_stats.model.Base):
     @section.setter
     def section(self, value):
         self.__section = value
+        trols_stats.model.Base.touch()
 
     @property
     def date(self):
@@ -131,10 +142,18 @@ class Fixture(trols_stats.model.Base):
             }
             is_same = fixture == other
         else:
-            is_same = self.__dict__ == other.__dict__
+            is_same = self.__getstate__() == other.__getstate__()
 
         return is_same
 
+    def freeze(self):
+        """Immutable, hashable copy of the fixture.
+
+        **Returns:** :class:`trols_stats.model.entities.FrozenFixture`
+
+        """
+        return FrozenFixture(**self())
+
     def comvert_match_date(self):
         """Convert a NEJTA date format to a more human readable form.
 
@@ -152,3 +171,46 @@ class Fixture(trols_stats.model.Base):
             dt = datetime.datetime.fromtimestamp(time.mktime(time_struct))
 
         return dt
+
+
+class FrozenFixture(trols_stats.model.Frozen, Fixture):
+    """Immutable, hashable :class:`trols_stats.model.entities.Fixture`.
+    The match round is a
+    :class:`trols_stats.model.entities.FrozenMatchRound`.
+
+    .. attribute:: key
+        tuple of the ``competition``, ``competition_type``,
+        ``section``, ``match_round``, ``date``, ``home_team`` and
+        ``away_team`` values.  The same order as
+        :meth:`trols_stats.Stats.fixture_key`
+
+    """
+    __slots__ = ('_frozen_hash',)
+
+    @property
+    def key(self):
+        return (self.competition,
+                self.competition_type,
+                self.section,
+                self.match_round,
+                self.date,
+                self.home_team,
+                self.away_team)
+
+    def __init__(self,
+                 match_round=None,
+                 competition_type=None,
+                 competition=None,
+                 section=None,
+                 date=None,
+                 home_team=None,
+                 away_team=None):
+        super().__init__(competition_type=competition_type,
+                         competition=competition,
+                         section=section,
+                         date=date,
+                         home_team=home_team,
+                         away_team=away_team)
+        match_round = trols_stats.model.entities.FrozenMatchRound(match_round)
+        object.__setattr__(self, '_Fixture__round', match_round)
+        self.seal()
@@ -5,7 +5,7 @@ import re
 
 import trols_stats.model
 
-__all__ = ['MatchRound']
+__all__ = ['MatchRound', 'FrozenMatchRound']
 
 
 class MatchRound(trols_stats.model.Base):
@@ -15,6 +15,8 @@ class MatchRound(trols_stats.model.Base):
     string representations such as "Semi Final", "Prelim Final" and "Grand Final".
 
     """
+    __slots__ = ('__match_round', '__match_round_numeric')
+
     def __init__(self, match_round=None):
         """Take string representation of match round and create a numeric
         equivalent.
@@ -39,3 +41,29 @@ class MatchRound(trols_stats.model.Base):
             value = self.__match_round_numeric
 
         return value
+
+    def freeze(self):
+        """Immutable, hashable copy of the match round.
+
+        **Returns:** :class:`trols_stats.model.entities.FrozenMatchRound`
+
+        """
+        return FrozenMatchRound(self())
+
+
+class FrozenMatchRound(trols_stats.model.Frozen, MatchRound):
+    """Immutable, hashable :class:`trols_stats.model.entities.MatchRound`.
+
+    .. attribute:: key
+        tuple of the match round value
+
+    """
+    __slots__ = ('_frozen_hash',)
+
+    @property
+    def key(self):
+        return (self(),)
+
+    def __init__(self, match_round=None):
+        super().__init__(match_round=match_round)
+        self.seal()
@@ -1,6 +1,6 @@
 import trols_stats.model
 
-__all__ = ['Player']
+__all__ = ['Player', 'FrozenPlayer']
 
 
 class Player(trols_stats.model.Base):
@@ -10,6 +10,8 @@ class Player(trols_stats.model.Base):
     .. attribute:: team
 
     """
+    __slots__ = ('__name', '__team')
+
     @property
     def name(self):
         return self.__name
@@ -17,6 +19,7 @@ class Player(trols_stats.model.Base):
     @name.setter
     def name(self, value):
         self.__name = value
+        trols_stats.model.Base.touch()
 
     @property
     def team(self):
@@ -25,6 +28,7 @@ class Player(trols_stats.model.Base):
     @team.setter
     def team(self, value):
         self.__team = value
+        trols_stats.model.Base.touch()
 
     def __init__(self, name=None, team=None):
 
@@ -44,6 +48,34 @@ class Player(trols_stats.model.Base):
             player = {'name': self.name, 'team': self.team}
             is_same = player == other
         else:
-            is_same = self.__dict__ == other.__dict__
+            is_same = self.__getstate__() == other.__getstate__()
 
         return is_same
+
+    def freeze(self):
+        """Immutable, hashable copy of the player.
+
+        **Returns:** :class:`trols_stats.model.entities.FrozenPlayer`
+
+        """
+        return FrozenPlayer(**self())
+
+
+class FrozenPlayer(trols_stats.model.Frozen, Player):
+    """Immutable, hashable :class:`trols_stats.model.entities.Player`.
+    Frozen players of the same name and team are equal and can be used
+    as dictionary keys or set members.
+
+    .. attribute:: key
+        tuple of the player ``name`` and ``team``
+
+    """
+    __slots__ = ('_frozen_hash',)
+
+    @property
+    def key(self):
+        return (self.name, self.team)
+
+    def __init__(self, name=None, team=None):
+        super().__init__(name=name, team=team)
+        self.seal()
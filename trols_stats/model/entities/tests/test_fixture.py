@@ -50,3 +50,42 @@ class TestFixture(unittest.TestCase):
         }
         msg = 'trols_stats.model.entities.Fixture() to JSON error'
         self.assertDictEqual(received, expected, msg)
+
+    def test_freeze(self):
+        """Frozen trols_stats.model.entities.Fixture is hashable.
+        """
+        # Given two fixtures of the same match
+        fixture_data = {
+            'competition': 'saturday_am_autumn_2015',
+            'competition_type': 'girls',
+            'section': 14,
+            'date': '28 Feb 15',
+            'match_round': 5,
+            'home_team': 'Watsonia Red',
+            'away_team': 'St Marys',
+        }
+        fixture = trols_stats.model.entities.Fixture(**fixture_data)
+
+        # when they are frozen
+        frozen = fixture.freeze()
+        frozen_2 = trols_stats.model.entities.FrozenFixture(**fixture_data)
+
+        # then they should index the one dictionary entry
+        index = {frozen: 'first'}
+        index[frozen_2] = 'second'
+        msg = 'Frozen Fixture objects should share the one key'
+        self.assertDictEqual(index, {frozen: 'second'}, msg)
+
+        # and the match round should be frozen too
+        msg = 'Frozen Fixture match round not frozen'
+        self.assertEqual(frozen.match_round, 5, msg)
+        self.assertEqual(frozen.match_round_numeric, 5, msg)
+
+        # and the fixture cannot be changed
+        with self.assertRaises(AttributeError):
+            frozen.match_round = 6
+
+        # and keep the call output
+        msg = 'Frozen Fixture call output error'
+        self.assertDictEqual(frozen(), fixture(), msg)
+
@@ -101,3 +101,23 @@ class TestMatchRound(unittest.TestCase):
         # and the numeric representation should be 10000
         msg = 'Numeric representation of Match Round (Grand Final) error'
         self.assertEqual(received, 10000, msg)
+
+    def test_freeze(self):
+        """Frozen trols_stats.model.entities.MatchRound is hashable.
+        """
+        # Given a "Grand Final" match round
+        match_round = trols_stats.model.entities.MatchRound('Grand Final')
+
+        # when it is frozen
+        received = match_round.freeze()
+
+        # then it should equal another frozen "Grand Final"
+        expected = trols_stats.model.entities.FrozenMatchRound('Grand Final')
+        msg = 'Frozen MatchRound objects should be equal'
+        self.assertEqual(received, expected, msg)
+        self.assertEqual(hash(received), hash(expected), msg)
+
+        # and keep the numeric value
+        msg = 'Frozen MatchRound numeric value error'
+        self.assertEqual(received(as_number=True), 10000, msg)
+
@@ -4,7 +4,9 @@ class.
 """
 import unittest
 import json
+import pickle
 
+import trols_stats.model
 import trols_stats.model.entities
 
 
@@ -123,3 +125,78 @@ class TestPlayer(unittest.TestCase):
         # then comparison should return False
         msg = 'Player object comparison should return False'
         self.assertFalse(received, msg)
+
+    def test_freeze(self):
+        """Frozen trols_stats.model.entities.Player is hashable.
+        """
+        # Given two players of the same name and team
+        player_data = {
+            'name': 'Player 1',
+            'team': 'Best Team'
+        }
+        player = trols_stats.model.entities.Player(**player_data)
+
+        # when they are frozen
+        frozen = player.freeze()
+        frozen_2 = trols_stats.model.entities.FrozenPlayer(**player_data)
+
+        # then they should be equal with the one hash
+        msg = 'Frozen Player objects should be equal'
+        self.assertEqual(frozen, frozen_2, msg)
+        msg = 'Frozen Player objects should dedup in a set'
+        self.assertEqual(len({frozen, frozen_2}), 1, msg)
+
+        # and still compare to the player dictionary
+        msg = 'Frozen Player dictionary comparison should return True'
+        self.assertTrue(frozen == player_data, msg)
+
+        # and keep the call output
+        msg = 'Frozen Player call output error'
+        self.assertDictEqual(frozen(), player(), msg)
+
+    def test_frozen_immutable(self):
+        """Frozen trols_stats.model.entities.Player cannot be changed.
+        """
+        # Given a frozen player
+        player = trols_stats.model.entities.FrozenPlayer(name='Player 1',
+                                                         team='Best Team')
+
+        # when I try to change the name
+        # then an AttributeError should be raised
+        with self.assertRaises(AttributeError):
+            player.name = 'Player 2'
+
+    def test_frozen_pickle(self):
+        """Pickle round trip of a frozen Player.
+        """
+        # Given a frozen player
+        player = trols_stats.model.entities.FrozenPlayer(name='Player 1',
+                                                         team='Best Team')
+
+        # when it is pickled and restored
+        received = pickle.loads(pickle.dumps(player))
+
+        # then the restored player should be equal and frozen
+        msg = 'Frozen Player pickle round trip error'
+        self.assertEqual(received, player, msg)
+        self.assertEqual(hash(received), hash(player), msg)
+        self.assertTrue(received.frozen, msg)
+
+        # and the cached hash should not be pickled
+        msg = 'Frozen Player hash should not be pickled'
+        self.assertNotIn('_frozen_hash', player.__getstate__(), msg)
+
+
+    def test_frozen_without_key(self):
+        """Frozen Player class without a key cannot be instantiated.
+        """
+        # Given a frozen player class that does not define the key
+        class KeylessPlayer(trols_stats.model.Frozen,
+                            trols_stats.model.entities.Player):
+            __slots__ = ('_frozen_hash',)
+
+        # when I create a player
+        # then a TypeError should be raised
+        msg = 'Frozen class without a key should not be instantiated'
+        with self.assertRaises(TypeError, msg=msg):
+            KeylessPlayer(name='Player 1', team='Best Team')
@@ -0,0 +1,91 @@
+""":class:`trols_stats.model.Frozen`
+
+"""
+import abc
+
+__all__ = ['Frozen']
+
+
+class Frozen(object, metaclass=abc.ABCMeta):
+    """Mixin that makes a data model entity an immutable, hashable value
+    object.
+
+    The frozen class comes before the entity class in the bases and
+    declares a ``_frozen_hash`` slot.  For example::
+
+        class FrozenPlayer(Frozen, Player):
+            __slots__ = ('_frozen_hash',)
+
+    It must also define :attr:`key`, the tuple of values that identify
+    the entity.  A frozen class without :attr:`key` cannot be
+    instantiated.  The hash of :attr:`key` is worked out once, when the
+    object is sealed at the end of its initialiser, and attributes
+    cannot be set after that.  The hash is never pickled, as string
+    hashes differ between processes.
+
+    .. attribute:: key
+        tuple of the values that identify the entity
+
+    .. attribute:: frozen
+        ``True`` once the object is sealed
+
+    """
+    __slots__ = ()
+
+    @property
+    @abc.abstractmethod
+    def key(self):
+        pass
+
+    @property
+    def frozen(self):
+        return hasattr(self, '_frozen_hash')
+
+    def __setattr__(self, name, value):
+        if self.frozen:
+            raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        if self.frozen:
+            raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+        object.__delattr__(self, name)
+
+    def __hash__(self):
+        return self._frozen_hash
+
+    def __eq__(self, other):
+        if isinstance(other, Frozen):
+            return (type(self) is type(other)
+                    and self._frozen_hash == other._frozen_hash
+                    and self.key == other.key)
+
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop('_frozen_hash', None)
+
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.seal()
+
+    def seal(self):
+        """Cache the hash of :attr:`key` and block further changes.
+
+        """
+        if not self.frozen:
+            object.__setattr__(self, '_frozen_hash', hash(self.key))
+
+    def freeze(self):
+        """Frozen objects are their own frozen variant.
+
+        """
+        return self
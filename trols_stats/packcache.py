@@ -0,0 +1,416 @@
+""":class:`trols_stats.PackCache`
+
+Append-only archive of raw TROLS match popup HTML.
+
+"""
+import os
+import zlib
+import struct
+import marshal
+import threading
+import logging
+from filer.files import create_dir
+
+from trols_stats.atomicwriter import AtomicWriter
+from trols_stats.cachelayout import CacheLayout
+
+__all__ = ['PackCache']
+
+PACK_FILE = 'matches.pack'
+INDEX_FILE = 'matches.idx'
+
+# Bump when the index layout changes.
+INDEX_VERSION = 1
+
+# Record header: magic, key length, compressed data length and the CRC32
+# of the compressed data.  The UTF-8 key and the data follow.
+MAGIC = b'TRPK'
+HEADER = struct.Struct('>4sHII')
+
+
+class PackCache(object):
+    """Raw HTML cache held as zlib compressed records appended to the
+    one pack file.
+
+    Records are keyed by the :meth:`trols_stats.interface.Loader.request`
+    cache file name.  For example,
+    ``nejta_saturday_am_autumn_2015--AA039054.html``.  An index of the
+    key and offset of each record gives random access.  A key that is
+    written again appends a new record and the index moves to it.
+    :meth:`compact` drops the records that are no longer indexed.
+
+    The index is a derived file.  A missing or stale index is rebuilt
+    by a scan of the pack, and a partly written record at the end of
+    the pack is dropped.
+
+    .. attribute:: cache_dir
+        directory that holds the pack and index files
+
+    .. attribute:: path
+        pack file path
+
+    .. attribute:: index_path
+        index file path
+
+    .. attribute:: readonly
+        open the pack for reading only.  Allows parallel readers
+
+    .. attribute:: level
+        zlib compression level of new records
+
+    .. attribute:: writer
+        :class:`trols_stats.AtomicWriter` of the compacted pack and the
+        index.  Defaults to a writer that does not flush to disk
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def path(self):
+        return os.path.join(self.cache_dir, PACK_FILE)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    @property
+    def readonly(self):
+        return self.__readonly
+
+    @property
+    def level(self):
+        return self.__level
+
+    @property
+    def writer(self):
+        return self.__writer
+
+    def __init__(self, cache_dir, readonly=False, level=6, writer=None):
+        self.__cache_dir = cache_dir
+        self.__readonly = readonly
+        self.__level = level
+        if writer is None:
+            writer = AtomicWriter()
+        self.__writer = writer
+
+        self.__fh = None
+        self.__index = {}
+        self.__dirty = False
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def __len__(self):
+        return len(self.__index)
+
+    def exists(self):
+        """Check if the pack file exists.
+
+        """
+        return os.path.exists(self.path)
+
+    def open(self):
+        """Open the pack and load its index.  A read only cache treats
+        a missing pack as empty.
+
+        """
+        if self.readonly:
+            if self.exists():
+                self.__fh = open(self.path, 'rb')
+        else:
+            create_dir(self.cache_dir)
+            self.__fh = open(self.path, 'a+b')
+
+        self.__index = {}
+        if self.__fh is not None:
+            self.__load_index()
+
+        logging.info('Pack cache "%s" records: %d', self.path, len(self))
+
+    def close(self):
+        """Write the index and close the pack.
+
+        """
+        if self.__fh is None:
+            return
+
+        if self.__dirty:
+            self.__write_index()
+
+        self.__fh.close()
+        self.__fh = None
+        self.writer.sync()
+
+    def keys(self):
+        """Sorted list of the record keys.
+
+        """
+        return sorted(self.__index)
+
+    def get(self, key):
+        """Read the *key* record.
+
+        **Returns:**
+            the raw HTML bytes or ``None`` if *key* is not in the pack
+
+        """
+        with self.__lock:
+            entry = self.__index.get(key)
+            if entry is None:
+                return None
+
+            self.__fh.seek(entry[0])
+            record = self.__fh.read(entry[1])
+
+        _, data = PackCache.decode(record)
+
+        return data
+
+    def put(self, key, data):
+        """Append the raw HTML bytes *data* as the *key* record.
+
+        """
+        if self.readonly:
+            raise IOError('Pack cache "{}" is read only'.format(self.path))
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        record = PackCache.encode(key, data, self.level)
+
+        with self.__lock:
+            self.__fh.seek(0, os.SEEK_END)
+            offset = self.__fh.tell()
+            self.__fh.write(record)
+            self.__fh.flush()
+            self.__index[key] = (offset, len(record))
+            self.__dirty = True
+
+    def scan(self):
+        """Sequential read of the pack.  Records that were written again
+        are skipped.
+
+        **Returns:**
+            generator of ``(key, data)`` tuples in pack order
+
+        """
+        live = {offset for offset, _ in self.__index.values()}
+        for offset, size, _ in self.__iter_records():
+            if offset not in live:
+                continue
+
+            with self.__lock:
+                self.__fh.seek(offset)
+                record = self.__fh.read(size)
+
+            yield PackCache.decode(record)
+
+    def migrate(self, directory, remove=False):
+        """Append the ``*.html`` files of *directory* that are not
+        already in the pack or that differ from their packed record.
+        The file name is the record key.  Both the flat and the
+        :class:`trols_stats.CacheLayout` sharded layouts are read.
+
+        **Kwargs:**
+            *remove*: delete each HTML file once it is in the pack.  The
+            emptied shard directories are removed and the layout
+            manifest is rebuilt
+
+        **Returns:**
+            the number of records appended or replaced
+
+        """
+        layout = CacheLayout(directory)
+        layout.load()
+
+        count = 0
+        for html_file in layout.html_files():
+            key = os.path.basename(html_file)
+            with open(html_file, 'rb') as _fh:
+                data = _fh.read()
+
+            # A file fetched again since an earlier migration replaces
+            # the packed record.
+            if key not in self or self.get(key) != data:
+                self.put(key, data)
+                count += 1
+
+            if remove:
+                os.remove(html_file)
+
+        if remove:
+            layout.prune()
+            layout.save()
+
+        logging.info('Migrated %d HTML files from "%s" to pack "%s"',
+                     count, directory, self.path)
+
+        return count
+
+    def compact(self):
+        """Rewrite the pack with only the indexed records in key order.
+
+        **Returns:**
+            the number of bytes reclaimed
+
+        """
+        if self.readonly:
+            raise IOError('Pack cache "{}" is read only'.format(self.path))
+
+        with self.__lock:
+            self.__fh.seek(0, os.SEEK_END)
+            before = self.__fh.tell()
+
+            index = {}
+
+            def records():
+                offset = 0
+                for key in sorted(self.__index):
+                    record_offset, size = self.__index[key]
+                    self.__fh.seek(record_offset)
+                    index[key] = (offset, size)
+                    offset += size
+                    yield self.__fh.read(size)
+
+            self.writer.write(self.path, records())
+
+            # The old pack file handle still reads the replaced file.
+            self.__fh.close()
+            self.__fh = open(self.path, 'a+b')
+            self.__fh.seek(0, os.SEEK_END)
+            after = self.__fh.tell()
+
+            self.__index = index
+            self.__dirty = True
+
+        self.__write_index()
+        logging.info('Pack cache "%s" compacted: %d bytes reclaimed',
+                     self.path, before - after)
+
+        return before - after
+
+    @staticmethod
+    def encode(key, data, level=6):
+        """Build the pack record of *key* and raw HTML bytes *data*.
+
+        """
+        key_bytes = key.encode('utf-8')
+        compressed = zlib.compress(data, level)
+        header = HEADER.pack(MAGIC,
+                             len(key_bytes),
+                             len(compressed),
+                             zlib.crc32(compressed))
+
+        return header + key_bytes + compressed
+
+    @staticmethod
+    def decode(record):
+        """Unpack a pack *record*.
+
+        **Returns:**
+            tuple of the key and raw HTML bytes
+
+        **Raises:**
+            :class:`ValueError` if the record is corrupt
+
+        """
+        magic, key_size, data_size, crc = HEADER.unpack_from(record)
+        start = HEADER.size + key_size
+        compressed = record[start:start + data_size]
+        if (magic != MAGIC
+                or len(compressed) != data_size
+                or zlib.crc32(compressed) != crc):
+            raise ValueError('Corrupt pack cache record')
+
+        key = record[HEADER.size:start].decode('utf-8')
+
+        return key, zlib.decompress(compressed)
+
+    def __iter_records(self):
+        """Walk the record headers of the pack.  Stops at the first
+        record that is incomplete or corrupt.
+
+        **Returns:**
+            generator of ``(offset, size, key)`` tuples
+
+        """
+        offset = 0
+        while True:
+            with self.__lock:
+                self.__fh.seek(offset)
+                header = self.__fh.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return
+
+                magic, key_size, data_size, crc = HEADER.unpack(header)
+                if magic != MAGIC:
+                    return
+
+                key = self.__fh.read(key_size)
+                compressed = self.__fh.read(data_size)
+
+            if len(compressed) != data_size or zlib.crc32(compressed) != crc:
+                return
+
+            size = HEADER.size + key_size + data_size
+            yield offset, size, key.decode('utf-8')
+            offset += size
+
+    def __load_index(self):
+        """Load the index if it matches the pack.  Otherwise rebuild it
+        with a scan of the pack.
+
+        """
+        self.__fh.seek(0, os.SEEK_END)
+        pack_size = self.__fh.tell()
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as _fh:
+                try:
+                    version, size, index = marshal.load(_fh)
+                except (EOFError, ValueError, TypeError):
+                    version = size = None
+
+            if version == INDEX_VERSION and size == pack_size:
+                self.__index = index
+                return
+
+        logging.info('Rebuilding pack cache index "%s"', self.index_path)
+        index = {}
+        end = 0
+        for offset, size, key in self.__iter_records():
+            index[key] = (offset, size)
+            end = offset + size
+
+        if end < pack_size:
+            logging.warning('Pack cache "%s": %d trailing bytes dropped',
+                            self.path, pack_size - end)
+            if not self.readonly:
+                self.__fh.truncate(end)
+
+        self.__index = index
+        self.__dirty = not self.readonly
+
+    def __write_index(self):
+        """Write the index atomically along with the pack size that it
+        covers.
+
+        """
+        with self.__lock:
+            self.__fh.seek(0, os.SEEK_END)
+            content = marshal.dumps((INDEX_VERSION,
+                                     self.__fh.tell(),
+                                     dict(self.__index)))
+            self.__dirty = False
+
+        self.writer.write(self.index_path, content)
@@ -0,0 +1,306 @@
+"""class:`trols_stats.ParseCache`.
+
+Content addressed store of scraped TROLS match pages.
+
+"""
+import os
+import dbm
+import marshal
+import hashlib
+import logging
+from filer.files import create_dir
+
+import trols_stats
+import trols_stats.scraper
+
+__all__ = ['ParseCache']
+
+VERSION_KEY = b'__version__'
+
+# Bump when the compact record layout changes.
+RECORD_VERSION = 1
+
+TEAM_KEYS = ('home_team', 'away_team')
+
+PREAMBLE_KEYS = ('competition_type', 'section', 'date', 'match_round')
+
+
+class ParseCache(object):
+    """Persistent cache of :meth:`trols_stats.Scraper.parse_match`
+    results keyed by the SHA-1 digest of the raw HTML content.
+
+    Finished matches never change so a rebuild only needs to scrape
+    new or changed HTML.  The cache is versioned against the scraper
+    code and is dropped whenever the scraper changes.
+
+    .. attribute:: cache_dir
+        directory that holds the cache database
+
+    .. attribute:: hits
+        number of matches rehydrated from the cache
+
+    .. attribute:: misses
+        number of matches that needed to be scraped
+
+    .. attribute:: readonly
+        open the cache database for reading only.  New entries are
+        held in :attr:`new_records` for a writer to :meth:`update`.
+        This allows parallel workers to share the one cache
+
+    .. attribute:: new_records
+        list of ``(digest, record)`` tuples scraped by a read only
+        cache
+
+    """
+    @property
+    def cache_dir(self):
+        return self.__cache_dir
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def readonly(self):
+        return self.__readonly
+
+    @property
+    def new_records(self):
+        return self.__new_records
+
+    def __init__(self, cache_dir, readonly=False):
+        self.__cache_dir = cache_dir
+        self.__readonly = readonly
+        self.__db = None
+        self.__hits = 0
+        self.__misses = 0
+        self.__new_records = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def version():
+        """Cache version string.
+
+        Combines the :data:`trols_stats.scraper.PARSER_VERSION`, the
+        compact record layout version and a fingerprint of the scraper
+        source so that any change to the scrape path invalidates the
+        cache.
+
+        """
+        fingerprint = hashlib.sha1()
+        for module in (trols_stats.scraper,
+                       trols_stats.fastparser,
+                       trols_stats.xpaths):
+            with open(module.__file__, 'rb') as _fh:
+                fingerprint.update(_fh.read())
+
+        return '{}:{}:{}:{}'.format(trols_stats.scraper.PARSER_VERSION,
+                                    RECORD_VERSION,
+                                    marshal.version,
+                                    fingerprint.hexdigest()).encode('utf-8')
+
+    def open(self):
+        """Open the cache database.  A cache that was written by a
+        different scraper version is discarded.  A read only cache
+        treats a missing or stale database as empty.
+
+        """
+        db_path = os.path.join(self.cache_dir, 'parse_cache')
+        logging.debug('Parse cache path "%s"', db_path)
+
+        version = ParseCache.version()
+        if self.readonly:
+            try:
+                self.__db = dbm.open(db_path, 'r')
+            except dbm.error:
+                logging.info('No parse cache at "%s"', db_path)
+            else:
+                if self.__db.get(VERSION_KEY) != version:
+                    logging.info('Stale parse cache "%s" ignored', db_path)
+                    self.__db.close()
+                    self.__db = None
+            return
+
+        create_dir(self.cache_dir)
+        self.__db = dbm.open(db_path, 'c')
+        if self.__db.get(VERSION_KEY) != version:
+            logging.info('Parse cache version change: rebuilding "%s"', db_path)
+            self.__db.close()
+            self.__db = dbm.open(db_path, 'n')
+            self.__db[VERSION_KEY] = version
+
+    def close(self):
+        """Close the cache database.
+
+        """
+        logging.info('Parse cache hits|misses: %d|%d', self.hits, self.misses)
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    @staticmethod
+    def digest(data):
+        """Content address of the raw HTML *data*.
+
+        **Args:**
+            *data*: raw HTML bytes or string
+
+        **Returns:**
+            SHA-1 digest bytes
+
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        return hashlib.sha1(data).digest()
+
+    def get(self, digest):
+        """Rehydrate the match structure stored against *digest*.
+
+        **Returns:**
+            the :meth:`trols_stats.Scraper.parse_match` structure or
+            ``None`` on a cache miss
+
+        """
+        record = None
+        if self.__db is not None:
+            record = self.__db.get(digest)
+
+        match = None
+        if record is not None:
+            match = ParseCache.decode(record)
+
+        return match
+
+    def put(self, digest, match):
+        """Store *match* against the content *digest*.
+
+        """
+        record = ParseCache.encode(match)
+        if self.readonly:
+            self.__new_records.append((digest, record))
+        else:
+            self.__db[digest] = record
+
+    def update(self, records):
+        """Store the encoded *records* such as the :attr:`new_records`
+        of a read only cache.
+
+        **Args:**
+            *records*: iterable of ``(digest, record)`` tuples
+
+        """
+        for digest, record in records:
+            self.__db[digest] = record
+
+    def parse(self, data, fast=False):
+        """Return the match structure for the raw HTML *data*, scraping
+        only on a cache miss.
+
+        **Args:**
+            *data*: raw HTML bytes or string
+
+        **Kwargs:**
+            *fast*: scrape with the :class:`trols_stats.FastParser`
+
+        **Returns:**
+            the :meth:`trols_stats.Scraper.parse_match` structure
+
+        """
+        digest = ParseCache.digest(data)
+
+        match = self.get(digest)
+        if match is not None:
+            self.__hits += 1
+        else:
+            self.__misses += 1
+            match = trols_stats.Scraper.parse_match(data, fast=fast)
+            self.put(digest, match)
+
+        return match
+
+    @staticmethod
+    def encode(match):
+        """Pack the *match* structure into a compact record.
+
+        Dictionary keys are implied by position.  The preamble carries
+        a bit mask of the keys that were scraped as finals do not have
+        a date.
+
+        **Returns:**
+            :mod:`marshal` serialised record bytes
+
+        """
+        teams = match.get('teams')
+        preamble = match.get('preamble')
+
+        preamble_mask = 0
+        for index, key in enumerate(PREAMBLE_KEYS):
+            if key in preamble:
+                preamble_mask |= 1 << index
+
+        scores = []
+        for code, stats in match.get('scores').items():
+            games = []
+            for stat in stats:
+                if stat is not None:
+                    stat = (stat['team_mate'],
+                            stat['opposition'],
+                            stat['score_for'],
+                            stat['score_against'])
+                games.append(stat)
+            scores.append((code, tuple(games)))
+
+        record = (
+            tuple(teams.get(x) for x in TEAM_KEYS) if teams else None,
+            tuple(x for _, x in match.get('players')),
+            preamble_mask,
+            tuple(preamble.get(x) for x in PREAMBLE_KEYS),
+            tuple(scores),
+        )
+
+        return marshal.dumps(record)
+
+    @staticmethod
+    def decode(record):
+        """Unpack a compact *record* into the match structure.
+
+        """
+        teams, names, preamble_mask, preamble_values, scores = marshal.loads(record)
+
+        preamble = {}
+        for index, (key, value) in enumerate(zip(PREAMBLE_KEYS,
+                                                 preamble_values)):
+            if preamble_mask & 1 << index:
+                preamble[key] = value
+
+        match_scores = {}
+        for code, games in scores:
+            stats = []
+            for game in games:
+                if game is not None:
+                    game = {
+                        'team_mate': game[0],
+                        'opposition': game[1],
+                        'score_for': game[2],
+                        'score_against': game[3],
+                    }
+                stats.append(game)
+            match_scores[code] = stats
+
+        return {
+            'teams': dict(zip(TEAM_KEYS, teams)) if teams else {},
+            'players': list(enumerate(names, start=1)),
+            'preamble': preamble,
+            'scores': match_scores,
+        }
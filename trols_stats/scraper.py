@@ -4,15 +4,303 @@ Scrape TROLS HTML.
 
 """
 import re
+import os
+import codecs
+import threading
+import itertools
+import collections
+import concurrent.futures
+import lxml.etree
 import lxml.html
 import logging
 
+from trols_stats.xpaths import get_xpath
+from trols_stats.fastparser import FastParser
+
 __all__ = ['Scraper']
 
+# Bump when a change to the scrape path alters the extracted match
+# structure.  Persisted scrape results (for example, the
+# :class:`trols_stats.ParseCache`) are invalidated on change.
+PARSER_VERSION = 1
+
+# Byte order marks in detection order.  The UTF-32 marks must be checked
+# ahead of the UTF-16 marks that they start with.
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+META_CHARSET_RE = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?([\w.:-]+)''',
+                             flags=re.IGNORECASE)
+
+# Only the head of the page is searched for a <meta> charset.
+META_CHARSET_SCAN = 1024
+
+# lxml parsers must not be shared between threads.
+_PARSERS = threading.local()
+
+# Worker pools supported by Scraper.scrape_many.
+EXECUTORS = {
+    'thread': concurrent.futures.ThreadPoolExecutor,
+    'process': concurrent.futures.ProcessPoolExecutor,
+}
+
+
+def _parse_batch(batch, fast=False):
+    """Worker pool task that parses a *batch* of ``(source_file, html)``
+    pairs.  Defined at module level so that it can be sent to a process
+    pool.
+
+    """
+    return [(x, Scraper.parse_match(y, fast=fast)) for x, y in batch]
+
 
 class Scraper(object):
     @staticmethod
-    def scrape_competition_name(html, xpath, tokenise=False, league=None):
+    def get_root(html):
+        """Build the :mod:`lxml.html` document tree for *html*.
+
+        Every ``scrape_*`` method accepts either raw HTML or the root
+        element returned here.  This allows multiple extractions to share
+        the one DOM build.
+
+        **Args:**
+            *html*: string representation of the HTML page to process,
+            the raw HTML bytes or an existing
+            :class:`lxml.html.HtmlElement` root.  The character encoding
+            of raw bytes is found with :meth:`detect_encoding`
+
+        **Returns:**
+            :class:`lxml.html.HtmlElement` root of the document
+
+        """
+        root = html
+        if isinstance(html, (bytes, bytearray, memoryview)):
+            parser = Scraper._get_parser(Scraper.detect_encoding(html))
+            if not isinstance(html, bytes):
+                html = bytes(html)
+            root = lxml.html.fromstring(html, parser=parser)
+        elif not isinstance(html, lxml.html.HtmlElement):
+            root = lxml.html.fromstring(html)
+
+        return root
+
+    @staticmethod
+    def _get_parser(encoding):
+        """Return this thread's :class:`lxml.html.HTMLParser` for
+        *encoding*.  Parsers are built once per encoding and reused.
+
+        """
+        parsers = getattr(_PARSERS, 'parsers', None)
+        if parsers is None:
+            parsers = _PARSERS.parsers = {}
+
+        parser = parsers.get(encoding)
+        if parser is None:
+            parser = parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+
+        return parser
+
+    @staticmethod
+    def detect_encoding(data):
+        """Detect the character encoding of the raw HTML *data*.
+
+        Detection order is a byte order mark, then a ``<meta>`` charset
+        declaration near the start of the page.  Undeclared pages are
+        UTF-8 unless they fail to decode as UTF-8, in which case
+        Windows-1252 is assumed.
+
+        **Args:**
+            *data*: raw HTML as a :class:`bytes`-like object
+
+        **Returns:**
+            the Python codec name.  For example, ``utf-8``
+
+        """
+        head = bytes(data[:META_CHARSET_SCAN])
+
+        for bom, encoding in BOMS:
+            if head.startswith(bom):
+                return encoding
+
+        meta = META_CHARSET_RE.search(head)
+        if meta is not None:
+            try:
+                return codecs.lookup(meta.group(1).decode('ascii')).name
+            except LookupError:
+                logging.warning('Unknown <meta> charset "%s"', meta.group(1))
+
+        encoding = 'utf-8'
+        if not (isinstance(data, bytes) and data.isascii()):
+            try:
+                str(data, encoding)
+            except UnicodeDecodeError:
+                encoding = 'cp1252'
+
+        return encoding
+
+    @staticmethod
+    def decode_html(data):
+        """Decode the raw HTML *data* with the
+        :meth:`detect_encoding` character encoding.
+
+        **Args:**
+            *data*: raw HTML as a :class:`bytes`-like object.  Strings
+            are returned unchanged
+
+        **Returns:**
+            the HTML string
+
+        """
+        if isinstance(data, str):
+            return data
+
+        encoding = Scraper.detect_encoding(data)
+        if encoding == 'utf-8':
+            # Drop any byte order mark.
+            encoding = 'utf-8-sig'
+
+        return str(data, encoding)
+
+    @staticmethod
+    def parse_match(html, fast=False):
+        """Extract the teams, players, preamble and scores from a TROLS
+        match popup page with a single parse of *html*.
+
+        **Args:**
+            *html*: string representation or raw bytes of the HTML page
+            to process.  *html* is typically a TROLS detailed match
+            results page.
+
+        **Kwargs:**
+            *fast*: try the :class:`trols_stats.FastParser` regular
+            expression scan first.  Pages that fail the fast parser
+            structural checks fall back to :mod:`lxml`
+
+        **Returns:**
+            dictionary structure of the form::
+
+                {
+                    'teams': {'home_team': ..., 'away_team': ...},
+                    'players': [(1, 'Madeline Doyle'), ...],
+                    'preamble': {'competition_type': 'girls', ...},
+                    'scores': {1: [{'team_mate': 2, ...}, ...], ...},
+                }
+
+        """
+        if fast and not isinstance(html, lxml.html.HtmlElement):
+            # Decode once for the fast parser and any lxml fallback.
+            html = Scraper.decode_html(html)
+            match = FastParser.parse_match(html)
+            if match is not None:
+                return match
+            logging.info('Fast parser fallback to lxml')
+
+        root = Scraper.get_root(html)
+
+        return {
+            'teams': Scraper.scrape_match_teams(root,
+                                                color_xpath='match_team_color'),
+            'players': Scraper.scrape_player_names(root),
+            'preamble': Scraper.scrape_match_preamble(root),
+            'scores': Scraper.scrape_match_scores(root),
+        }
+
+    @staticmethod
+    def scrape_many(items,
+                    executor='serial',
+                    workers=None,
+                    fast=False,
+                    chunksize=1,
+                    window=None):
+        """Parse a batch of TROLS match popup pages.
+
+        Results are produced lazily and in the same order as *items*,
+        regardless of the *executor*.  At most *window* batches are in
+        flight at any time so that large inputs are not read ahead.
+
+        **Args:**
+            *items*: iterable of ``(source_file, html)`` pairs
+
+        **Kwargs:**
+            *executor*: one of ``serial``, ``thread`` or ``process``, or
+            an existing :class:`concurrent.futures.Executor` instance.
+            A caller supplied executor is not shut down on completion
+
+            *workers*: maximum number of pool workers.  Defaults to the
+            :mod:`concurrent.futures` executor default
+
+            *fast*: scrape with the :class:`trols_stats.FastParser`
+
+            *chunksize*: number of pages sent to a worker per task.  A
+            larger *chunksize* reduces the inter-process overhead of the
+            ``process`` executor
+
+            *window*: maximum number of tasks in flight.  Defaults to
+            twice the number of *workers*
+
+        **Returns:**
+            generator of ``(source_file, match)`` tuples where *match*
+            is the :meth:`parse_match` structure
+
+        """
+        owned = False
+        if isinstance(executor, concurrent.futures.Executor):
+            pool = executor
+        elif executor == 'serial':
+            pool = None
+        elif executor in EXECUTORS:
+            pool = EXECUTORS[executor](max_workers=workers)
+            owned = True
+        else:
+            raise ValueError('Unknown scrape executor "{}"'.format(executor))
+
+        if chunksize < 1:
+            raise ValueError('Scrape chunksize must be at least 1')
+
+        if window is None:
+            window = 2 * (workers or os.cpu_count() or 1)
+
+        return Scraper._scrape_many(items, pool, owned, fast, chunksize, window)
+
+    @staticmethod
+    def _scrape_many(items, pool, owned, fast, chunksize, window):
+        """:meth:`scrape_many` generator.
+
+        """
+        items = iter(items)
+        batches = iter(lambda: list(itertools.islice(items, chunksize)), [])
+
+        if pool is None:
+            for batch in batches:
+                yield from _parse_batch(batch, fast)
+            return
+
+        pending = collections.deque()
+        try:
+            for batch in batches:
+                pending.append(pool.submit(_parse_batch, batch, fast))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned:
+                pool.shutdown(wait=True)
+
+    @staticmethod
+    def scrape_competition_name(html,
+                                xpath='competition_name',
+                                tokenise=False,
+                                league=None,
+                                option_value=None):
         """Extract the competition name.  For example,
         "Saturday AM - Spring 2015"
 
@@ -20,18 +308,37 @@ class Scraper(object):
             *html*: string representation of the HTML page to process.
 
         **Kwargs:**
+            *xpath*: :mod:`trols_stats.xpaths` registry name or XPath
+            expression that targets the competition name
+
             *tokenise*: tokenises the competition name to be used as an
             identifier.  For example, ``saturday_am_spring_2015``
 
             *league*: name of the league from where the matches
             are sourced from
 
+            *option_value*: competition option value (for example,
+            ``AA``) bound to the ``$value`` XPath variable.  Required
+            by the default ``competition_name`` XPath
+
         **Returns:**
             string representation of the compeition name
 
+        **Raises:**
+            :class:`ValueError` if *xpath* refers to ``$value`` and
+            *option_value* is not provided
+
         """
-        root = lxml.html.fromstring(html)
-        comp_name = root.xpath(xpath)[0]
+        evaluator = get_xpath(xpath)
+        variables = {}
+        if option_value is not None:
+            variables['value'] = option_value
+        elif re.search(r'\$value\b', evaluator.path):
+            raise ValueError('Competition name XPath "{}" needs an '
+                             'option_value'.format(evaluator.path))
+
+        root = Scraper.get_root(html)
+        comp_name = evaluator(root, **variables)[0]
         if league is not None:
             comp_name = '{} {}'.format(league.upper(), comp_name)
 
@@ -44,7 +351,7 @@ class Scraper(object):
         return comp_name
 
     @staticmethod
-    def scrape_competition_ids(html, xpath):
+    def scrape_competition_ids(html, xpath='competition_ids'):
         """Extract the competition IDs.
 
         **Args:**
@@ -57,8 +364,8 @@ class Scraper(object):
                 {'GIRLS 1': 'AA026', 'GIRLS 2': 'AA027' ...}
 
         """
-        root = lxml.html.fromstring(html)
-        comp_id_elements = root.xpath(xpath)
+        root = Scraper.get_root(html)
+        comp_id_elements = get_xpath(xpath)(root)
 
         comp_ids = {}
         for element in comp_id_elements:
@@ -95,7 +402,7 @@ class Scraper(object):
         return comp_id
 
     @staticmethod
-    def scrape_match_ids(html, xpath):
+    def scrape_match_ids(html, xpath='match_ids'):
         """Extract a list of match IDs from *html*.
 
         During processing, the :mod:`lxml.xpath` extraction will
@@ -113,8 +420,8 @@ class Scraper(object):
                 ['AA039054', <match_id_02>, <match_id_03> ...]
 
         """
-        root = lxml.html.fromstring(html)
-        matches = root.xpath(xpath)
+        root = Scraper.get_root(html)
+        matches = get_xpath(xpath)(root)
 
         match_ids = []
         for match in matches:
@@ -131,6 +438,106 @@ class Scraper(object):
 
         return match_ids
 
+    @staticmethod
+    def iter_competition_ids(chunks):
+        """Streaming version of :meth:`scrape_competition_ids`.
+
+        Section codes are yielded as soon as their ``option`` element is
+        closed in the HTML stream.  The remainder of the page does not
+        need to be received.
+
+        **Args:**
+            *chunks*: iterable of HTML string or bytes chunks such as
+            those produced by
+            :meth:`trols_stats.interface.Loader.request_stream`.  A
+            single string or bytes object is also accepted
+
+        **Returns:**
+            generator of competition ID and competition code tuples.  For
+            example::
+
+                ('GIRLS 1', 'AA026'), ('GIRLS 2', 'AA027'), ...
+
+        """
+        for _, element in Scraper._iter_events(chunks, ('end',), 'option'):
+            parent = element.getparent()
+            if (parent is None
+                    or parent.tag != 'select'
+                    or parent.get('id') != 'section'
+                    or parent.get('name') != 'section'):
+                continue
+
+            if element.get('value') == '':
+                continue
+
+            yield from Scraper._get_competition_id(element).items()
+
+    @staticmethod
+    def iter_match_ids(chunks):
+        """Streaming version of :meth:`scrape_match_ids`.
+
+        Match IDs are yielded as soon as their anchor start tag is
+        received.  This allows the match popups to be fetched while the
+        remainder of the results page is still being downloaded.
+
+        **Args:**
+            *chunks*: iterable of HTML string or bytes chunks such as
+            those produced by
+            :meth:`trols_stats.interface.Loader.request_stream`.  A
+            single string or bytes object is also accepted
+
+        **Returns:**
+            generator of match IDs.  For example::
+
+                'AA039054', <match_id_02>, <match_id_03> ...
+
+        """
+        for _, element in Scraper._iter_events(chunks, ('start',), 'a'):
+            if 'open_match' not in element.get('onclick', ''):
+                continue
+
+            for attrs in element.items():
+                match_id = Scraper.get_match_id(attrs)
+
+                if match_id is None:
+                    logging.warning('Unable to extract match ID from "%s"', attrs)
+                    continue
+
+                yield match_id
+
+    @staticmethod
+    def _iter_events(chunks, events, tag):
+        """Feed *chunks* into an incremental :mod:`lxml` HTML parser.
+
+        **Args:**
+            *chunks*: iterable of HTML string or bytes chunks
+
+            *events*: tuple of :class:`lxml.etree.HTMLPullParser` event
+            names
+
+            *tag*: restrict the events to elements of this tag name
+
+        **Returns:**
+            generator of ``(event, element)`` tuples
+
+        """
+        if isinstance(chunks, (str, bytes)):
+            chunks = (chunks,)
+
+        parser = lxml.etree.HTMLPullParser(events=events, tag=tag)
+
+        have_data = False
+        for chunk in chunks:
+            if not chunk:
+                continue
+            have_data = True
+            parser.feed(chunk)
+            yield from parser.read_events()
+
+        if have_data:
+            parser.close()
+            yield from parser.read_events()
+
     @staticmethod
     def get_match_id(attributes):
         """Extract the TROLS match ID from the results page extraction
@@ -158,7 +565,7 @@ class Scraper(object):
         return match_id
 
     @staticmethod
-    def scrape_match_teams(html, xpath, color_xpath=None):
+    def scrape_match_teams(html, xpath='match_teams', color_xpath=None):
         """Extract information from the match details *html*.
 
         **Args:**
@@ -172,33 +579,19 @@ class Scraper(object):
 
         """
         def get_team_color_code(root, team, xpath, away=False):
-            team = team.replace("'", "&apos;")
-
-            color_xpath = xpath % team
+            # Legacy expressions interpolate the team with "%s".  Bind
+            # the team as an XPath variable instead so that the
+            # compiled expression can be reused.
+            if isinstance(xpath, str):
+                xpath = xpath.replace("'%s'", '$team')
 
-            logging.debug('Team color xpath "%s"', color_xpath)
-            tmp_colors = root.xpath(color_xpath)
+            logging.debug('Team color xpath "%s": team "%s"', xpath, team)
+            tmp_colors = get_xpath(xpath)(root, team=team)
 
-            colors = []
-            for color in tmp_colors:
-                # Some identifiers we don't want.
-                clean_color = str.replace(color, '(Late Start)', '')
-                if len(clean_color):
-                    colors.append(clean_color)
+            return Scraper.color_code_team(team, tmp_colors, away=away)
 
-            # Colors could come through for both home and away teams.
-            if len(colors):
-                if away:
-                    team += colors[-1]
-                else:
-                    team += colors[0]
-
-                logging.debug('Color coded team: "%s"', team)
-
-            return team.rstrip()
-
-        root = lxml.html.fromstring(html)
-        raw_teams = root.xpath(xpath)
+        root = Scraper.get_root(html)
+        raw_teams = get_xpath(xpath)(root)
 
         teams = {}
         if len(raw_teams) != 2:
@@ -224,6 +617,44 @@ class Scraper(object):
 
         return teams
 
+    @staticmethod
+    def color_code_team(team, raw_colors, away=False):
+        """Append the team color code to *team*.
+
+        **Args:**
+            *team*: raw team name as scraped from the match page.  For
+            example, ``Watsonia&nbsp;``
+
+            *raw_colors*: list of color code strings scraped from the
+            team ``span`` elements.  For example, ``['Red', 'Blue']``
+
+        **Kwargs:**
+            *away*: colors could come through for both home and away
+            teams.  The home team takes the first color and the away team
+            the last
+
+        **Returns:**
+            the color coded team name.  For example, ``Watsonia Red``
+
+        """
+        colors = []
+        for color in raw_colors:
+            # Some identifiers we don't want.
+            clean_color = str.replace(color, '(Late Start)', '')
+            if len(clean_color):
+                colors.append(clean_color)
+
+        # Colors could come through for both home and away teams.
+        if len(colors):
+            if away:
+                team += colors[-1]
+            else:
+                team += colors[0]
+
+            logging.debug('Color coded team: "%s"', team)
+
+        return team.rstrip()
+
     @staticmethod
     def scrape_player_names(html):
         """Highly customised extract of player names from *html*.
@@ -238,12 +669,27 @@ class Scraper(object):
                 [(1, 'Madeline Doyle'), (2, 'Tara Watson'), ...]
 
         """
-        root = lxml.html.fromstring(html)
+        root = Scraper.get_root(html)
+        elements = get_xpath('player_names')(root)
+
+        return Scraper.number_players(elements)
 
-        namespaces = {"re": "http://exslt.org/regular-expressions"}
-        elements = root.xpath(r"//td[re:match(text(), '^\d\.')]/text()",
-                              namespaces=namespaces)
+    @staticmethod
+    def number_players(elements):
+        """Strip the player number prefix from the raw player name
+        *elements* and enumerate the players in match order.
+
+        **Args:**
+            *elements*: list of raw player name strings.  For example::
+
+                ['1.  Madeline Doyle', '2.  Tara Watson', ...]
+
+        **Returns:**
+            list of player names.  For example::
 
+                [(1, 'Madeline Doyle'), (2, 'Tara Watson'), ...]
+
+        """
         player_re = re.compile(r'^\d\.\s+')
         players = [(i, player_re.sub('', j)) for i, j in enumerate(elements,
                                                                    start=1)]
@@ -252,7 +698,7 @@ class Scraper(object):
         return players
 
     @staticmethod
-    def scrape_match_preamble(html, xpath):
+    def scrape_match_preamble(html, xpath='match_preamble'):
         """Extract match preamble from *html*.
 
         A typical preamble string is as follows::
@@ -283,8 +729,27 @@ class Scraper(object):
                 }
 
         """
-        root = lxml.html.fromstring(html)
-        tmp_preamble = root.xpath(xpath)[0]
+        root = Scraper.get_root(html)
+        tmp_preamble = get_xpath(xpath)(root)[0]
+
+        return Scraper.parse_preamble(tmp_preamble)
+
+    @staticmethod
+    def parse_preamble(tmp_preamble):
+        """Break the raw match preamble string into its components.
+
+        See :meth:`scrape_match_preamble` for the preamble formats.
+
+        **Args:**
+            *tmp_preamble*: raw match preamble string.  For example::
+
+                GIRLS 1&nbsp;&nbsp;Rd.1&nbsp;on&nbsp;1st Feb 14
+
+        **Returns:**
+            dictionary structure representing components of the
+            preamble
+
+        """
         raw_preamble = tmp_preamble.replace(u'\xa0', u' ')
 
         logging.debug('Scraped preamble: "%s"', raw_preamble)
@@ -361,7 +826,7 @@ class Scraper(object):
         return preamble
 
     @staticmethod
-    def scrape_match_scores(html, xpath):
+    def scrape_match_scores(html, xpath='match_scores'):
         """Extract match scores from *html*.
 
         **Args:**
@@ -373,9 +838,73 @@ class Scraper(object):
             preamble in the form::
 
         """
-        root = lxml.html.fromstring(html)
-        raw_scores = root.xpath(xpath)
+        root = Scraper.get_root(html)
+        raw_scores = [x.text for x in get_xpath(xpath)(root)]
+
+        return Scraper.parse_scores(raw_scores)
 
+    @staticmethod
+    def is_finalised(html, xpath='match_scores'):
+        """Check if the match in *html* has a complete set of scores.
+        A finalised match will not change on TROLS.
+
+        **Args:**
+            *html*: string representation or raw bytes of the HTML page
+            to process.  *html* is typically a TROLS match results page.
+
+        **Returns:**
+            boolean ``True`` if every game of the match has been scored
+
+        """
+        root = Scraper.get_root(html)
+        raw_scores = [x.text for x in get_xpath(xpath)(root)]
+
+        return Scraper.scores_complete(raw_scores)
+
+    @staticmethod
+    def scores_complete(raw_scores):
+        """Check the score table cell text *raw_scores* for a complete
+        set of games.
+
+        **Args:**
+            *raw_scores*: list of score table cell text values as per
+            :meth:`parse_scores`
+
+        **Returns:**
+            boolean ``True`` if there is at least one game and every
+            game has both player codes and a score for each side
+
+        """
+        if not raw_scores or len(raw_scores) % 3:
+            return False
+
+        for index in range(0, len(raw_scores), 3):
+            home, score, away = raw_scores[index:index + 3]
+            if home is None or away is None or score is None:
+                return False
+
+            if (not re.search(r'\d', home)
+                    or not re.search(r'\d', away)
+                    or len(re.findall(r'\d+', score)) != 2):
+                return False
+
+        return True
+
+    @staticmethod
+    def parse_scores(raw_scores):
+        """Build the match results from the score table cell text.
+
+        **Args:**
+            *raw_scores*: list of score table cell text values.  ``None``
+            represents an empty cell.  For example::
+
+                ['1+2', '3-6', '1+2', '3+4', '0-6', '3+4', ...]
+
+        **Returns:**
+            dictionary structure of player codes and their games.
+            See :meth:`create_stat` for the game structure
+
+        """
         count = -1
         active_players = ()
         active_scores = ()
@@ -388,24 +917,24 @@ class Scraper(object):
         #   index 3: opposition player code
         #
         for score in raw_scores:
-            logging.debug('Raw score iteration value: %s', score.text)
+            logging.debug('Raw score iteration value: %s', score)
             count += 1
 
-            if score.text is None:
+            if score is None:
                 logging.warning('Parsed invalid raw score component: skipping')
                 continue
 
             if count % 3 == 0:
                 logging.info('Starting match score parsing segment ...')
 
-                active_players = Scraper.extract_player_codes(score.text)
+                active_players = Scraper.extract_player_codes(score)
                 logging.debug('Home players: %s', active_players)
                 have_home_players = True
                 continue
 
             if count % 3 == 1:
                 active_scores = [int(x) for x in re.findall(r'\d+',
-                                                            score.text)]
+                                                            score)]
                 active_scores = tuple(active_scores)
                 logging.debug('Scores: %s', active_scores)
                 if len(active_scores) == 2:
@@ -415,7 +944,7 @@ class Scraper(object):
                 continue
 
             if count % 3 == 2:
-                away_players = Scraper.extract_player_codes(score.text)
+                away_players = Scraper.extract_player_codes(score)
                 logging.debug('Away players: %s', away_players)
 
                 active_players = (active_players, away_players)
@@ -19,6 +19,12 @@ class Statistics(object):
         ..attribute:: games_lost
 
     """
+    __slots__ = ('__score_for',
+                 '__score_against',
+                 '__games_played',
+                 '__games_won',
+                 '__games_lost')
+
     @property
     def score_for(self):
         return self.__score_for
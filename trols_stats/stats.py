@@ -57,9 +57,21 @@ class Stats(object):
     ..attribute:: players_cache
         list of :class:`trols_stats.model.entities.Player` objects
 
+    ..attribute:: player_map
+        identity map of ``(name, team)`` tuples and their
+        :class:`trols_stats.model.entities.Player` object.  Pass the one
+        map to each :class:`Stats` object so that all matches share the
+        same :class:`trols_stats.model.entities.Player` objects
+
     ..attribute:: fixtures_cache
         list of :class:`trols_stats.model.entities.Fixture` objects
 
+    ..attribute:: fixture_map
+        identity map of the :meth:`fixture_key` tuples and their
+        :class:`trols_stats.model.entities.Fixture` object.  Can be
+        shared across :class:`Stats` objects in the same way as
+        :attr:`player_map`
+
     """
     @property
     def players(self):
@@ -83,9 +95,14 @@ class Stats(object):
 
     @fixture.setter
     def fixture(self, value):
-        self.__fixture = trols_stats.model.entities.Fixture(**value)
-
-    def __init__(self, players=None, teams=None, fixture=None):
+        self.__fixture = self.set_fixtures_cache(value)
+
+    def __init__(self,
+                 players=None,
+                 teams=None,
+                 fixture=None,
+                 player_map=None,
+                 fixture_map=None):
         if players is None:
             players = {}
         self.__players = players
@@ -94,12 +111,19 @@ class Stats(object):
             teams = {}
         self.__teams = teams
 
+        if player_map is None:
+            player_map = {}
+        self.__player_map = player_map
+
+        if fixture_map is None:
+            fixture_map = {}
+        self.__fixture_map = fixture_map
+
         if fixture is None:
-            fixture = {}
-        self.__fixture = trols_stats.model.entities.Fixture(**fixture)
+            self.__fixture = trols_stats.model.entities.Fixture()
+        else:
+            self.__fixture = self.set_fixtures_cache(fixture)
 
-        self.__players_cache = []
-        self.__fixtures_cache = []
         self.__games_cache = []
 
     def __str__(self):
@@ -110,7 +134,11 @@ class Stats(object):
 
     @property
     def players_cache(self):
-        return self.__players_cache
+        return list(self.__player_map.values())
+
+    @property
+    def player_map(self):
+        return self.__player_map
 
     def set_players_cache(self, player_details):
         """Add *player_details* to the cache or return the existing
@@ -130,22 +158,41 @@ class Stats(object):
         player = None
 
         if player_details is not None:
-            for cache in self.__players_cache:
-                if cache == player_details:
-                    logging.debug('Player cache hit "%s"', player_details.get('name'))
-                    player = cache
-                    break
+            key = (player_details.get('name'), player_details.get('team'))
+            player = self.__player_map.get(key)
 
             if player is None:
                 logging.debug('Adding "%s" to player cache', player_details.get('name'))
                 player = trols_stats.model.entities.Player(**player_details)
-                self.__players_cache.append(player)
+                self.__player_map[key] = player
 
         return player
 
     @property
     def fixtures_cache(self):
-        return self.__fixtures_cache
+        return list(self.__fixture_map.values())
+
+    @property
+    def fixture_map(self):
+        return self.__fixture_map
+
+    @staticmethod
+    def fixture_key(fixture_details):
+        """Canonical :attr:`fixture_map` key of *fixture_details*.
+
+        **Returns:**
+            tuple of the ``competition``, ``competition_type``,
+            ``section``, ``match_round``, ``date``, ``home_team`` and
+            ``away_team`` values.  Missing values are ``None``
+
+        """
+        return (fixture_details.get('competition'),
+                fixture_details.get('competition_type'),
+                fixture_details.get('section'),
+                fixture_details.get('match_round'),
+                fixture_details.get('date'),
+                fixture_details.get('home_team'),
+                fixture_details.get('away_team'))
 
     def set_fixtures_cache(self, fixture_details):
         """Add *fixture_details* to the cache or return the existing
@@ -168,15 +215,8 @@ class Stats(object):
             corresponding to *fixture_details*
 
         """
-        fixture = None
-        for cache in self.__fixtures_cache:
-            if cache == fixture_details:
-                logging.debug('Fixture cache hit "%s %s round %s"',
-                              fixture_details.get('competition'),
-                              fixture_details.get('section'),
-                              fixture_details.get('match_round'))
-                fixture = cache
-                break
+        key = Stats.fixture_key(fixture_details)
+        fixture = self.__fixture_map.get(key)
 
         if fixture is None:
             logging.debug('Adding "%s %s round %s" to fixture cache',
@@ -184,7 +224,7 @@ class Stats(object):
                           fixture_details.get('section'),
                           fixture_details.get('match_round'))
             fixture = trols_stats.model.entities.Fixture(**fixture_details)
-            self.__fixtures_cache.append(fixture)
+            self.__fixture_map[key] = fixture
 
         return fixture
 
@@ -0,0 +1,166 @@
+"""Unit test cases for the :class:`trols_stats.AtomicWriter` class.
+
+"""
+import unittest
+import unittest.mock
+import os
+import tempfile
+import threading
+
+import trols_stats
+
+
+class TestAtomicWriter(unittest.TestCase):
+    def test_init(self):
+        """Initialise a trols_stats.AtomicWriter object.
+        """
+        writer = trols_stats.AtomicWriter()
+        msg = 'Object is not a trols_stats.AtomicWriter'
+        self.assertIsInstance(writer, trols_stats.AtomicWriter, msg)
+
+    def test_write(self):
+        """Replace a file atomically.
+        """
+        # Given an existing file
+        target_dir_obj = tempfile.TemporaryDirectory()
+        path = os.path.join(target_dir_obj.name, 'match.html')
+        with open(path, 'wb') as _fh:
+            _fh.write(b'old')
+
+        # when I write new content
+        writer = trols_stats.AtomicWriter()
+        writer.write(path, b'<html>new</html>')
+
+        # then the file should hold the new content
+        with open(path, 'rb') as _fh:
+            received = _fh.read()
+        msg = 'Atomic write content error'
+        self.assertEqual(received, b'<html>new</html>', msg)
+
+        # and no temporary files should remain
+        msg = 'Atomic write temporary file not removed'
+        self.assertListEqual(os.listdir(target_dir_obj.name),
+                             ['match.html'],
+                             msg)
+
+    def test_write_mode(self):
+        """Atomic writes keep the file mode.
+        """
+        # Given an existing file that is readable by all
+        target_dir_obj = tempfile.TemporaryDirectory()
+        path = os.path.join(target_dir_obj.name, 'match.html')
+        with open(path, 'wb') as _fh:
+            _fh.write(b'old')
+        os.chmod(path, 0o644)
+
+        # when I write new content
+        writer = trols_stats.AtomicWriter()
+        writer.write(path, b'new')
+
+        # then the file should keep its mode
+        msg = 'Atomic write changed the file mode'
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o644, msg)
+
+        # when I write a new file
+        path = os.path.join(target_dir_obj.name, 'new.html')
+        writer.write(path, b'new')
+
+        # then the file should take the default mode of the umask
+        umask = os.umask(0)
+        os.umask(umask)
+        msg = 'Atomic write new file mode error'
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o666 & ~umask, msg)
+
+    def test_write_fsync_before_rename(self):
+        """Batched writes flush the file content before the rename.
+        """
+        # Given a writer that flushes every 10 writes
+        target_dir_obj = tempfile.TemporaryDirectory()
+        path = os.path.join(target_dir_obj.name, 'match.html')
+        writer = trols_stats.AtomicWriter(fsync=10)
+
+        # when I write a file
+        calls = []
+        replace = os.replace
+        with unittest.mock.patch('os.fsync',
+                                 side_effect=lambda x: calls.append('fsync')):
+            with unittest.mock.patch('os.replace',
+                                     side_effect=lambda *x: (
+                                         calls.append('replace'),
+                                         replace(*x))):
+                writer.write(path, b'new')
+
+        # then the file content should be flushed before the rename
+        msg = 'File content not flushed before the rename'
+        self.assertListEqual(calls, ['fsync', 'replace'], msg)
+
+        # and the directory flush should wait for the batch
+        msg = 'Pending directory flush count error'
+        self.assertEqual(writer.pending, 1, msg)
+
+    def test_write_failed(self):
+        """Failed write leaves the original file in place.
+        """
+        # Given an existing file
+        target_dir_obj = tempfile.TemporaryDirectory()
+        path = os.path.join(target_dir_obj.name, 'match.html')
+        with open(path, 'wb') as _fh:
+            _fh.write(b'old')
+
+        # when the write fails before the rename
+        writer = trols_stats.AtomicWriter()
+        with unittest.mock.patch('os.replace', side_effect=OSError):
+            with self.assertRaises(OSError):
+                writer.write(path, b'new')
+
+        # then the original file should be intact
+        with open(path, 'rb') as _fh:
+            received = _fh.read()
+        msg = 'Failed atomic write changed the original file'
+        self.assertEqual(received, b'old', msg)
+
+        # and no temporary files should remain
+        msg = 'Failed atomic write temporary file not removed'
+        self.assertListEqual(os.listdir(target_dir_obj.name),
+                             ['match.html'],
+                             msg)
+
+    def test_write_fsync_batch(self):
+        """Flush a batch of writes to disk together.
+        """
+        # Given a writer that flushes every 3 writes
+        target_dir_obj = tempfile.TemporaryDirectory()
+        writer = trols_stats.AtomicWriter(fsync=3)
+
+        # when I write 2 files from different threads
+        threads = [
+            threading.Thread(target=writer.write,
+                             args=(os.path.join(target_dir_obj.name,
+                                                '{}.html'.format(x)),
+                                   'match {}'.format(x)))
+            for x in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # then both writes should wait for a flush
+        msg = 'Pending fsync count error'
+        self.assertEqual(writer.pending, 2, msg)
+
+        # when the third write fills the batch
+        with unittest.mock.patch('os.fsync') as mock_fsync:
+            writer.write(os.path.join(target_dir_obj.name, '2.html'),
+                         'match 2')
+
+        # then the third file and the directory should be flushed
+        msg = 'Batched fsync call count error'
+        self.assertEqual(mock_fsync.call_count, 2, msg)
+        self.assertEqual(writer.pending, 0, msg)
+
+        # and the files should hold their content
+        with open(os.path.join(target_dir_obj.name, '1.html')) as _fh:
+            received = _fh.read()
+        msg = 'Batched atomic write content error'
+        self.assertEqual(received, 'match 1', msg)
@@ -0,0 +1,147 @@
+"""Unit test cases for the :class:`trols_stats.CacheLayout` class.
+
+"""
+import unittest
+import os
+import shutil
+import tempfile
+
+import trols_stats
+
+
+class TestCacheLayout(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._cache_dir = os.path.join('trols_stats', 'tests', 'files', 'cache')
+        cls._match_files = sorted(x for x in os.listdir(cls._cache_dir)
+                                  if x.endswith('.html'))
+
+    def test_init(self):
+        """Initialise a trols_stats.CacheLayout object.
+        """
+        layout = trols_stats.CacheLayout(tempfile.mkdtemp())
+        msg = 'Object is not a trols_stats.CacheLayout'
+        self.assertIsInstance(layout, trols_stats.CacheLayout, msg)
+
+    def test_target_file(self):
+        """Sharded cache file path of a match popup.
+        """
+        # Given a cache layout
+        layout = trols_stats.CacheLayout('cache')
+
+        # when I build the cache file path of a match popup
+        received = layout.target_file('nejta_saturday_am_autumn_2015',
+                                      'AA039054')
+
+        # then the file should be sharded by league, competition and
+        # section
+        expected = os.path.join('cache',
+                                'nejta',
+                                'nejta_saturday_am_autumn_2015',
+                                'AA039',
+                                'nejta_saturday_am_autumn_2015--AA039054.html')
+        msg = 'Sharded cache file path error'
+        self.assertEqual(received, expected, msg)
+
+    def test_migrate(self):
+        """Move the flat cache layout into shards.
+        """
+        # Given a flat cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(self._cache_dir, cache_dir)
+
+        # when I migrate to the sharded layout
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            received = layout.migrate()
+
+        # then every HTML file should be moved
+        msg = 'Migrated HTML file count error'
+        self.assertEqual(received, len(self._match_files), msg)
+        remaining = [x for x in os.listdir(cache_dir) if x.endswith('.html')]
+        msg = 'Flat HTML files not moved'
+        self.assertListEqual(remaining, [], msg)
+
+        # and the layout manifest should list the competitions
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            received = layout.competitions()
+        expected = sorted({x.split('--')[0] for x in self._match_files})
+        msg = 'Layout manifest competitions error'
+        self.assertListEqual(received, expected, msg)
+
+        # and the HTML files should be listed in file name order
+        received = [os.path.basename(x) for x in layout.html_files()]
+        msg = 'Sharded HTML files error'
+        self.assertListEqual(received, self._match_files, msg)
+
+        # and the manifest should be rebuilt if it is lost
+        os.remove(layout.path)
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            received = layout.competitions()
+        msg = 'Rebuilt layout manifest competitions error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_load_stale(self):
+        """Rebuild a layout manifest that does not list every section.
+        """
+        # Given a sharded cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(self._cache_dir, cache_dir)
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            layout.migrate()
+
+        # and a match popup sharded after the manifest was saved
+        comp_token = 'nejta_saturday_am_spring_2017'
+        target_file = layout.target_file(comp_token, 'AB001001')
+        os.makedirs(os.path.dirname(target_file))
+        shutil.copy(layout.html_files()[0], target_file)
+
+        # when I load the layout
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            received = layout.html_files([comp_token])
+
+        # then the unlisted section should be listed
+        msg = 'Stale layout manifest HTML files error'
+        self.assertListEqual(received, [target_file], msg)
+
+        # and the manifest should be saved
+        with open(layout.path) as _fh:
+            received = _fh.read()
+        msg = 'Stale layout manifest not rebuilt'
+        self.assertIn(comp_token, received, msg)
+
+    def test_html_files_mixed(self):
+        """List the HTML files of one competition across both layouts.
+        """
+        # Given a flat cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(self._cache_dir, cache_dir)
+
+        # and one match popup also in the sharded layout
+        comp_token = 'nejta_saturday_am_autumn_2017'
+        layout = trols_stats.CacheLayout(cache_dir)
+        target_file = layout.target_file(comp_token, 'AA026032')
+        os.makedirs(os.path.dirname(target_file))
+        shutil.copy(os.path.join(cache_dir, os.path.basename(target_file)),
+                    target_file)
+        layout.add(comp_token, 'AA026032')
+
+        # when I list the HTML files of the competition
+        received = layout.html_files([comp_token])
+
+        # then I should receive the flat and the sharded files once
+        expected = [
+            os.path.join(cache_dir,
+                         'nejta_saturday_am_autumn_2017--AA008034.html'),
+            target_file,
+        ]
+        msg = 'Mixed layout HTML files error'
+        self.assertListEqual(received, expected, msg)
+
+        # and the sharded file should be located first
+        msg = 'Sharded cache file not located'
+        self.assertEqual(layout.locate(comp_token, 'AA026032'),
+                         target_file,
+                         msg)
@@ -82,6 +82,62 @@ class TestConfig(unittest.TestCase):
         msg = 'trols_stats.Config.shelve error'
         self.assertEqual(received, expected, msg)
 
+    def test_parse_config_parse_cache(self):
+        """Parse parse_cache from the config.
+        """
+        # Given a TROLS Stats config instance
+        conf = trols_stats.Config(self.__conf_path)
+
+        # when I reference the parse_cache attribute
+        received = conf.parse_cache
+
+        # then I should get the expected directory
+        expected = os.path.join(os.sep, 'tmp', 'trols_parse_cache')
+        msg = 'trols_stats.Config.parse_cache error'
+        self.assertEqual(received, expected, msg)
+
+    def test_parse_config_http(self):
+        """Parse the HTTP connection pool settings from the config.
+        """
+        # Given a TROLS Stats config instance
+        conf = trols_stats.Config(self.__conf_path)
+
+        # when I reference the HTTP connection pool attributes
+        received = (conf.pool_size, conf.idle_timeout)
+
+        # then I should get the typed settings
+        expected = (2, 15.5)
+        msg = 'trols_stats.Config HTTP connection pool error'
+        self.assertTupleEqual(received, expected, msg)
+
+    def test_parse_config_http_throttle(self):
+        """Parse the HTTP rate limit and retry settings from the config.
+        """
+        # Given a TROLS Stats config instance
+        conf = trols_stats.Config(self.__conf_path)
+
+        # when I reference the HTTP throttle attributes
+        received = (conf.rate_limit, conf.max_retries)
+
+        # then I should get the typed settings
+        expected = (2.5, 5)
+        msg = 'trols_stats.Config HTTP throttle error'
+        self.assertTupleEqual(received, expected, msg)
+
+    def test_parse_config_cache_fsync(self):
+        """Parse the cache fsync batch from the config.
+        """
+        # Given a TROLS Stats config instance
+        conf = trols_stats.Config(self.__conf_path)
+
+        # when I reference the cache fsync attribute
+        received = conf.cache_fsync
+
+        # then I should get the typed setting
+        expected = 64
+        msg = 'trols_stats.Config cache fsync error'
+        self.assertEqual(received, expected, msg)
+
     @classmethod
     def tearDownClass(cls):
         cls.__test_dir = None
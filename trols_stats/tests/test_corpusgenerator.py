@@ -0,0 +1,166 @@
+"""Unit test cases for the :class:`trols_stats.CorpusGenerator` class.
+
+"""
+import unittest
+import datetime
+import tempfile
+
+import trols_stats
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    def test_init(self):
+        """Initialise a trols_stats.CorpusGenerator object.
+        """
+        generator = trols_stats.CorpusGenerator()
+        msg = 'Object is not a trols_stats.CorpusGenerator'
+        self.assertIsInstance(generator, trols_stats.CorpusGenerator, msg)
+
+    def test_init_unknown_league(self):
+        """Initialise a trols_stats.CorpusGenerator: unknown league.
+        """
+        with self.assertRaises(ValueError):
+            trols_stats.CorpusGenerator(leagues=['banana'])
+
+    def test_competitions(self):
+        """Competition tokens of alternating seasons.
+        """
+        # Given a generator of 3 seasons
+        generator = trols_stats.CorpusGenerator(leagues=['nejta'], seasons=3)
+
+        # when I list the competitions
+        received = [x[0] for x in generator.competitions()]
+
+        # then autumn and spring should alternate
+        expected = [
+            'nejta_saturday_am_autumn_2015',
+            'nejta_saturday_am_spring_2015',
+            'nejta_saturday_am_autumn_2016',
+        ]
+        msg = 'Synthetic competition tokens error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_round_robin(self):
+        """Circle method round robin.
+        """
+        # When I draw 4 teams over 3 rounds
+        received = trols_stats.CorpusGenerator.round_robin(4, 3)
+
+        # then every team should meet every other team once
+        pairs = {frozenset(x) for x in sum(received, [])}
+        msg = 'Round robin pairs error'
+        self.assertEqual(len(pairs), 6, msg)
+
+        # and an odd team count should give a bye
+        received = trols_stats.CorpusGenerator.round_robin(5, 5)
+        msg = 'Round robin bye error'
+        self.assertListEqual([len(x) for x in received], [2] * 5, msg)
+
+    def test_format_date(self):
+        """TROLS match date.
+        """
+        # Given match dates
+        dates = [
+            datetime.date(2015, 2, 1),
+            datetime.date(2015, 2, 12),
+            datetime.date(2015, 2, 23),
+        ]
+
+        # when I format the dates
+        received = [trols_stats.CorpusGenerator.format_date(x) for x in dates]
+
+        # then I should receive the TROLS preamble dates
+        expected = ['1st Feb 15', '12th Feb 15', '23rd Feb 15']
+        msg = 'TROLS match date error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_generate(self):
+        """Generate match popups that scrape like the fixtures.
+        """
+        # Given a generator of 2 sections of 4 teams over 3 rounds
+        kwargs = {
+            'leagues': ['nejta'],
+            'sections': 2,
+            'teams': 4,
+            'rounds': 3,
+            'seed': 1,
+        }
+        generator = trols_stats.CorpusGenerator(**kwargs)
+
+        # when I generate the corpus
+        matches = list(generator.generate())
+
+        # then each section should have 6 round matches and 3 finals
+        msg = 'Synthetic match count error'
+        self.assertEqual(len(matches), 18, msg)
+
+        # and the first match should scrape
+        comp_token, match_id, html = matches[0]
+        received = trols_stats.Scraper.parse_match(html)
+        msg = 'Synthetic match ID error'
+        self.assertEqual((comp_token, match_id),
+                         ('nejta_saturday_am_autumn_2015', 'AA001001'),
+                         msg)
+        expected = {
+            'competition_type': 'boys',
+            'section': 1,
+            'match_round': 1,
+            'date': '1 Feb 15',
+        }
+        msg = 'Synthetic match preamble error'
+        self.assertDictEqual(received['preamble'], expected, msg)
+        msg = 'Synthetic match player count error'
+        self.assertEqual(len(received['players']), 8, msg)
+
+        # and the fast parser should agree
+        msg = 'Synthetic match fast parser error'
+        self.assertDictEqual(trols_stats.Scraper.parse_match(html, fast=True),
+                             received,
+                             msg)
+
+        # and the match should be finalised
+        msg = 'Synthetic match not finalised'
+        self.assertTrue(trols_stats.Scraper.is_finalised(html), msg)
+
+        # and the last match should be the grand final
+        received = trols_stats.Scraper.parse_match(matches[-1][2])
+        msg = 'Synthetic grand final error'
+        self.assertEqual(received['preamble']['match_round'],
+                         'Grand Final',
+                         msg)
+
+        # and the corpus should be the same for the same seed
+        msg = 'Synthetic corpus not deterministic'
+        self.assertListEqual(list(generator.generate()), matches, msg)
+
+    def test_write_construct(self):
+        """Write a synthetic corpus and build the data model from it.
+        """
+        # Given a synthetic corpus in the sharded layout
+        kwargs = {
+            'seasons': 2,
+            'sections': 2,
+            'teams': 4,
+            'rounds': 3,
+        }
+        generator = trols_stats.CorpusGenerator(**kwargs)
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.CacheLayout(cache_dir_obj.name) as layout:
+            count = generator.write(cache_dir_obj.name, layout=layout)
+
+        # then each of the 6 competitions should have 18 matches
+        msg = 'Synthetic corpus match count error'
+        self.assertEqual(count, 108, msg)
+
+        # when I construct the data model
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        model = trols_stats.DataModel(shelve=shelve_dir_obj.name)
+        model.construct(cache_dir_obj.name)
+
+        # then every competition should be built
+        received = {x.fixture.competition
+                    for games in model().values()
+                    for x in games}
+        expected = {x[0] for x in generator.competitions()}
+        msg = 'Synthetic corpus competitions build error'
+        self.assertSetEqual(received, expected, msg)
@@ -3,6 +3,7 @@
 """
 import unittest
 import os
+import shutil
 import tempfile
 
 import trols_stats
@@ -50,3 +51,205 @@ class TestDataModel(unittest.TestCase):
         # then I should receive a count of tokens stored
         msg = 'Shelve token count error'
         self.assertEqual(received, 40, msg)
+
+    def test_construct_parse_cache(self):
+        """Construct a TROLS Stats store via the parse cache.
+        """
+        # Given a source HTML directory location
+        source_html_dir = os.path.join('trols_stats',
+                                       'tests',
+                                       'files',
+                                       'cache')
+
+        # and a shelve directory
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        shelve_dir = shelve_dir_obj.name
+
+        # and a parse cache directory
+        parse_cache_dir_obj = tempfile.TemporaryDirectory()
+        parse_cache_dir = parse_cache_dir_obj.name
+
+        # when I construct the datastore twice through the parse cache
+        model = trols_stats.DataModel(shelve=shelve_dir)
+        model.construct(source_html_dir, parse_cache=parse_cache_dir)
+        expected = model()
+        received = model.construct(source_html_dir,
+                                   parse_cache=parse_cache_dir)
+
+        # then I should receive a count of tokens stored
+        msg = 'Parse cache shelve token count error'
+        self.assertEqual(received, 40, msg)
+
+        # and the rehydrated games should match the scraped games
+        msg = 'Parse cache game content error'
+        self.assertListEqual(sorted(model().keys()),
+                             sorted(expected.keys()),
+                             msg)
+        for token, games in expected.items():
+            self.assertListEqual([x() for x in model()[token]],
+                                 [x() for x in games],
+                                 msg)
+
+    def test_construct_workers(self):
+        """Construct a TROLS Stats store across worker processes.
+        """
+        # Given a source HTML directory location
+        source_html_dir = os.path.join('trols_stats',
+                                       'tests',
+                                       'files',
+                                       'cache')
+
+        # and a serial build of the datastore
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        model = trols_stats.DataModel(shelve=shelve_dir_obj.name)
+        model.construct(source_html_dir)
+        expected = {k: [x() for x in v] for k, v in model().items()}
+
+        # and a parse cache directory
+        parse_cache_dir_obj = tempfile.TemporaryDirectory()
+        parse_cache_dir = parse_cache_dir_obj.name
+
+        for run in ('cold', 'warm'):
+            # when I construct the datastore with 2 workers
+            kwargs = {
+                'parse_cache': parse_cache_dir,
+                'workers': 2,
+            }
+            received = model.construct(source_html_dir, **kwargs)
+
+            # then I should receive a count of tokens stored
+            msg = 'Parallel shelve token count error ({})'.format(run)
+            self.assertEqual(received, 40, msg)
+
+            # and the content should match the serial build
+            received = {k: [x() for x in v] for k, v in model().items()}
+            msg = 'Parallel build content error ({})'.format(run)
+            self.assertListEqual(list(received.keys()),
+                                 list(expected.keys()),
+                                 msg)
+            self.assertDictEqual(received, expected, msg)
+
+        # and the workers' scrapes should have been written to the cache
+        with trols_stats.ParseCache(parse_cache_dir, readonly=True) as cache:
+            for html_file in sorted(os.listdir(source_html_dir)):
+                path = os.path.join(source_html_dir, html_file)
+                with open(path, 'rb') as _fh:
+                    digest = trols_stats.ParseCache.digest(_fh.read())
+                msg = 'Parallel build parse cache entry missing'
+                self.assertIsNotNone(cache.get(digest), msg)
+
+    def test_construct_pack(self):
+        """Construct a TROLS Stats store from a pack cache.
+        """
+        # Given a source HTML directory location
+        source_html_dir = os.path.join('trols_stats',
+                                       'tests',
+                                       'files',
+                                       'cache')
+
+        # and a build of the datastore from the HTML files
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        model = trols_stats.DataModel(shelve=shelve_dir_obj.name)
+        model.construct(source_html_dir)
+        expected = {k: [x() for x in v] for k, v in model().items()}
+
+        # and the HTML files migrated into a pack with one left behind
+        pack_dir_obj = tempfile.TemporaryDirectory()
+        pack_dir = os.path.join(pack_dir_obj.name, 'cache')
+        shutil.copytree(source_html_dir, pack_dir)
+        with trols_stats.PackCache(pack_dir) as pack:
+            pack.migrate(pack_dir, remove=True)
+        shutil.copy(os.path.join(source_html_dir,
+                                 'nejta_saturday_am_autumn_2017--AA008034.html'),
+                    pack_dir)
+
+        for workers in (None, 2):
+            # when I construct the datastore from the pack
+            received = model.construct(pack_dir, workers=workers)
+
+            # then I should receive a count of tokens stored
+            msg = 'Pack shelve token count error (workers={})'.format(workers)
+            self.assertEqual(received, 40, msg)
+
+            # and the content should match the HTML file build
+            received = {k: [x() for x in v] for k, v in model().items()}
+            msg = 'Pack build content error (workers={})'.format(workers)
+            self.assertListEqual(list(received.keys()),
+                                 list(expected.keys()),
+                                 msg)
+            self.assertDictEqual(received, expected, msg)
+
+    def test_construct_pack_stale(self):
+        """HTML file takes the place of a stale pack record.
+        """
+        # Given a source HTML directory location
+        source_html_dir = os.path.join('trols_stats',
+                                       'tests',
+                                       'files',
+                                       'cache')
+
+        # and a build of the datastore from the HTML files
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        model = trols_stats.DataModel(shelve=shelve_dir_obj.name)
+        model.construct(source_html_dir)
+        expected = {k: [x() for x in v] for k, v in model().items()}
+
+        # and the HTML files migrated into a pack
+        pack_dir_obj = tempfile.TemporaryDirectory()
+        pack_dir = os.path.join(pack_dir_obj.name, 'cache')
+        shutil.copytree(source_html_dir, pack_dir)
+        with trols_stats.PackCache(pack_dir) as pack:
+            pack.migrate(pack_dir, remove=True)
+
+            # and a stale pack record of a match popup
+            key = 'nejta_saturday_am_autumn_2017--AA008034.html'
+            stale_file = 'dvta_friday_night_autumn_2017--FN004034.html'
+            pack.put(key, pack.get(stale_file))
+
+        # and the match popup fetched again into an HTML file
+        shutil.copy(os.path.join(source_html_dir, key), pack_dir)
+
+        for workers in (None, 2):
+            # when I construct the datastore from the pack
+            model.construct(pack_dir, workers=workers)
+
+            # then the content should match the HTML file build
+            received = {k: [x() for x in v] for k, v in model().items()}
+            msg = 'Stale pack build content error (workers={})'.format(workers)
+            self.assertDictEqual(received, expected, msg)
+
+    def test_construct_competition(self):
+        """Construct one competition from a sharded cache.
+        """
+        # Given a sharded source HTML directory
+        source_html_dir = os.path.join('trols_stats',
+                                       'tests',
+                                       'files',
+                                       'cache')
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(source_html_dir, cache_dir)
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            layout.migrate()
+
+        # and a shelve directory
+        shelve_dir_obj = tempfile.TemporaryDirectory()
+        model = trols_stats.DataModel(shelve=shelve_dir_obj.name)
+
+        # when I construct the datastore
+        received = model.construct(cache_dir)
+
+        # then the sharded layout should build the same token count
+        msg = 'Sharded layout shelve token count error'
+        self.assertEqual(received, 40, msg)
+
+        # when I construct the one competition
+        comp_token = 'nejta_saturday_am_autumn_2017'
+        model.construct(cache_dir, competitions=[comp_token])
+
+        # then only its games should be built
+        received = {x.fixture.competition
+                    for games in model().values()
+                    for x in games}
+        msg = 'Competition build error'
+        self.assertSetEqual(received, {comp_token}, msg)
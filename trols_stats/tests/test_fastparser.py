@@ -0,0 +1,139 @@
+"""Unit test cases for the :class:`trols_stats.FastParser` class.
+
+"""
+import unittest
+import os
+
+import trols_stats
+
+
+class TestFastParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.maxDiff = None
+
+        cls._files_dir = os.path.join('trols_stats', 'tests', 'files')
+
+        # Every match popup fixture in the project.
+        cls._match_files = []
+        for root, _, files in os.walk('trols_stats'):
+            for match_file in sorted(files):
+                if match_file.endswith('.html'):
+                    cls._match_files.append(os.path.join(root, match_file))
+
+    def test_parse_match_equivalence(self):
+        """FastParser and lxml parse_match equivalence: all fixtures.
+        """
+        msg = 'No match popup fixtures found'
+        self.assertTrue(self._match_files, msg)
+
+        for match_file in self._match_files:
+            with self.subTest(match_file=match_file):
+                # Given a TROLS detailed match results page
+                with open(match_file) as _fh:
+                    html = _fh.read()
+
+                # when I parse the match with the fast parser
+                received = trols_stats.FastParser.parse_match(html)
+
+                # then I should receive the lxml parse result
+                expected = trols_stats.Scraper.parse_match(html)
+                msg = 'Fast parser result differs from lxml'
+                self.assertDictEqual(received, expected, msg)
+
+    def test_parse_scores_equivalence(self):
+        """FastParser and Scraper parse_scores equivalence.
+        """
+        # Given score table cells of singles and doubles rows
+        doubles = ['1+2', '6-3', '1+2', '3+4', '2-6', '3+4']
+        singles = ['1', '6-3', '2', '2', '8-6', '1']
+
+        # and tables that the fast path leaves to the Scraper
+        fallbacks = [
+            ['1+2', None, '1+2', '3+4', '6-2', '3+4'],
+            ['1+2', '6', '1+2', '3+4', '6-2', '3+4'],
+            ['1', '6-3', '1+2'],
+            ['1+2', '6-3'],
+        ]
+
+        for raw_scores in [doubles, singles, doubles + singles] + fallbacks:
+            with self.subTest(raw_scores=raw_scores):
+                # when I parse the scores with the fast parser
+                received = trols_stats.FastParser.parse_scores(raw_scores)
+
+                # then I should receive the Scraper parse result
+                expected = trols_stats.Scraper.parse_scores(raw_scores)
+                msg = 'Fast parser scores differ from the Scraper'
+                self.assertDictEqual(received, expected, msg)
+                msg = 'Fast parser score player order differs'
+                self.assertListEqual(list(received), list(expected), msg)
+
+    def test_tokenise(self):
+        """Tokenise the raw match components.
+        """
+        # Given a TROLS detailed match results page
+        match_file = 'match_AA039094.html'
+        with open(os.path.join(self._files_dir, match_file)) as _fh:
+            html = _fh.read()
+
+        # when I tokenise the page
+        received = trols_stats.FastParser.tokenise(html)
+
+        # then I should receive the raw teams
+        expected = [('Watsonia\xa0', 'Red'), ('Watsonia\xa0', 'Blue')]
+        msg = 'Tokenised teams error'
+        self.assertListEqual(received.get('teams'), expected, msg)
+
+        # and the raw preamble
+        expected = 'GIRLS 14\xa0on\xa018th Apr 15\xa0\xa0Rd.9'
+        msg = 'Tokenised preamble error'
+        self.assertEqual(received.get('preamble'), expected, msg)
+
+        # and the score cells as home|score|away triplets
+        expected = ['1+2', '1-6', '1+2']
+        msg = 'Tokenised scores error'
+        self.assertListEqual(received.get('scores')[:3], expected, msg)
+        self.assertEqual(len(received.get('scores')), 12, msg)
+
+    def test_parse_match_rejects_unsupported_markup(self):
+        """FastParser rejects pages with unsupported markup.
+        """
+        # Given a TROLS detailed match results page with a comment
+        match_file = 'match_AA039094.html'
+        with open(os.path.join(self._files_dir, match_file)) as _fh:
+            html = _fh.read().replace('<td>1.  Grace Heaver</td>',
+                                      '<td>1.  Grace<!-- x --> Heaver</td>')
+
+        # when I parse the match with the fast parser
+        received = trols_stats.FastParser.parse_match(html)
+
+        # then the page should be rejected
+        msg = 'Fast parser should reject commented page'
+        self.assertIsNone(received, msg)
+
+    def test_scraper_parse_match_fast_fallback(self):
+        """Scraper parse_match fast mode falls back to lxml.
+        """
+        # Given a TROLS detailed match results page that the fast
+        # parser does not support
+        match_file = 'match_AA039094.html'
+        with open(os.path.join(self._files_dir, match_file)) as _fh:
+            html = _fh.read().replace('<b>Watsonia&nbsp;<span',
+                                      '<B>Watsonia&nbsp;<span')
+        html = html.replace('Red</span></b>', 'Red</span></B>')
+
+        # when I parse the match in fast mode
+        received = trols_stats.Scraper.parse_match(html, fast=True)
+
+        # then I should receive the lxml parse result
+        expected = trols_stats.Scraper.parse_match(html)
+        msg = 'Fast mode fallback result error'
+        self.assertDictEqual(received, expected, msg)
+
+        msg = 'Fallback should still color code the home team'
+        self.assertEqual(received['teams']['home_team'], 'Watsonia Red', msg)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._files_dir = None
+        cls._match_files = None
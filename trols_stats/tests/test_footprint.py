@@ -0,0 +1,54 @@
+"""Unit test cases for the :class:`trols_stats.Footprint` class.
+
+"""
+import unittest
+
+import trols_stats
+
+
+class TestFootprint(unittest.TestCase):
+    def test_init(self):
+        """Initialise a trols_stats.Footprint object.
+        """
+        footprint = trols_stats.Footprint()
+        msg = 'Object is not a trols_stats.Footprint'
+        self.assertIsInstance(footprint, trols_stats.Footprint, msg)
+
+    def test_measure(self):
+        """Measure the per-object memory of the data model classes.
+        """
+        # Given the default data model samples
+        footprint = trols_stats.Footprint(count=2000)
+
+        # when the memory is measured
+        received = footprint.measure()
+
+        # then each class should be reported
+        expected = ['Game', 'Player', 'Fixture', 'MatchRound', 'Statistics']
+        msg = 'Footprint classes error'
+        self.assertListEqual([x.get('class') for x in received],
+                             expected,
+                             msg)
+
+        # and the slotted objects should be smaller
+        msg = 'Slotted objects not smaller than their __dict__ form'
+        for report in received:
+            self.assertGreater(report.get('saving'), 0, msg)
+
+    def test_state(self):
+        """Instance __dict__ form of a slotted object.
+        """
+        # Given a slotted player
+        player = trols_stats.model.entities.Player(name='Tara Watson',
+                                                   team='Watsonia Red')
+
+        # when its state is taken
+        received = trols_stats.Footprint.state(player)
+
+        # then I should receive the mangled attribute names
+        expected = {
+            '_Player__name': 'Tara Watson',
+            '_Player__team': 'Watsonia Red',
+        }
+        msg = 'Footprint state error'
+        self.assertDictEqual(received, expected, msg)
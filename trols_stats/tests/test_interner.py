@@ -0,0 +1,116 @@
+"""Unit test cases for the :class:`trols_stats.Interner` class.
+
+"""
+import unittest
+import os
+import pickle
+
+import trols_stats
+import trols_stats.interface
+
+
+class TestInterner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._test_dir = os.path.join('trols_stats', 'tests', 'files')
+        cls._match_files = sorted(x for x in os.listdir(cls._test_dir)
+                                  if x.endswith('.html') and '--' in x)
+
+    def test_init(self):
+        """Initialise a trols_stats.Interner object.
+        """
+        interner = trols_stats.Interner()
+        msg = 'Object is not a trols_stats.Interner'
+        self.assertIsInstance(interner, trols_stats.Interner, msg)
+
+    def test_string(self):
+        """Intern equal strings to the one object.
+        """
+        # Given two equal strings that are different objects
+        interner = trols_stats.Interner()
+        first = ''.join(['Watsonia ', 'Red'])
+        second = ''.join(['Watsonia', ' Red'])
+
+        # when they are interned
+        received = (interner.string(first), interner.string(second))
+
+        # then both should be the first object
+        msg = 'Interned strings are not the same object'
+        self.assertIs(received[0], first, msg)
+        self.assertIs(received[1], first, msg)
+
+        # and non-string values should pass through
+        msg = 'Non-string value changed'
+        self.assertEqual(interner.string(5), 5, msg)
+        self.assertIsNone(interner.string(None), msg)
+
+        # and the table should hold one string
+        msg = 'Interned string count error'
+        self.assertEqual(interner.strings, 1, msg)
+
+    def test_games_merge(self):
+        """Merge the games of separately loaded matches.
+        """
+        # Given the same matches loaded by two loaders
+        batches = []
+        for _ in range(2):
+            loader = trols_stats.interface.Loader()
+            for match_file in self._match_files:
+                path = os.path.join(self._test_dir, match_file)
+                with open(path, 'rb') as _fh:
+                    loader.build_game_map(_fh.read(), match_file)
+            batches.append(loader.games)
+
+        # when the batches are merged
+        interner = trols_stats.Interner()
+        for games in batches:
+            interner.games(games)
+
+        # then equal games should share their players and fixture
+        msg = 'Merged games do not share their entities'
+        for first, second in zip(*batches):
+            self.assertIs(first.player, second.player, msg)
+            self.assertIs(first.team_mate, second.team_mate, msg)
+            self.assertIs(first.fixture, second.fixture, msg)
+
+        # and the player map should hold each player once
+        players = {(x.player.name, x.player.team) for x in batches[0]}
+        msg = 'Merged player map size error'
+        self.assertTrue(players.issubset(interner.player_map), msg)
+        self.assertNotIn((None, None), interner.player_map, msg)
+
+        # and the merged entities should use less memory
+        report = interner.report()
+        msg = 'Interned memory not less than the separate copies'
+        self.assertLess(report.get('after'), report.get('before'), msg)
+
+    def test_games_pickle(self):
+        """Interned games pickle smaller than the separate copies.
+        """
+        # Given the games of the same matches loaded by two loaders
+        batches = []
+        for _ in range(2):
+            loader = trols_stats.interface.Loader()
+            for match_file in self._match_files:
+                path = os.path.join(self._test_dir, match_file)
+                with open(path, 'rb') as _fh:
+                    loader.build_game_map(_fh.read(), match_file)
+            batches.append(loader.games)
+        separate = len(pickle.dumps(batches[0] + batches[1]))
+
+        # when the batches are merged
+        interner = trols_stats.Interner()
+        for games in batches:
+            interner.games(games)
+
+        # then the pickle should shrink
+        received = len(pickle.dumps(batches[0] + batches[1]))
+        msg = 'Interned games pickle not smaller'
+        self.assertLess(received, separate, msg)
+
+        # and round trip to equal games
+        msg = 'Interned games pickle round trip error'
+        restored = pickle.loads(pickle.dumps(batches[0]))
+        self.assertListEqual([x() for x in restored],
+                             [x() for x in batches[0]],
+                             msg)
@@ -0,0 +1,243 @@
+"""Unit test cases for the :class:`trols_stats.PackCache` class.
+
+"""
+import unittest
+import os
+import shutil
+import tempfile
+
+import trols_stats
+
+
+class TestPackCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._cache_dir = os.path.join('trols_stats', 'tests', 'files', 'cache')
+
+        cls._match_files = {}
+        for match_file in sorted(os.listdir(cls._cache_dir)):
+            if match_file.endswith('.html'):
+                with open(os.path.join(cls._cache_dir, match_file), 'rb') as _fh:
+                    cls._match_files[match_file] = _fh.read()
+
+    def test_init(self):
+        """Initialise a trols_stats.PackCache object.
+        """
+        pack = trols_stats.PackCache(tempfile.mkdtemp())
+        msg = 'Object is not a trols_stats.PackCache'
+        self.assertIsInstance(pack, trols_stats.PackCache, msg)
+
+    def test_put_get(self):
+        """Random access to the pack records.
+        """
+        # Given a pack
+        pack_dir_obj = tempfile.TemporaryDirectory()
+
+        # when I append the match popups
+        with trols_stats.PackCache(pack_dir_obj.name) as pack:
+            for key, data in self._match_files.items():
+                pack.put(key, data)
+
+        # then the records should be readable after a reopen
+        with trols_stats.PackCache(pack_dir_obj.name, readonly=True) as pack:
+            msg = 'Pack keys error'
+            self.assertListEqual(pack.keys(), sorted(self._match_files), msg)
+
+            for key, data in self._match_files.items():
+                msg = 'Pack record "{}" content error'.format(key)
+                self.assertEqual(pack.get(key), data, msg)
+
+            msg = 'Unknown pack record should be None'
+            self.assertIsNone(pack.get('banana.html'), msg)
+
+        # and the pack should be smaller than the HTML files
+        msg = 'Pack is not compressed'
+        self.assertLess(os.path.getsize(pack.path),
+                        sum(len(x) for x in self._match_files.values()),
+                        msg)
+
+    def test_scan(self):
+        """Sequential scan skips records that were written again.
+        """
+        # Given a pack with a record that was written twice
+        pack_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.PackCache(pack_dir_obj.name) as pack:
+            pack.put('a.html', b'first')
+            pack.put('b.html', b'second')
+            pack.put('a.html', b'third')
+
+            # when I scan the pack
+            received = list(pack.scan())
+
+        # then I should receive the current records in pack order
+        expected = [('b.html', b'second'), ('a.html', b'third')]
+        msg = 'Pack scan error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_index_rebuild(self):
+        """Rebuild a missing index and drop a partly written record.
+        """
+        # Given a pack
+        pack_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.PackCache(pack_dir_obj.name) as pack:
+            pack.put('a.html', b'first')
+            pack.put('b.html', b'second')
+
+        # and a lost index
+        os.remove(pack.index_path)
+
+        # and a partly written record
+        with open(pack.path, 'ab') as _fh:
+            _fh.write(trols_stats.PackCache.encode('c.html', b'third')[:-2])
+
+        # when I open the pack
+        with trols_stats.PackCache(pack_dir_obj.name) as pack:
+            received = {x: pack.get(x) for x in pack.keys()}
+
+            # and append another record
+            pack.put('c.html', b'fourth')
+
+        # then the complete records should be indexed
+        expected = {'a.html': b'first', 'b.html': b'second'}
+        msg = 'Rebuilt pack index error'
+        self.assertDictEqual(received, expected, msg)
+
+        # and the partly written record should be dropped
+        with trols_stats.PackCache(pack_dir_obj.name, readonly=True) as pack:
+            received = list(pack.scan())
+        expected = [
+            ('a.html', b'first'),
+            ('b.html', b'second'),
+            ('c.html', b'fourth'),
+        ]
+        msg = 'Pack with a partly written record scan error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_migrate_compact(self):
+        """Migrate the HTML cache directory into the pack.
+        """
+        # Given a HTML cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(self._cache_dir, cache_dir)
+
+        # when I migrate the HTML files into the pack
+        with trols_stats.PackCache(cache_dir) as pack:
+            received = pack.migrate(cache_dir, remove=True)
+
+            # and write a record again
+            key = sorted(self._match_files)[0]
+            pack.put(key, self._match_files[key])
+
+            # and compact the pack
+            reclaimed = pack.compact()
+
+        # then every HTML file should be migrated
+        msg = 'Migrated HTML file count error'
+        self.assertEqual(received, len(self._match_files), msg)
+
+        # and removed
+        remaining = [x for x in os.listdir(cache_dir) if x.endswith('.html')]
+        msg = 'Migrated HTML files not removed'
+        self.assertListEqual(remaining, [], msg)
+
+        # and the compacted pack should drop the old record
+        msg = 'Compacted pack bytes reclaimed error'
+        self.assertGreater(reclaimed, 0, msg)
+
+        with trols_stats.PackCache(cache_dir, readonly=True) as pack:
+            received = dict(pack.scan())
+        msg = 'Compacted pack content error'
+        self.assertDictEqual(received, self._match_files, msg)
+
+    def test_migrate_remove_sharded(self):
+        """Migrate and remove the sharded HTML cache prunes the layout.
+        """
+        # Given a sharded HTML cache directory
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = os.path.join(cache_dir_obj.name, 'cache')
+        shutil.copytree(self._cache_dir, cache_dir)
+        with trols_stats.CacheLayout(cache_dir) as layout:
+            layout.migrate()
+
+        # when I migrate the HTML files into the pack and remove them
+        with trols_stats.PackCache(cache_dir) as pack:
+            received = pack.migrate(cache_dir, remove=True)
+
+        # then every HTML file should be migrated
+        msg = 'Migrated HTML file count error'
+        self.assertEqual(received, len(self._match_files), msg)
+
+        # and the layout manifest should not list the removed files
+        layout = trols_stats.CacheLayout(cache_dir)
+        layout.load()
+        msg = 'Layout manifest lists removed competitions'
+        self.assertListEqual(layout.competitions(), [], msg)
+        msg = 'Layout lists removed HTML files'
+        self.assertListEqual(layout.html_files(), [], msg)
+
+    def test_compact_writer(self):
+        """Compact the pack through the shared atomic writer.
+        """
+        # Given a pack with a record that was written twice
+        pack_dir_obj = tempfile.TemporaryDirectory()
+        writer = trols_stats.AtomicWriter(fsync=10)
+        with trols_stats.PackCache(pack_dir_obj.name, writer=writer) as pack:
+            pack.put('a.html', b'first')
+            pack.put('b.html', b'second')
+            pack.put('a.html', b'third')
+
+            # when I compact the pack
+            pack.compact()
+
+            # then the compacted pack and its index should wait for
+            # the writer flush
+            msg = 'Compacted pack not written by the atomic writer'
+            self.assertEqual(writer.pending, 2, msg)
+
+            # and the pack should remain writable
+            pack.put('c.html', b'fourth')
+
+        # and the close should flush the writer
+        msg = 'Pack close did not flush the atomic writer'
+        self.assertEqual(writer.pending, 0, msg)
+
+        with trols_stats.PackCache(pack_dir_obj.name, readonly=True) as pack:
+            received = list(pack.scan())
+        expected = [
+            ('a.html', b'third'),
+            ('b.html', b'second'),
+            ('c.html', b'fourth'),
+        ]
+        msg = 'Compacted pack content error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_migrate_refetched(self):
+        """Migrate replaces a packed record with a file fetched again.
+        """
+        # Given a pack with a migrated HTML file
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        cache_dir = cache_dir_obj.name
+        html_file = os.path.join(cache_dir, 'a.html')
+        with open(html_file, 'wb') as _fh:
+            _fh.write(b'first')
+        with trols_stats.PackCache(cache_dir) as pack:
+            pack.migrate(cache_dir, remove=True)
+
+        # and the HTML file fetched again with new content
+        with open(html_file, 'wb') as _fh:
+            _fh.write(b'second')
+
+        # when I migrate and remove the HTML files again
+        with trols_stats.PackCache(cache_dir) as pack:
+            received = pack.migrate(cache_dir, remove=True)
+
+            # then the pack should hold the new content
+            msg = 'Refetched HTML file not migrated'
+            self.assertEqual(received, 1, msg)
+            msg = 'Refetched HTML file content lost'
+            self.assertEqual(pack.get('a.html'), b'second', msg)
+
+        # and the HTML file should be removed
+        msg = 'Migrated HTML file not removed'
+        self.assertFalse(os.path.exists(html_file), msg)
@@ -0,0 +1,156 @@
+"""Unit test cases for the :class:`trols_stats.ParseCache` class.
+
+"""
+import unittest
+import os
+import tempfile
+import dbm
+
+import trols_stats
+import trols_stats.parsecache
+
+
+class TestParseCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.maxDiff = None
+
+        cls._files_dir = os.path.join('trols_stats', 'tests', 'files')
+
+        # Every match popup fixture in the project.
+        cls._match_files = []
+        for root, _, files in os.walk('trols_stats'):
+            for match_file in sorted(files):
+                if match_file.endswith('.html'):
+                    cls._match_files.append(os.path.join(root, match_file))
+
+    def test_init(self):
+        """Initialise a trols_stats.ParseCache object.
+        """
+        # Given a cache directory
+        cache_dir = tempfile.mkdtemp()
+
+        # when I initialise a trols_stats.ParseCache
+        cache = trols_stats.ParseCache(cache_dir)
+
+        # then I should receive an object reference
+        msg = 'Object is not a trols_stats.ParseCache'
+        self.assertIsInstance(cache, trols_stats.ParseCache, msg)
+
+    def test_encode_decode_round_trip(self):
+        """Compact record round trip: all fixtures.
+        """
+        for match_file in self._match_files:
+            with self.subTest(match_file=match_file):
+                # Given a scraped TROLS detailed match results page
+                with open(match_file) as _fh:
+                    match = trols_stats.Scraper.parse_match(_fh.read())
+
+                # when I encode and decode the match structure
+                record = trols_stats.ParseCache.encode(match)
+                received = trols_stats.ParseCache.decode(record)
+
+                # then I should receive the original match structure
+                msg = 'Compact record round trip error'
+                self.assertDictEqual(received, match, msg)
+
+    def test_parse(self):
+        """Parse a match through the cache.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            html = _fh.read()
+
+        # and a parse cache
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            # when I parse the match twice
+            first = cache.parse(html)
+            received = cache.parse(html)
+
+            # then the second parse should be a cache hit
+            msg = 'Parse cache hits|misses error'
+            self.assertEqual((cache.hits, cache.misses), (1, 1), msg)
+
+        # and both results should match the scraper
+        expected = trols_stats.Scraper.parse_match(html.decode('utf-8'))
+        msg = 'Parse cache result error'
+        self.assertDictEqual(first, expected, msg)
+        self.assertDictEqual(received, expected, msg)
+
+    def test_parse_persists(self):
+        """Parse cache entries persist across sessions.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            html = _fh.read()
+
+        # and a parse cache that has already scraped the match
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            cache.parse(html)
+
+        # when I parse the match in a new session
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            cache.parse(html)
+
+            # then the match should be rehydrated from the cache
+            msg = 'Persisted parse cache hits|misses error'
+            self.assertEqual((cache.hits, cache.misses), (1, 0), msg)
+
+    def test_version_change_invalidates(self):
+        """Parse cache is dropped on scraper version change.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            html = _fh.read()
+
+        # and a parse cache that has already scraped the match
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            cache.parse(html)
+
+        # that was written by a different scraper version
+        db_path = os.path.join(cache_dir_obj.name, 'parse_cache')
+        with dbm.open(db_path, 'w') as db:
+            db[trols_stats.parsecache.VERSION_KEY] = b'0:0:0:stale'
+
+        # when I parse the match in a new session
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            cache.parse(html)
+
+            # then the match should be scraped again
+            msg = 'Stale parse cache hits|misses error'
+            self.assertEqual((cache.hits, cache.misses), (0, 1), msg)
+
+    def test_readonly(self):
+        """Read only parse cache holds new records for a writer.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            html = _fh.read()
+
+        # and a read only parse cache without a database
+        cache_dir_obj = tempfile.TemporaryDirectory()
+        with trols_stats.ParseCache(cache_dir_obj.name, readonly=True) as cache:
+            # when I parse the match
+            cache.parse(html)
+
+            # then the scrape should be held as a new record
+            msg = 'Read only parse cache new records error'
+            self.assertEqual(len(cache.new_records), 1, msg)
+            records = cache.new_records
+
+        # and once written by a writer
+        with trols_stats.ParseCache(cache_dir_obj.name) as cache:
+            cache.update(records)
+
+        # should be a hit for the next read only cache
+        with trols_stats.ParseCache(cache_dir_obj.name, readonly=True) as cache:
+            cache.parse(html)
+            msg = 'Read only parse cache hits|misses error'
+            self.assertEqual((cache.hits, cache.misses), (1, 0), msg)
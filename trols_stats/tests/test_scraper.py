@@ -27,6 +27,100 @@ class TestScraper(unittest.TestCase):
         msg = 'Object is not of type trols_stats.Scraper'
         self.assertIsInstance(scraper, trols_stats.Scraper, msg)
 
+    def test_detect_encoding(self):
+        """Detect the character encoding of raw HTML.
+        """
+        # Given raw HTML with differing encoding markers
+        pages = [
+            (b'\xef\xbb\xbf<p>caf\xc3\xa9</p>', 'utf-8'),
+            ('<p>caf\xe9</p>'.encode('utf-16'), 'utf-16'),
+            (b'<meta charset="ISO-8859-1"><p>caf\xe9</p>', 'iso8859-1'),
+            (b'<meta http-equiv="Content-Type" '
+             b'content="text/html; charset=windows-1252">', 'cp1252'),
+            (b'<p>caf\xc3\xa9</p>', 'utf-8'),
+            (b'<p>caf\xe9 \x80</p>', 'cp1252'),
+            (memoryview(b'<p>cafe</p>'), 'utf-8'),
+        ]
+
+        for data, expected in pages:
+            with self.subTest(data=bytes(data)):
+                # when I detect the encoding
+                received = trols_stats.Scraper.detect_encoding(data)
+
+                # then I should receive the expected codec name
+                msg = 'Detected encoding error'
+                self.assertEqual(received, expected, msg)
+
+    def test_decode_html(self):
+        """Decode raw HTML.
+        """
+        # Given raw UTF-8 HTML with a byte order mark
+        data = memoryview(b'\xef\xbb\xbf<p>caf\xc3\xa9</p>')
+
+        # when I decode the HTML
+        received = trols_stats.Scraper.decode_html(data)
+
+        # then I should receive the HTML string less the byte order mark
+        expected = '<p>caf\xe9</p>'
+        msg = 'Decoded HTML error'
+        self.assertEqual(received, expected, msg)
+
+    def test_parse_match_bytes(self):
+        """Parse a TROLS match popup page from raw bytes.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            data = _fh.read()
+
+        # when I parse the raw bytes
+        expected = trols_stats.Scraper.parse_match(data.decode('utf-8'))
+        for fast in (False, True):
+            received = trols_stats.Scraper.parse_match(data, fast=fast)
+
+            # then I should receive the string parse result
+            msg = 'Raw bytes parse_match error (fast={})'.format(fast)
+            self.assertDictEqual(received, expected, msg)
+
+    def test_get_root_cp1252(self):
+        """Build the document tree of undeclared Windows-1252 bytes.
+        """
+        # Given raw Windows-1252 HTML without a charset declaration
+        data = '<html><body><p>O\u2019Brien</p></body></html>'.encode('cp1252')
+
+        # when I build the document tree
+        root = trols_stats.Scraper.get_root(data)
+
+        # then the text should be decoded
+        msg = 'Windows-1252 document text error'
+        self.assertEqual(root.findtext('.//p'), 'O\u2019Brien', msg)
+
+    def test_is_finalised(self):
+        """Check a TROLS match popup page for a complete set of scores.
+        """
+        # Given a TROLS detailed match results page
+        match_file = os.path.join(self._files_dir, 'match_AA039094.html')
+        with open(match_file, 'rb') as _fh:
+            data = _fh.read()
+
+        # when I check if the match is finalised
+        received = trols_stats.Scraper.is_finalised(data)
+
+        # then the scored match should be finalised
+        msg = 'Scored match should be finalised'
+        self.assertTrue(received, msg)
+
+        # and a match with an unscored game should not be finalised
+        unscored = data.replace(b'>1-6<', b'><', 1)
+        received = trols_stats.Scraper.is_finalised(unscored)
+        msg = 'Match with an unscored game should not be finalised'
+        self.assertFalse(received, msg)
+
+        # and a page without scores should not be finalised
+        received = trols_stats.Scraper.is_finalised(b'<html></html>')
+        msg = 'Page without scores should not be finalised'
+        self.assertFalse(received, msg)
+
     def test_scrape_competition_ids(self):
         """Test scrape_competition_ids.
         """
@@ -149,6 +243,40 @@ class TestScraper(unittest.TestCase):
         msg = 'Competition name extracted error'
         self.assertEqual(received, expected, msg)
 
+    def test_scrape_competition_name_option_value(self):
+        """Scrape_competition name: registry XPath with option value.
+        """
+        # Given a TROLS competition|section results page
+        test_file = os.path.join(self._files_dir, 'main_results.php')
+        with open(test_file) as html_fh:
+            html = html_fh.read()
+
+        # when I scrape the page for the competition option value
+        kwargs = {
+            'html': html,
+            'option_value': 'AA',
+        }
+        received = trols_stats.Scraper.scrape_competition_name(**kwargs)
+
+        # then I should receive the competition name
+        expected = 'Saturday AM - Autumn 2015'
+        msg = 'Competition name extracted error'
+        self.assertEqual(received, expected, msg)
+
+    def test_scrape_competition_name_no_option_value(self):
+        """Scrape_competition name: registry XPath without option value.
+        """
+        # Given a TROLS competition|section results page
+        test_file = os.path.join(self._files_dir, 'main_results.php')
+        with open(test_file) as html_fh:
+            html = html_fh.read()
+
+        # when I scrape the page with the default XPath and no option value
+        # then I should receive a ValueError
+        msg = 'Unbound $value XPath variable should raise ValueError'
+        with self.assertRaises(ValueError, msg=msg):
+            trols_stats.Scraper.scrape_competition_name(html)
+
     def test_scrape_competition_name_tokenised(self):
         """Scrape_competition name: tokenised.
         """
@@ -226,6 +354,70 @@ class TestScraper(unittest.TestCase):
         msg = 'List of scraped match IDs error'
         self.assertListEqual(sorted(received), sorted(expected), msg)
 
+    def test_iter_competition_ids(self):
+        """Stream the competition IDs.
+        """
+        # Given a TROLS competition|section results page
+        test_file = os.path.join(self._files_dir, 'main_results.php')
+        with open(test_file, 'rb') as html_fh:
+            html = html_fh.read()
+
+        # received in small chunks
+        chunks = (html[i:i + 64] for i in range(0, len(html), 64))
+
+        # when I stream the page for match competitions
+        received = dict(trols_stats.Scraper.iter_competition_ids(chunks))
+
+        # then I should receive the same competition codes as a full scrape
+        expected = trols_stats.Scraper.scrape_competition_ids(html)
+        msg = 'Streamed competition IDs error'
+        self.assertDictEqual(received, expected, msg)
+
+    def test_iter_match_ids(self):
+        """Stream the match IDs.
+        """
+        # Given a TROLS competition|section results page
+        with open(os.path.join(self._files_dir,
+                               'www.trols.org.au',
+                               'nejta',
+                               'results.php'), 'rb') as _fh:
+            html = _fh.read()
+
+        # received in small chunks
+        consumed = []
+        def chunks():
+            for i in range(0, len(html), 64):
+                consumed.append(i)
+                yield html[i:i + 64]
+
+        # when I stream the page for match IDs
+        match_ids = trols_stats.Scraper.iter_match_ids(chunks())
+        first = next(match_ids)
+
+        # then the first match ID should be available before the whole
+        # page is received
+        msg = 'First match ID not yielded ahead of the page end'
+        self.assertLess(len(consumed) * 64, len(html), msg)
+
+        # and I should receive the same match IDs as a full scrape
+        received = [first] + list(match_ids)
+        expected = trols_stats.Scraper.scrape_match_ids(html)
+        msg = 'Streamed match IDs error'
+        self.assertListEqual(received, expected, msg)
+
+    def test_iter_match_ids_empty(self):
+        """Stream the match IDs: empty response.
+        """
+        # Given an empty response
+        chunks = iter([b''])
+
+        # when I stream the response for match IDs
+        received = list(trols_stats.Scraper.iter_match_ids(chunks))
+
+        # then I should receive no match IDs
+        msg = 'Empty response should not yield match IDs'
+        self.assertListEqual(received, [], msg)
+
     def test_get_match_id(self):
         """Test get_match_id.
         """
@@ -367,6 +559,28 @@ class TestScraper(unittest.TestCase):
         msg = 'Scraped match detail teams error (home-away color codes)'
         self.assertDictEqual(received, expected, msg)
 
+    def test_scrape_match_teams_registry_color_code_apostrophe(self):
+        """Test scrape_match_teams: registry color code with apostrophe.
+        """
+        # Given a TROLS detailed match results page with a team name
+        # that contains an apostrophe
+        html = ('<html><body><table><tr>'
+                '<td><b>St Mary&#39;s <span>Red</span></b></td>'
+                '<td><b>Bundoora</b></td>'
+                '</tr></table></body></html>')
+
+        # when I extract the teams with the registry color xpath
+        kwargs = {
+            'html': html,
+            'color_xpath': 'match_team_color',
+        }
+        received = trols_stats.Scraper.scrape_match_teams(**kwargs)
+
+        # then the team name should be color coded and not escaped
+        expected = {'away_team': 'Bundoora', 'home_team': "St Mary's Red"}
+        msg = 'Scraped match detail teams error (apostrophe)'
+        self.assertDictEqual(received, expected, msg)
+
     def test_scrape_player_names(self):
         """Extract player names from detailed results page.
         """
@@ -758,6 +972,121 @@ class TestScraper(unittest.TestCase):
         msg = 'Match stats dictionary (singles) structure error'
         self.assertDictEqual(received, expected, msg)
 
+    def test_parse_match(self):
+        """Parse match: teams, players, preamble and scores.
+        """
+        # Given a TROLS detailed match results page
+        match_file = 'nejta_saturday_am_autumn_2015--AA039054.html'
+        with open(os.path.join(self._files_dir, match_file)) as _fh:
+            html = _fh.read()
+
+        # when I parse the match
+        received = trols_stats.Scraper.parse_match(html)
+
+        # then I should receive the teams, players, preamble and scores
+        # in a single structure
+        expected = {
+            'teams': {'away_team': 'St Marys', 'home_team': 'Watsonia Red'},
+            'players': [
+                (1, 'Madeline Doyle'),
+                (2, 'Tara Watson'),
+                (3, 'Alexis McIntosh'),
+                (4, 'Grace Heaver'),
+                (5, 'Lauren Amsing'),
+                (6, 'Mia Bovalino'),
+                (7, 'Lucinda Ford'),
+                (8, 'Brooke Moore')
+            ],
+            'preamble': {
+                'competition_type': 'girls',
+                'section': 14,
+                'date': '28 Feb 15',
+                'match_round': 5
+            },
+            'scores': MATCH_STATS,
+        }
+        msg = 'Parsed match structure error'
+        self.assertDictEqual(received, expected, msg)
+
+    def _match_items(self):
+        """Helper that returns the ``(source_file, html)`` pairs of the
+        match popup fixtures.
+
+        """
+        items = []
+        for match_file in sorted(os.listdir(self._files_dir)):
+            if match_file.endswith('.html'):
+                with open(os.path.join(self._files_dir, match_file), 'rb') as _fh:
+                    items.append((match_file, _fh.read()))
+
+        return items
+
+    def test_scrape_many(self):
+        """Batch parse matches: serial, thread and process executors.
+        """
+        # Given a batch of TROLS detailed match results pages
+        items = self._match_items()
+
+        # and the one at a time parse results
+        expected = [(x, trols_stats.Scraper.parse_match(y)) for x, y in items]
+
+        for executor in ('serial', 'thread', 'process'):
+            with self.subTest(executor=executor):
+                # when I batch parse the pages
+                kwargs = {
+                    'executor': executor,
+                    'workers': 2,
+                    'chunksize': 2,
+                    'window': 2,
+                }
+                received = list(trols_stats.Scraper.scrape_many(items,
+                                                                **kwargs))
+
+                # then I should receive the results in input order
+                msg = 'Batch parse results error ({})'.format(executor)
+                self.assertListEqual(received, expected, msg)
+
+    def test_scrape_many_lazy(self):
+        """Batch parse matches: input is consumed lazily.
+        """
+        # Given a batch of TROLS detailed match results pages
+        items = self._match_items()
+
+        consumed = []
+        def source():
+            for item in items:
+                consumed.append(item)
+                yield item
+
+        # when I take the first batch parse result
+        kwargs = {
+            'executor': 'thread',
+            'workers': 1,
+            'window': 2,
+        }
+        results = trols_stats.Scraper.scrape_many(source(), **kwargs)
+        received = next(results)
+        results.close()
+
+        # then only the window of pages should have been read
+        msg = 'Batch parse read past the window'
+        self.assertEqual(len(consumed), 2, msg)
+
+        # and the first result should be the first page
+        msg = 'Batch parse first result error'
+        self.assertEqual(received[0], items[0][0], msg)
+
+    def test_scrape_many_unknown_executor(self):
+        """Batch parse matches: unknown executor.
+        """
+        # Given an unknown executor name
+        executor = 'banana'
+
+        # when I batch parse
+        # then I should receive a ValueError
+        with self.assertRaises(ValueError):
+            trols_stats.Scraper.scrape_many([], executor=executor)
+
     def test_extract_player_codes_singles(self):
         """Extract raw HTML player codes: singles
         """
@@ -92,6 +92,32 @@ class TestStats(unittest.TestCase):
         msg = 'Length of players_cache should be 1: existing player'
         self.assertEqual(received, expected, msg)
 
+    def test_set_players_cache_shared_player_map(self):
+        """trols_stats.model.entities.Player cache: shared player map.
+        """
+        # Given a scraped player tuple
+        player = {'name': 'Madeline Doyle',
+                  'team': 'Watsonia Red'}
+
+        # and a player map shared by two matches
+        player_map = {}
+        stats = trols_stats.Stats(player_map=player_map)
+        expected = stats.set_players_cache(player)
+
+        # when I load the player into the second match players cache
+        other_stats = trols_stats.Stats(player_map=player_map)
+        received = other_stats.set_players_cache(player)
+
+        # then I should receive the same Player object
+        msg = 'Shared player map should reuse the Player object'
+        self.assertIs(received, expected, msg)
+
+        # and the player map should be keyed by name and team
+        msg = 'Player map key error'
+        self.assertListEqual(list(player_map),
+                             [('Madeline Doyle', 'Watsonia Red')],
+                             msg)
+
     def test_set_fixture_cache_existing_fixture(self):
         """Create a local trols_stats.model.Player() cache: new fixture
         """
@@ -125,6 +151,45 @@ class TestStats(unittest.TestCase):
         msg = 'Length of fixtures_cache should be 1: existing fixture'
         self.assertEqual(received, expected, msg)
 
+    def test_set_fixture_cache_shared_fixture_map(self):
+        """trols_stats.model.entities.Fixture cache: shared fixture map.
+        """
+        # Given a scraped fixture tuple
+        fixture = {
+            'competition_type': 'girls',
+            'competition': 'saturday_am_autumn_2015',
+            'section': 14,
+            'date': '28 Feb 15',
+            'match_round': 5,
+            'home_team': 'Watsonia Red',
+            'away_team': 'St Marys',
+        }
+
+        # and a fixture map shared by two Stats objects
+        fixture_map = {}
+        stats = trols_stats.Stats(fixture=fixture, fixture_map=fixture_map)
+
+        # when I build the second Stats object with the same fixture
+        other_stats = trols_stats.Stats(fixture=dict(fixture),
+                                        fixture_map=fixture_map)
+
+        # then both should share the one Fixture object
+        msg = 'Shared fixture map should reuse the Fixture object'
+        self.assertIs(other_stats.fixture, stats.fixture, msg)
+
+        # and the fixture map should be keyed by the canonical tuple
+        expected = [(
+            'saturday_am_autumn_2015',
+            'girls',
+            14,
+            5,
+            '28 Feb 15',
+            'Watsonia Red',
+            'St Marys',
+        )]
+        msg = 'Fixture map key error'
+        self.assertListEqual(list(fixture_map), expected, msg)
+
     def test_game_aggregate(self):
         """Create a trols_stats.Game() aggregate object.
         """
@@ -0,0 +1,50 @@
+"""Unit test cases for the :mod:`trols_stats.xpaths` registry.
+
+"""
+import unittest
+import lxml.etree
+
+from trols_stats.xpaths import XPATHS, get_xpath
+
+
+class TestXPaths(unittest.TestCase):
+    def test_get_xpath_registry_name(self):
+        """Resolve a registry XPath by name.
+        """
+        # Given a registry XPath name
+        name = 'match_teams'
+
+        # when I resolve the XPath
+        received = get_xpath(name)
+
+        # then I should receive the precompiled evaluator
+        msg = 'Registry XPath not returned'
+        self.assertIs(received, XPATHS[name], msg)
+
+    def test_get_xpath_expression_memoised(self):
+        """Resolve a raw XPath expression: compiled once.
+        """
+        # Given a raw XPath expression
+        expression = '//table/tr/td/b/span/text()'
+
+        # when I resolve the XPath twice
+        first = get_xpath(expression)
+        second = get_xpath(expression)
+
+        # then I should receive the same compiled evaluator
+        msg = 'Raw XPath expression not memoised'
+        self.assertIsInstance(first, lxml.etree.XPath, msg)
+        self.assertIs(first, second, msg)
+
+    def test_get_xpath_compiled(self):
+        """Resolve an already compiled XPath.
+        """
+        # Given a compiled XPath
+        xpath = lxml.etree.XPath('//td')
+
+        # when I resolve the XPath
+        received = get_xpath(xpath)
+
+        # then I should receive the same object
+        msg = 'Compiled XPath not passed through'
+        self.assertIs(received, xpath, msg)
@@ -0,0 +1,75 @@
+"""Registry of compiled XPath expressions used to scrape TROLS HTML.
+
+Expressions are compiled once at import time into
+:class:`lxml.etree.XPath` evaluators.  Values that change between pages
+(such as the team name in a color code lookup) are passed in as XPath
+variables rather than interpolated into the expression string.
+
+"""
+import functools
+import lxml.etree
+
+__all__ = ['XPATHS', 'get_xpath']
+
+NAMESPACES = {'re': 'http://exslt.org/regular-expressions'}
+
+XPATHS = {
+    # TROLS results page.
+    'competition_name': lxml.etree.XPath(
+        '//table/tr/td/select/option[@value=$value]/text()'
+    ),
+    'competition_ids': lxml.etree.XPath(
+        '//select[@id="section" and @name="section"]/option'
+    ),
+    'match_ids': lxml.etree.XPath(
+        '//a[contains(@onclick, "open_match")]'
+    ),
+    # TROLS match popup page.
+    'match_teams': lxml.etree.XPath(
+        '//table/tr/td/b'
+    ),
+    'match_team_color': lxml.etree.XPath(
+        '//table/tr/td/b[contains(text(), $team)]/span/text()'
+    ),
+    'player_names': lxml.etree.XPath(
+        r"//td[re:match(text(), '^\d\.')]/text()",
+        namespaces=NAMESPACES
+    ),
+    'match_preamble': lxml.etree.XPath(
+        '//table/tr/td[contains(@class, "mb")]/text()'
+    ),
+    'match_scores': lxml.etree.XPath(
+        '//td/table/tr[contains(@valign, "top")]/td'
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(expression):
+    """Compile and memoise an ad hoc XPath *expression*.
+
+    """
+    return lxml.etree.XPath(expression, namespaces=NAMESPACES)
+
+
+def get_xpath(xpath):
+    """Resolve *xpath* to a compiled :class:`lxml.etree.XPath` evaluator.
+
+    **Args:**
+        *xpath*: one of a :attr:`XPATHS` registry name, a raw XPath
+        expression string or an already compiled
+        :class:`lxml.etree.XPath`.  Raw expressions are compiled on
+        first use only
+
+    **Returns:**
+        :class:`lxml.etree.XPath` instance
+
+    """
+    if isinstance(xpath, lxml.etree.XPath):
+        evaluator = xpath
+    elif xpath in XPATHS:
+        evaluator = XPATHS[xpath]
+    else:
+        evaluator = _compile(xpath)
+
+    return evaluator